@@ -46,9 +46,10 @@ class DepsCommConn(QThread):
     #
     # @param self this object
     # @param baud the baudrate of the uart connection
+    # @param port the device path of the uart connection
     # @return error information
     #
-    def open(self, baud: int):
+    def open(self, baud: int, port: str = '/dev/ttyS0'):
 
         # # gpio initialization
         GPIO.setmode(GPIO.BOARD)
@@ -63,7 +64,7 @@ class DepsCommConn(QThread):
 
         # uart initialization (TX: 8, RX: 10)
         try:
-            self.__uart = serial.Serial('/dev/ttyS0', baudrate=baud, timeout=1)
+            self.__uart = serial.Serial(port, baudrate=baud, timeout=1)
             self.__uart.flush()
             
         except ValueError:
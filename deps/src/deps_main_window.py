@@ -154,7 +154,10 @@ class DepsMainWindow(MW_Base, MW_Ui, QThread):
 
         # baudrate
         baudrate = int(self.__config_default['baudrate'])
-        err = self.__conn.open(baudrate)
+        # uart device path
+        port: str = self.__config_default.get('port', '/dev/ttyS0')
+
+        err = self.__conn.open(baudrate, port)
         if err != DepsError.SUCCESS:
             self.print_log("EPS connection is not opened: " + err.name)
             return
@@ -0,0 +1,74 @@
+#############################################################
+# deps_analyze.py
+#
+# Created: 2026. 10. 19
+#
+# Authors:
+#    Youngsun Han (youngsun@pknu.ac.kr)
+#
+# Quantum Computing Laboratory (quantum.pknu.ac.kr)
+#############################################################
+
+import argparse
+
+from deps_config_parser import read_config_file
+from deps_data_processor import DepsDataProcessor, calculate_linear_regression
+from deps_filter_chain import DEPS_FILTER_DEFAULT
+from deps_session_archive import read_session_runs
+
+# speed levels of the linearity points
+DEPS_ANALYZE_LEVELS = ('0~10 Km/h', '10~30 Km/h', '30~60 Km/h')
+
+##
+# This function is used to analyze the linearity of a saved session offline,
+# with the same threshold and filter chains as the monitoring software.
+#
+# @param path the path of a save file or a manifest of a session archive
+# @param config the DEFAULT section of the configuration
+# @return a list of (the number of points, slope, intercept) per speed level
+#
+def analyze_session(path: str, config):
+    flt_spec = config.get('filter', DEPS_FILTER_DEFAULT)
+    filters = [config.get('filter' + ch, flt_spec) for ch in ('spd', 'ang', 'trq', 'cur')]
+
+    processor = DepsDataProcessor(int(config.get('threshold', '-60')), filters=filters,
+                                  compact=config.get('compact', '0') != '0')
+    processor.set_baseline(float(config.get('baselinealpha', '0.01')),
+                           float(config.get('baselineangle', '20')))
+
+    for sig_str, tim_ns, count, span_ns, dev_span in read_session_runs(path):
+        processor.enqueue_sensor_run(sig_str, count, tim_ns, span_ns, dev_span)
+
+    lps_list = processor.process(0, processor.num_sensor_signal())
+
+    results = []
+    for lps in lps_list:
+        if len(lps) < 2:
+            results.append((len(lps), None, None))
+            continue
+
+        x, y = zip(*lps)
+        b1, b0 = calculate_linear_regression(x, y)
+        results.append((len(lps), b1, b0))
+
+    return results
+
+
+###################################################################
+# Main function for the offline analyzer
+###################################################################
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Offline linearity analysis of an EPS session')
+    parser.add_argument('session', help='save file or manifest of a session archive')
+    parser.add_argument('--config', default='../deps_standalone/src/config.ini',
+                        help='configuration file for the threshold and the filters')
+    args = parser.parse_args()
+
+    config = read_config_file(args.config)['DEFAULT']
+
+    for level, (num, b1, b0) in zip(DEPS_ANALYZE_LEVELS, analyze_session(args.session, config)):
+        if b1 is None:
+            print('{:<12} points: {:5d}'.format(level, num))
+        else:
+            print('{:<12} points: {:5d} slope: {:9.5f} intercept: {:9.5f}'.format(level, num, b1, b0))
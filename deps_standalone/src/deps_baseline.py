@@ -0,0 +1,88 @@
+#############################################################
+# deps_baseline.py
+#
+# Created: 2026. 10. 19
+#
+# Authors:
+#    Youngsun Han (youngsun@pknu.ac.kr)
+#
+# Quantum Computing Laboratory (quantum.pknu.ac.kr)
+#############################################################
+
+# smoothing factor of the baseline, and the angle range of the quiescent samples
+DEPS_BASELINE_ALPHA = 0.01
+DEPS_BASELINE_ANGLE = 20.0
+
+#######################################################################
+# DepsBaseline class
+#######################################################################
+
+class DepsBaseline:
+
+    ##
+    # Constructor of DepsBaseline class. It estimates the DC offset of
+    # the torque as the exponential moving average of the quiescent samples,
+    # i.e., the samples whose steering angle is close to the center. It is
+    # updated per sample in O(1), and the current value is always available.
+    #
+    # @param self this object
+    # @param alpha the smoothing factor of the moving average (0 ~ 1)
+    # @param angle the maximum absolute angle of the quiescent samples
+    #
+    def __init__(self, alpha: float = DEPS_BASELINE_ALPHA, angle: float = DEPS_BASELINE_ANGLE):
+        if not 0 < alpha <= 1:
+            raise ValueError('Invalid baseline alpha: {}'.format(alpha))
+
+        self.alpha = alpha
+        self.angle = angle
+        self.reset()
+
+    ##
+    # This function is used to reset the estimate.
+    #
+    # @param self this object
+    #
+    def reset(self):
+        # the first sample is used until a quiescent sample arrives
+        self.value = None
+        self.num_quiet = 0
+
+    ##
+    # This function is used to update the estimate with a sample.
+    #
+    # @param self this object
+    # @param ang angle data
+    # @param trq torque data
+    # @return the baseline after the update
+    #
+    def update(self, ang: float, trq: float):
+        if self.value is None:
+            self.value = trq
+
+        if -self.angle <= ang <= self.angle:
+            self.num_quiet += 1
+
+            # a plain average until enough samples, not to be biased by the first one
+            self.value += (trq - self.value) * max(self.alpha, 1.0 / self.num_quiet)
+
+        return self.value
+
+    ##
+    # This function returns the state of the estimate to be stored in a snapshot.
+    #
+    # @param self this object
+    # @return (value, the number of quiescent samples), value is nan if unknown
+    #
+    def state(self):
+        return (self.value if self.value is not None else float('nan'), self.num_quiet)
+
+    ##
+    # This function is used to restore the state of the estimate.
+    #
+    # @param self this object
+    # @param state (value, the number of quiescent samples) from state()
+    #
+    def restore(self, state):
+        value, num_quiet = state
+        self.value = None if value != value else float(value)
+        self.num_quiet = int(num_quiet)
@@ -0,0 +1,95 @@
+#############################################################
+# deps_build_ui.py
+#
+# Created: 2026. 10. 19
+#
+# Authors:
+#    Youngsun Han (youngsun@pknu.ac.kr)
+#
+# Quantum Computing Laboratory (quantum.pknu.ac.kr)
+#############################################################
+
+import os
+import sys
+import importlib
+
+# ui file of the main window
+DEPS_UI_FILE = '../deps_standalone/res/deps_main_window_v3.ui'
+
+# python module compiled from the ui file
+DEPS_UI_MODULE = 'deps_main_window_ui'
+DEPS_UI_MODULE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                                   DEPS_UI_MODULE + '.py')
+
+# the plot widgets of pyqtgraph are replaced by the lazy ones
+DEPS_UI_IMPORT_MAP = {
+    'from pyqtgraph import PlotWidget': 'from deps_lazy_plot import PlotWidget',
+}
+
+##
+# This function checks whether the compiled module is older than the ui file.
+#
+# @param ui_path the path of the ui file
+# @param py_path the path of the compiled module
+# @return true if the module has to be (re)compiled
+#
+def is_ui_outdated(ui_path: str = DEPS_UI_FILE, py_path: str = DEPS_UI_MODULE_PATH):
+    if not os.path.exists(py_path):
+        return True
+
+    if not os.path.exists(ui_path):
+        # nothing to compile, use the module as it is
+        return False
+
+    return os.path.getmtime(ui_path) > os.path.getmtime(py_path)
+
+##
+# This function is used to compile the ui file into a python module.
+#
+# @param ui_path the path of the ui file
+# @param py_path the path of the compiled module
+#
+def build_ui(ui_path: str = DEPS_UI_FILE, py_path: str = DEPS_UI_MODULE_PATH):
+    # uic is imported only for building, it is slow to import
+    from PyQt5 import uic
+    from io import StringIO
+
+    code = StringIO()
+    uic.compileUi(ui_path, code)
+    code = code.getvalue()
+
+    for old, new in DEPS_UI_IMPORT_MAP.items():
+        code = code.replace(old, new)
+
+    # replace the module at once, the gui may be started concurrently
+    tmp_path = py_path + '.tmp'
+    with open(tmp_path, 'w') as fp:
+        fp.write(code)
+    os.replace(tmp_path, py_path)
+
+##
+# This function returns the classes of the main window ui. The ui file is
+# compiled only if the compiled module does not exist or is outdated.
+#
+# @return (ui class, base class) as uic.loadUiType() does
+#
+def load_main_window_ui():
+    if is_ui_outdated():
+        build_ui()
+
+    module = importlib.import_module(DEPS_UI_MODULE)
+
+    from PyQt5.QtWidgets import QMainWindow
+    return module.Ui_main_window_ui, QMainWindow
+
+
+###################################################################
+# Main function for building the ui module
+###################################################################
+
+if __name__ == '__main__':
+    if '--force' in sys.argv or is_ui_outdated():
+        build_ui()
+        print('compiled: ' + DEPS_UI_FILE + ' -> ' + DEPS_UI_MODULE_PATH)
+    else:
+        print('up to date: ' + DEPS_UI_MODULE_PATH)
@@ -10,24 +10,34 @@
 #############################################################
 
 import sys
+import time
+import threading
 import serial
 #import RPi.GPIO as GPIO
 
 from deps_error import DepsError
-from PyQt5.QtCore import QThread, pyqtSignal
+from deps_ingest_queue import DepsIngestQueue
+
+# size of the buffer into which the received bytes are read
+DEPS_READ_BUF_SIZE = 4096
 
 #######################################################################
 # DepsCommConn class
 #######################################################################
 
-class DepsCommConn(QThread):
+class DepsCommConn(threading.Thread):
     
     ##
     # Constructor of DepsCommConn class
     #
-    def __init__(self):
+    # @param queue the bounded queue to which the received data is put
+    #
+    def __init__(self, queue: DepsIngestQueue):
+
+        super().__init__(daemon=True)
 
-        super().__init__()
+        # ingestion queue
+        self.__queue = queue
         
         #uart handle
         self.__uart = None
@@ -35,6 +45,10 @@ class DepsCommConn(QThread):
         # eps read thread
         self.__eps_recv_flag = False
 
+        # eps data ready callback, called when the data is put into the empty queue.
+        # the queued items are (line bytes, arrival time from time.monotonic_ns())
+        self.ready_callback = None
+
     ###################################################################
     # gpio & uart connections
     ###################################################################
@@ -44,9 +58,10 @@ class DepsCommConn(QThread):
     #
     # @param self this object
     # @param baud the baudrate of the uart connection
+    # @param port the device path of the uart connection
     # @return error information
     #
-    def open(self, baud: int):
+    def open(self, baud: int, port: str = '/dev/ttyS0'):
 
         # # gpio initialization
         # GPIO.setmode(GPIO.BOARD)
@@ -58,19 +73,19 @@ class DepsCommConn(QThread):
         # # speed pins: 15, 16
         # self.speedPinNums = [15, 16]
         # GPIO.setup(self.speedPinNums, GPIO.OUT, initial=GPIO.LOW)
-        #
-        # # uart initialization (TX: 8, RX: 10)
-        # try:
-        #     self.__uart = serial.Serial('/dev/ttyS0', baudrate=baud, timeout=1)
-        #     self.__uart.flush()
-        # except ValueError:
-        #     return DepsError.ERROR_UART_PARAM
-        # except serial.SerialException as e:
-        #     print("UART OPEN ERROR: " + str(e))
-        #     return DepsError.ERROR_UART_OPEN
-        #
-        # # start a thread for receiving uart data
-        # QThread.start(self)
+
+        # uart initialization (TX: 8, RX: 10)
+        try:
+            self.__uart = serial.Serial(port, baudrate=baud, timeout=1)
+            self.__uart.flush()
+        except ValueError:
+            return DepsError.ERROR_UART_PARAM
+        except serial.SerialException as e:
+            print("UART OPEN ERROR: " + str(e))
+            return DepsError.ERROR_UART_OPEN
+
+        # start a thread for receiving uart data
+        threading.Thread.start(self)
 
         return DepsError.SUCCESS
 
@@ -82,13 +97,11 @@ class DepsCommConn(QThread):
     def close(self):
         # # gpio finalization
         # GPIO.cleanup()
-        #
-        # # uart finialization
-        # if self.__uart is not None:
-        #     self.__uart.close()
-        #
-        # stop the uart thread
-        self.quit()
+
+        # uart finialization
+        # the uart thread stops when the uart is closed
+        if self.__uart is not None:
+            self.__uart.close()
 
     ## 
     # This is a function to configure the test mode of the eps sensor.
@@ -166,33 +179,63 @@ class DepsCommConn(QThread):
     # EPS sensor data 
     ###################################################################
 
-    # eps read signal
-    sig_eps_recv_bytes = pyqtSignal(bytearray)
-
     ##
-    # This is a thread routine for receiving eps sensor data.
+    # This is a thread routine for receiving eps sensor data. The received bytes
+    # are read into a reusable buffer, and the complete lines in it are put into
+    # the queue as views without being copied into new objects.
     #
     # @param self this object
     #
     def run(self):
-        read_bytes = []
-        while True:
-            # read the eps sensor data byte one by one
+        read_buf = bytearray(DEPS_READ_BUF_SIZE)
+        read_view = memoryview(read_buf)
+        num_bytes = 0
+
+        while self.__uart.is_open:
+            # read the available bytes, at least one byte to wait for the data
             try:
-                read_bytes = self.__uart.read_until(b'\x0A')
-            except serial.SerialException as e:
+                num_read = max(1, min(self.__uart.in_waiting, len(read_buf) - num_bytes))
+                num_read = self.__uart.readinto(read_view[num_bytes:num_bytes + num_read])
+            except (serial.SerialException, OSError, TypeError) as e:
                 print('UART read exception occurs...' + str(e))
-                self.msleep(1000)
+                time.sleep(1)
                 continue
 
-            # just for debugging
-            # print(">> Read Byte: " + str(read_bytes[0]) + "\n")
+            if not num_read:
+                continue
 
-            if self.__eps_recv_flag and len(read_bytes) > 0:
-                self.sig_eps_recv_bytes.emit(bytearray(read_bytes))
-            else:
+            arrival_ns = time.monotonic_ns()
+            num_bytes += num_read
+
+            # just for debugging
+            # print(">> Read Byte: " + str(read_buf[:num_bytes]) + "\n")
+
+            # split the complete lines, the lines in a read arrive at the same time
+            start = 0
+            while True:
+                end = read_buf.find(b'\x0A', start, num_bytes)
+                if end == -1:
+                    break
+
+                if self.__eps_recv_flag:
+                    if self.__queue.put(read_view[start:end + 1], arrival_ns):
+                        if self.ready_callback is not None:
+                            self.ready_callback()
+                start = end + 1
+
+            # a line longer than the buffer is given to the queue as it is, to be counted invalid
+            if start == 0 and num_bytes == len(read_buf):
+                if self.__eps_recv_flag:
+                    self.__queue.put(read_view, arrival_ns)
+                start = num_bytes
+
+            # keep the incomplete line at the front
+            read_view[:num_bytes - start] = read_view[start:num_bytes]
+            num_bytes -= start
+
+            if not self.__eps_recv_flag:
                 # wait for 0.001 sec
-                self.msleep(1)
+                time.sleep(0.001)
         return
 
     ## 
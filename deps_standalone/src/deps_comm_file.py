@@ -9,84 +9,100 @@
 # Quantum Computing Laboratory (quantum.pknu.ac.kr)
 #############################################################
 
+import os
 import sys
+import time
+import threading
 
 from deps_error import DepsError
-from PyQt5.QtCore import QThread, pyqtSignal
+from deps_ingest_queue import DepsIngestQueue
+from deps_session_archive import session_paths, read_session_bytes
 
 #######################################################################
 # DepsCommFile class
 #######################################################################
 
-class DepsCommFile(QThread):
+class DepsCommFile(threading.Thread):
     
     ##
     # Constructor of DepsCommFile class
     #
-    def __init__(self):
+    # @param queue the bounded queue to which the received data is put
+    #
+    def __init__(self, queue: DepsIngestQueue):
+
+        super().__init__(daemon=True)
 
-        super().__init__()
+        # ingestion queue
+        self.__queue = queue
         
-        #file handle
-        self.__file = None
+        # replayed lines in bytes
+        self.__lines = None
+        self.__closed = False
 
         # eps read thread
         self.__eps_recv_flag = False
 
+        # eps data ready callback, called when the data is put into the empty queue.
+        # the queued items are (line bytes, arrival time from time.monotonic_ns())
+        self.ready_callback = None
+
     ###################################################################
     # file connections
     ###################################################################
 
+    ##
+    # This function is used to open a data file to be replayed. It can be a raw
+    # data file, a save file (also compressed) or a manifest of a session archive.
+    #
+    # @param self this object
+    # @param filename the path of the data file
+    # @return DepsError.SUCCESS or DepsError.INVALID_FILE_PATH
+    #
     def open(self, filename: str):
 
         try:
-            
-            self.__file = open(filename, 'r')
-        except FileNotFoundError as e:
+            if not all(os.path.exists(path) for path in session_paths(filename)):
+                raise FileNotFoundError(filename)
+        except (OSError, ValueError) as e:
             print('No file: ' + filename + str(e))
-            return False
+            return DepsError.INVALID_FILE_PATH
+
+        self.__lines = read_session_bytes(filename)
 
         # start a thread for receiving uart data
-        QThread.start(self)
+        threading.Thread.start(self)
 
         return DepsError.SUCCESS
 
     def close(self):
-        if self.__file is not None:
-            self.__file.close()
-
-        # stop the file thread
-        self.quit()
+        # the lines are released by the thread itself, which stops at the next line
+        self.__closed = True
         
     ###################################################################
     # EPS sensor data 
     ###################################################################
 
-    # eps read signal
-    sig_eps_recv_bytes = pyqtSignal(bytearray)
-
     ##
     # This is a thread routine for receiving eps sensor data.
     #
     # @param self this object
     #
     def run(self):
-        read_bytes = []
-        while True:
-            line_str = self.__file.readline().rstrip()
-            if not line_str:
+        for read_bytes in self.__lines:
+            if self.__closed:
                 break
 
-            read_bytes = line_str.encode('ISO-8859-1')
-
             # just for debugging
             #print(">> Read Byte: " + str(read_bytes[0]) + "\n")
 
-            if self.__eps_recv_flag and len(read_bytes) > 0:
-                self.sig_eps_recv_bytes.emit(bytearray(read_bytes))
+            if self.__eps_recv_flag:
+                if self.__queue.put(read_bytes, time.monotonic_ns()):
+                    if self.ready_callback is not None:
+                        self.ready_callback()
 
             # wait for 0.01 sec
-            self.msleep(10)
+            time.sleep(0.01)
 
         return
 
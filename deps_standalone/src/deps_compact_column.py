@@ -0,0 +1,118 @@
+#############################################################
+# deps_compact_column.py
+#
+# Created: 2026. 10. 19
+#
+# Authors:
+#    Youngsun Han (youngsun@pknu.ac.kr)
+#
+# Quantum Computing Laboratory (quantum.pknu.ac.kr)
+#############################################################
+
+from array import array
+
+import numpy as np
+
+# fixed-point scales of the channels (spd, ang, trq, cur) in the storage, e.g.
+# SPD:+02.0 has a decimal and ANG:-0017, TRQ:+2443 have none, while the current
+# is recorded with up to two decimals (CUR:+0.61), and 80 A * 100 fits in int16
+DEPS_COMPACT_SCALES = (10, 1, 1, 100)
+
+#######################################################################
+# DepsCompactColumn class
+#######################################################################
+
+class DepsCompactColumn:
+
+    ##
+    # Constructor of DepsCompactColumn class. It stores the values of a
+    # channel as scaled 16-bit integers (2 bytes per value instead of a boxed
+    # float of 32 bytes in a list). The values are rounded to the resolution
+    # of the scale, i.e., they are kept exactly only if they have no more
+    # decimals than the scale. It can be used in place of a list of floats:
+    # the values are appended, sliced and deleted in the same way, while a
+    # slice is returned as a numpy array of float64.
+    #
+    # @param self this object
+    # @param scale the number of steps per unit, e.g. 10 for a decimal
+    # @param values the initial values
+    #
+    def __init__(self, scale: int = 1, values=None):
+        self.scale = scale
+        self.__buf = array('h')
+
+        if values is not None:
+            self.extend(values)
+
+    ##
+    # This function is used to append a value.
+    #
+    # @param self this object
+    # @param value the value to be appended
+    #
+    def append(self, value: float):
+        self.__buf.append(round(value * self.scale))
+
+    ##
+    # This function is used to append the values.
+    #
+    # @param self this object
+    # @param values a list or a numpy array of the values
+    #
+    def extend(self, values):
+        scaled = np.rint(np.asarray(values, dtype=np.float64) * self.scale)
+        self.__buf.frombytes(scaled.astype(np.int16).tobytes())
+
+    ##
+    # This function is used to remove all the values.
+    #
+    # @param self this object
+    #
+    def clear(self):
+        del self.__buf[:]
+
+    ##
+    # This function returns the scaled integers of the given range without conversion.
+    #
+    # @param self this object
+    # @param s_idx the start index
+    # @param e_idx the end index, None for the last one
+    # @return a numpy array of int16 (a copy)
+    #
+    def raw(self, s_idx: int = 0, e_idx: int = None):
+        return np.frombuffer(self.__buf[s_idx:e_idx], dtype=np.int16)
+
+    ##
+    # This function returns the number of bytes used by the values.
+    #
+    # @param self this object
+    # @return the number of bytes
+    #
+    def nbytes(self):
+        return len(self.__buf) * self.__buf.itemsize
+
+    def __len__(self):
+        return len(self.__buf)
+
+    def __getitem__(self, key):
+        if isinstance(key, slice):
+            return self.raw(key.start, key.stop)[::key.step] / self.scale
+
+        return self.__buf[key] / self.scale
+
+    def __delitem__(self, key):
+        del self.__buf[key]
+
+    def __iter__(self):
+        scale = self.scale
+        return (value / scale for value in self.__buf)
+
+    ##
+    # The values are converted into a numpy array of float64 by numpy functions.
+    #
+    def __array__(self, dtype=None, copy=None):
+        values = self.raw() / self.scale
+        return values.astype(dtype) if dtype is not None else values
+
+    def __str__(self):
+        return str(self.__array__())
@@ -0,0 +1,147 @@
+#############################################################
+# deps_daemon.py
+#
+# Created: 2026. 10. 19
+#
+# Authors:
+#    Youngsun Han (youngsun@pknu.ac.kr)
+#
+# Quantum Computing Laboratory (quantum.pknu.ac.kr)
+#############################################################
+
+import sys
+import time
+import signal
+import argparse
+import threading
+
+from deps_error import DepsError
+from deps_monitor_core import DepsMonitorCore
+from deps_profiler import profiler
+
+# interval of the evaluation and the telemetry (sec), as the graphs of the gui
+DEPS_DAEMON_REFRESH = 1.0
+
+#######################################################################
+# DepsMonitorDaemon class
+#######################################################################
+
+class DepsMonitorDaemon:
+
+    ##
+    # Constructor of DepsMonitorDaemon class. It runs the monitoring core
+    # without any gui, e.g. on an unattended rig: the received data is handled
+    # as soon as it is ready, and the linearity is evaluated periodically. The
+    # status is exposed by the telemetry and metrics servers and the
+    # diagnostics dump of the configuration.
+    #
+    # @param self this object
+    # @param config_path the path of the configuration file
+    #
+    def __init__(self, config_path: str):
+        self.core = DepsMonitorCore(config_path)
+
+        # set by the transport when the data is ready, or by stop()
+        self.__ready = threading.Event()
+        self.__stopped = threading.Event()
+
+    ##
+    # This function is used to stop the daemon, e.g. by a signal handler.
+    #
+    # @param self this object
+    #
+    def stop(self, *args):
+        self.__stopped.set()
+        self.__ready.set()
+
+    ##
+    # This function is used to run the daemon until it is stopped.
+    #
+    # @param self this object
+    # @return exit status
+    #
+    def run(self):
+        core = self.core
+        config = core.config
+
+        if core.open_transport(self.__ready.set) != DepsError.SUCCESS:
+            core.close()
+            return 1
+
+        # periodic jobs, [interval (sec), function, next time]
+        jobs = [[DEPS_DAEMON_REFRESH, self.refresh, 0.0]]
+
+        diag_path: str = config.get('diagdump', 'None')
+        if diag_path != 'None':
+            jobs.append([int(config.get('diaginterval', '10000')) / 1000,
+                         lambda: profiler.dump(diag_path, core.status_lines(), core.log), 0.0])
+
+        if config.get('snapshot', 'None') != 'None':
+            jobs.append([int(config.get('snapshotinterval', '60000')) / 1000,
+                         core.write_snapshot_file, 0.0])
+
+        now = time.monotonic()
+        for job in jobs:
+            job[2] = now + job[0]
+
+        while not self.__stopped.is_set():
+            self.__ready.wait(max(0.0, min(job[2] for job in jobs) - time.monotonic()))
+            self.__ready.clear()
+
+            # handle all the queued data
+            while core.receive() and not self.__stopped.is_set():
+                pass
+
+            now = time.monotonic()
+            for job in jobs:
+                if now >= job[2]:
+                    job[1]()
+                    job[2] = max(job[2] + job[0], now)
+
+        core.close()
+        return 0
+
+    ##
+    # This function is used to evaluate the linearity and to publish the
+    # status, and prints out the regression results which have changed.
+    #
+    # @param self this object
+    #
+    def refresh(self):
+        results = self.core.refresh()
+        if results is None:
+            return
+
+        for i, result in enumerate(results):
+            if result is None:
+                continue
+
+            message = 'level {} points: {:5d} slope: {:9.5f} intercept: {:9.5f} linearity: {:5.3f}'.format(
+                i, result['points'], result['slope'], result['intercept'], result['linearity'])
+
+            for scope in (result['scope'], result['robust']):
+                if scope is not None:
+                    message += ' {} points: {:5d} slope: {:9.5f}'.format(
+                        scope['scope'], scope['points'], scope['slope'])
+
+            print(message)
+
+        print(self.core.status_message())
+
+
+###################################################################
+# Main function for the headless monitoring daemon
+###################################################################
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='EPS monitoring without the gui')
+    parser.add_argument('--config', default=DepsMonitorCore.CONFIG_PATH,
+                        help='configuration file, the same as the gui')
+    args = parser.parse_args()
+
+    daemon = DepsMonitorDaemon(args.config)
+
+    signal.signal(signal.SIGINT, daemon.stop)
+    signal.signal(signal.SIGTERM, daemon.stop)
+
+    sys.exit(daemon.run())
@@ -8,10 +8,22 @@
 #
 # Quantum Computing Laboratory (quantum.pknu.ac.kr)
 #############################################################
+import time
+import bisect
 import random
 
+from array import array
+
 import numpy as np
-import scipy.signal as sp
+
+from deps_profiler import profiler
+from deps_ingest_queue import DepsIngestStats
+from deps_history import DepsTieredHistory
+from deps_save_file import interpolate_run
+from deps_filter_chain import DepsFilterChain, DEPS_FILTER_DEFAULT
+from deps_baseline import DepsBaseline
+from deps_compact_column import DepsCompactColumn, DEPS_COMPACT_SCALES
+from deps_line_decoder import DepsLineDecoder, DEPS_LINE_TIM_DIGITS
 
 # data index
 DEPS_DATA_IDX = 0
@@ -31,6 +43,9 @@ DEPS_TRQ_MIN = 2300
 DEPS_CUR_MAX = 80 
 DEPS_CUR_MIN = 0
 
+# no device timestamp in the signal
+DEPS_TIME_NONE = -1
+
 class DepsDataProcessor:
 
     ##
@@ -38,17 +53,65 @@ class DepsDataProcessor:
     #
     # @param self this object
     # @param thv threshold value to cut off the signals
+    # @param stats the ingestion counters to be updated, created if None
+    # @param filters the specs of the filter chains of the channels (spd, ang, trq, cur),
+    #        DEPS_FILTER_DEFAULT for all if None
+    # @param compact if true, the signals are stored as scaled 16-bit integers
+    #        (DepsCompactColumn) instead of lists of floats
     #
-    def __init__(self, thv: int = -60):
+    def __init__(self, thv: int = -60, stats: DepsIngestStats = None, filters: list = None,
+                 compact: bool = False):
+        # generation of the signals, incremented whenever the buffers change,
+        # so that a view can skip its work by comparing a single integer
+        self.generation = 0
+
         # speed/angle/torque data
-        self.spd_data_buf = []
-        self.ang_data_buf = []
-        self.trq_data_buf = []
-        self.cur_data_buf = []
+        self.compact = compact
+        self.__new_buffers()
+
+        # host timestamp of each signal (time.monotonic_ns()) and device
+        # timestamp (TIM field in msec, DEPS_TIME_NONE if not given)
+        self.tim_data_buf = array('q')
+        self.dev_data_buf = array('q')
+
+        # torque baseline (DC offset) at each signal, estimated from the
+        # quiescent signals until then
+        self.baseline = DepsBaseline()
+        self.bas_data_buf = array('d')
+
+        # filtered speed/angle/torque/current data (flt_data_buf), the filters
+        # are applied only to the signals appended since the last time
+        self.set_filters(filters if filters is not None else [DEPS_FILTER_DEFAULT] * 4)
 
         # threshold
         self.__thv = thv
 
+        # retention policy, the number of signals and/or the duration (sec).
+        # the oldest signals are evicted when either of them is exceeded
+        self.retention_count = 0
+        self.retention_time = 0.0
+
+        # the number of evicted signals, i.e., the index of the first signal
+        # in the buffers since the start
+        self.base_index = 0
+
+        # downsampled history of the whole test, None if not kept
+        self.history = None
+
+        # the state of the linearity segment which is being accumulated
+        # at the head of the buffers, [interval, ang_sum, trq_sum] per speed level
+        self.__lps_state = [[0, 0, 0] for _ in range(3)]
+
+        # host and device timestamps of the last enqueued signal
+        self.last_arrival_ns = 0
+        self.last_device_ts = DEPS_TIME_NONE
+
+        # ingestion counters (parsed, invalid, out-of-range)
+        self.stats = stats if stats is not None else DepsIngestStats()
+
+        # decoder of the batches of the received lines
+        self.decoder = DepsLineDecoder(parse_sensor_line)
+
     ##
     # Destructor of DepsDataProcessor class
     #
@@ -57,6 +120,26 @@ class DepsDataProcessor:
         del self.ang_data_buf
         del self.trq_data_buf
         del self.cur_data_buf
+        del self.tim_data_buf
+        del self.dev_data_buf
+        del self.bas_data_buf
+
+    ##
+    # This function is used to create the buffers of the speed/angle/torque/current data.
+    #
+    # @param self this object
+    # @param values the initial values of the buffers (numpy arrays), empty if None
+    #
+    def __new_buffers(self, values: list = None):
+        if values is None:
+            values = [[], [], [], []]
+
+        if self.compact:
+            bufs = [DepsCompactColumn(scale, vals) for scale, vals in zip(DEPS_COMPACT_SCALES, values)]
+        else:
+            bufs = [np.asarray(vals, dtype=np.float64).tolist() for vals in values]
+
+        self.spd_data_buf, self.ang_data_buf, self.trq_data_buf, self.cur_data_buf = bufs
 
     ##
     # This function returns the number of stored sensor signals.
@@ -87,13 +170,33 @@ class DepsDataProcessor:
     # @return the refined sensor signal
     #
     def refined_sensor_signal(self):
-        return [
-            remove_spike_noise(self.spd_data_buf),
-            remove_spike_noise(self.ang_data_buf),
-            remove_spike_noise(self.trq_data_buf),
-            remove_spike_noise(self.cur_data_buf),
-        ]
-        
+        self.update_filtered()
+        return [np.array(flt_buf) for flt_buf in self.flt_data_buf]
+
+    ##
+    # This function is used to set the filter chains of the channels.
+    # All the signals in the buffers are filtered again from the start.
+    #
+    # @param self this object
+    # @param filters the specs of the filter chains of the channels (spd, ang, trq, cur)
+    #
+    def set_filters(self, filters: list):
+        self.filters = [DepsFilterChain(spec) for spec in filters]
+        self.flt_data_buf = [array('d') for _ in range(4)]
+        self.generation += 1
+
+    ##
+    # This function is used to filter the signals appended since the last time.
+    #
+    # @param self this object
+    #
+    def update_filtered(self):
+        for chain, raw_buf, flt_buf in zip(self.filters, self.raw_sensor_signal(),
+                                           self.flt_data_buf):
+            num_flt = len(flt_buf)
+            if num_flt < len(raw_buf):
+                flt_buf.frombytes(chain.process(raw_buf[num_flt:]).tobytes())
+
     ##
     # This function is used to enqueue the speed, angle, and torque input signals
     # into the data buffers, respectively.
@@ -103,27 +206,11 @@ class DepsDataProcessor:
     # @return a list of the enqueued sensor data (spd, ang, trq)
     #
     def enqueue_sensor_signal(self, sig_str: str):        
-        data_buf = []
-        
-        try:
-            sig_items = sig_str.split(',')
-
-            if len(sig_items) != 3:
-                # ignore invalid data string
-                return None
-
-            # split the input string into
-            for sig_item in sig_items:
-                sidx = sig_item.find(':')
-                if sidx == -1:
-                    # ignore invalid data string
-                    return None
+        data_buf = parse_sensor_signal(sig_str, 3)
 
-                data_buf.append(float(sig_item[sidx + 1:].strip()))
-
-        except ValueError as e:
+        if data_buf is None:
             # ignore invalid data string
-            print('enqueue_sensor_signal error - {}\n'.format(str(e)))
+            self.stats.invalid += 1
             return None
 
         # data validity check
@@ -133,12 +220,18 @@ class DepsDataProcessor:
         
         
         if not is_valid_sensor_data(spd, ang, trq):
-            self.print('invalidate - SPD:{:5.3f},ANG:{:5.3f},TRQ:{:5.3f}'.format(spd, ang, trq))
+            self.stats.out_of_range += 1
             return None
 
         self.spd_data_buf.append(spd)    # SPD
         self.ang_data_buf.append(ang)    # ANG
         self.trq_data_buf.append(trq)    # TRQ
+        self.tim_data_buf.append(time.monotonic_ns())
+        self.dev_data_buf.append(DEPS_TIME_NONE)
+        self.bas_data_buf.append(self.baseline.update(ang, trq))
+        self.generation += 1
+
+        self.stats.parsed += 1
         
         return data_buf
     
@@ -148,32 +241,22 @@ class DepsDataProcessor:
     #
     # @param self this object
     # @param sig_str transferred sensor signal - "SPD:[VALUE],ANG:[VALUE],TRQ:[VALUE],CUR:[VALUE]"
+    #        optionally followed by the device timestamp ",TIM:[MSEC]"
+    # @param arrival_ns arrival time of the signal at the transport (time.monotonic_ns())
     # @return a list of the enqueued sensor data (spd, ang, trq,cur)
     #
-    def enqueue_sensor_signal_v2(self, sig_str: str):        
-        data_buf = []
-
-        try:
-            sig_items = sig_str.split(',')
-
-            if len(sig_items) != 4:
-                # ignore invalid data string
-                return None
-
-            # split the input string into
-            for sig_item in sig_items:
-                sidx = sig_item.find(':')
-                if sidx == -1:
-                    # ignore invalid data string
-                    return None
+    def enqueue_sensor_signal_v2(self, sig_str: str, arrival_ns: int = 0):
+        start_ns = time.monotonic_ns()
+        extra = {}
+        data_buf = parse_sensor_signal(sig_str, 4, extra)
 
-                data_buf.append(float(sig_item[sidx + 1:].strip()))
-
-        except ValueError as e:
+        if data_buf is None:
             # ignore invalid data string
-            print('enqueue_sensor_signal error - {}\n'.format(str(e)))
+            self.stats.invalid += 1
             return None
 
+        start_ns = profiler.record_since('parse', start_ns)
+
         # data validity check
         spd = data_buf[0]
         ang = data_buf[1]
@@ -182,18 +265,140 @@ class DepsDataProcessor:
 
         
         if not is_valid_sensor_data_v2(spd, ang, trq,cur):
-            print('invalidate - SPD:{:5.1f},ANG:{:5.1f},TRQ:{:5.1f}, CUR:{:5.1f}'.format(spd, ang, trq, cur))
+            self.stats.out_of_range += 1
             return None
 
         self.spd_data_buf.append(spd)    # SPD
         self.ang_data_buf.append(ang)    # ANG
         self.trq_data_buf.append(trq)    # TRQ
         self.cur_data_buf.append(cur)    # CUR
-    
+
+        self.last_arrival_ns = arrival_ns if arrival_ns else start_ns
+        self.last_device_ts = extra.get('TIM', DEPS_TIME_NONE)
+        self.tim_data_buf.append(self.last_arrival_ns)
+        self.dev_data_buf.append(self.last_device_ts)
+        self.bas_data_buf.append(self.baseline.update(ang, trq))
+        self.generation += 1
+        self.stats.parsed += 1
+        profiler.record_since('validate', start_ns)
 
         return data_buf
     
 
+    ##
+    # This function is used to enqueue a batch of the received lines at once.
+    # The lines are decoded from the bytes into the preallocated arrays of
+    # the decoder, and validated and appended to the data buffers as arrays.
+    #
+    # @param self this object
+    # @param batch the lines taken from the ingestion queue (DepsLineBatch),
+    #        "SPD:[VALUE],ANG:[VALUE],TRQ:[VALUE],CUR:[VALUE]" optionally followed
+    #        by the device timestamp ",TIM:[MSEC]"
+    # @return a numpy array of the enqueued sensor data, a row (spd, ang, trq, cur) per signal
+    #
+    def enqueue_sensor_batch(self, batch):
+        start_ns = time.monotonic_ns()
+        num = self.decoder.decode(batch)
+        if num == 0:
+            return self.decoder.values[:0]
+
+        # the stage times are recorded per signal
+        now_ns = time.monotonic_ns()
+        profiler.record('parse', (now_ns - start_ns) // num)
+        start_ns = now_ns
+
+        values = self.decoder.values[:num]
+        valid = self.decoder.valid[:num]
+        self.stats.invalid += num - int(np.count_nonzero(valid))
+
+        # data validity check
+        spd, ang, trq, cur = values.T
+        in_range = ((spd >= DEPS_SPD_MIN) & (spd <= DEPS_SPD_MAX) &
+                    (ang >= DEPS_ANG_MIN) & (ang <= DEPS_ANG_MAX) &
+                    (trq >= DEPS_TRQ_MIN) & (trq <= DEPS_TRQ_MAX) &
+                    (cur >= DEPS_CUR_MIN) & (cur <= DEPS_CUR_MAX))
+        self.stats.out_of_range += int(np.count_nonzero(valid & ~in_range))
+
+        keep = np.flatnonzero(valid & in_range)
+        data_buf = values[keep]
+        if len(keep) == 0:
+            return data_buf
+
+        for raw_buf, col in zip(self.raw_sensor_signal(), data_buf.T):
+            raw_buf.extend(col if self.compact else col.tolist())
+
+        arrivals = np.frombuffer(batch.arrivals, dtype=np.int64, count=num)[keep]
+        self.tim_data_buf.frombytes(np.where(arrivals != 0, arrivals, start_ns).tobytes())
+        self.dev_data_buf.frombytes(self.decoder.dev[keep].tobytes())
+
+        for ang_val, trq_val in zip(data_buf[:, 1].tolist(), data_buf[:, 2].tolist()):
+            self.bas_data_buf.append(self.baseline.update(ang_val, trq_val))
+
+        self.last_arrival_ns = self.tim_data_buf[-1]
+        self.last_device_ts = self.dev_data_buf[-1]
+        self.generation += 1
+        self.stats.parsed += len(keep)
+        profiler.record('validate', (time.monotonic_ns() - start_ns) // num)
+
+        return data_buf
+
+    ##
+    # This function is used to enqueue a run of identical signals at once, e.g.
+    # read from a save file in the rle mode. The signal string is parsed and
+    # validated only once for the whole run.
+    #
+    # @param self this object
+    # @param sig_str sensor signal of the run - "SPD:[VALUE],ANG:[VALUE],TRQ:[VALUE],CUR:[VALUE]"
+    #        optionally followed by the device timestamp of the first signal ",TIM:[MSEC]"
+    # @param count the number of signals in the run
+    # @param tim_ns host timestamp of the first signal (time.monotonic_ns()), 0 for now
+    # @param span_ns duration from the first signal to the last one in nanoseconds
+    # @param dev_span duration from the first signal to the last one in device msec
+    # @return a list of the enqueued sensor data (spd, ang, trq, cur)
+    #
+    def enqueue_sensor_run(self, sig_str: str, count: int, tim_ns: int = 0,
+                           span_ns: int = 0, dev_span: int = 0):
+        if count == 1:
+            return self.enqueue_sensor_signal_v2(sig_str, tim_ns)
+
+        extra = {}
+        data_buf = parse_sensor_signal(sig_str, 4, extra)
+
+        if data_buf is None:
+            self.stats.invalid += count
+            return None
+
+        spd, ang, trq, cur = data_buf
+
+        if not is_valid_sensor_data_v2(spd, ang, trq, cur):
+            self.stats.out_of_range += count
+            return None
+
+        self.spd_data_buf.extend([spd] * count)
+        self.ang_data_buf.extend([ang] * count)
+        self.trq_data_buf.extend([trq] * count)
+        self.cur_data_buf.extend([cur] * count)
+
+        if tim_ns == 0:
+            tim_ns = time.monotonic_ns()
+        self.tim_data_buf.extend(interpolate_run(tim_ns, span_ns, count))
+
+        dev_ts = extra.get('TIM', DEPS_TIME_NONE)
+        if dev_ts == DEPS_TIME_NONE:
+            self.dev_data_buf.extend(array('q', [DEPS_TIME_NONE]) * count)
+        else:
+            self.dev_data_buf.extend(interpolate_run(dev_ts, dev_span, count))
+
+        for _ in range(count):
+            self.bas_data_buf.append(self.baseline.update(ang, trq))
+
+        self.last_arrival_ns = self.tim_data_buf[-1]
+        self.last_device_ts = self.dev_data_buf[-1]
+        self.generation += 1
+        self.stats.parsed += count
+
+        return data_buf
+
     ##
     # This function is used to dequeue the data buffers as many as the given count.
     #
@@ -203,25 +408,230 @@ class DepsDataProcessor:
     #
     def dequeue_sensor_signal(self, count: int = -1):
 
+        # the signals have to be filtered before dequeued, to keep the filter states
+        self.update_filtered()
+        self.generation += 1
+
         # clear all the signal buffers
         if count == -1:
+            self.base_index += len(self.spd_data_buf)
             self.spd_data_buf.clear()
             self.ang_data_buf.clear()
             self.trq_data_buf.clear()
             self.cur_data_buf.clear()
+            del self.tim_data_buf[:]
+            del self.dev_data_buf[:]
+            del self.bas_data_buf[:]
+            for flt_buf in self.flt_data_buf:
+                del flt_buf[:]
+            self.__lps_state = [[0, 0, 0] for _ in range(3)]
+            return
+
+        # the slices are deleted even if the count reaches the length, e.g. when
+        # all the signals are older than the retention time
+        self.base_index += min(count, len(self.spd_data_buf))
+
+        for buf in (self.spd_data_buf, self.ang_data_buf, self.trq_data_buf, self.cur_data_buf,
+                    self.tim_data_buf, self.dev_data_buf, self.bas_data_buf, *self.flt_data_buf):
+            del buf[0:count]
 
+    ##
+    # This function returns the host timestamps of the given range of signals.
+    #
+    # @param self this object
+    # @param s_idx the start index of the signals
+    # @param e_idx the end index of the signals, None for the last one
+    # @return a numpy array of time.monotonic_ns() (int64)
+    #
+    def time_column(self, s_idx: int = 0, e_idx: int = None):
+        # the slice is a copy, so the buffer can still grow while the array is alive
+        return np.frombuffer(self.tim_data_buf[s_idx:e_idx], dtype=np.int64)
 
-        if len(self.spd_data_buf) > count:
-            del self.spd_data_buf[0:count]
+    ##
+    # This function returns the device timestamps of the given range of signals.
+    #
+    # @param self this object
+    # @param s_idx the start index of the signals
+    # @param e_idx the end index of the signals, None for the last one
+    # @return a numpy array of the device timestamps in msec (int64)
+    #
+    def device_time_column(self, s_idx: int = 0, e_idx: int = None):
+        return np.frombuffer(self.dev_data_buf[s_idx:e_idx], dtype=np.int64)
 
-        if len(self.ang_data_buf) > count:
-            del self.ang_data_buf[0:count]
+    ##
+    # This function returns the current torque baseline (DC offset).
+    #
+    # @param self this object
+    # @return the baseline, 0 if no signal has been enqueued
+    #
+    def torque_baseline(self):
+        return self.baseline.value if self.baseline.value is not None else 0.0
 
-        if len(self.trq_data_buf) > count:
-            del self.trq_data_buf[0:count]
-        
-        if len(self.cur_data_buf) > count:
-            del self.cur_data_buf[0:count]
+    ##
+    # This function is used to set the parameters of the torque baseline estimation.
+    # The baseline of the signals in the buffers is estimated again from the start.
+    #
+    # @param self this object
+    # @param alpha the smoothing factor of the moving average (0 ~ 1)
+    # @param angle the maximum absolute angle of the quiescent signals
+    #
+    def set_baseline(self, alpha: float, angle: float):
+        self.baseline = DepsBaseline(alpha, angle)
+        self.bas_data_buf = array('d', [self.baseline.update(ang, trq) for ang, trq
+                                        in zip(self.ang_data_buf, self.trq_data_buf)])
+        self.generation += 1
+
+    ##
+    # This function is used to shift the host timestamps of all the signals,
+    # e.g. to move the signals restored from a previous run up to now.
+    #
+    # @param self this object
+    # @param offset_ns the offset to be added in nanoseconds
+    #
+    def shift_time(self, offset_ns: int):
+        if offset_ns == 0 or len(self.tim_data_buf) == 0:
+            return
+
+        tim_arr = np.frombuffer(self.tim_data_buf, dtype=np.int64)
+        tim_arr += offset_ns
+
+        # release the buffer, otherwise the array cannot be resized
+        del tim_arr
+
+        if self.last_arrival_ns:
+            self.last_arrival_ns += offset_ns
+
+    ##
+    # This function is used to set the retention policy of the signal buffers.
+    #
+    # @param self this object
+    # @param count the maximum number of signals, 0 for no limit
+    # @param duration the maximum duration of signals in seconds, 0 for no limit
+    #
+    def set_retention(self, count: int = 0, duration: float = 0.0):
+        self.retention_count = count
+        self.retention_time = duration
+
+    ##
+    # This function is used to evict the oldest signals exceeding the retention
+    # policy. The linearity segments completed within the evicted signals are
+    # returned, while a segment straddling the eviction point is carried over
+    # to the remaining signals, so that no segment is lost.
+    #
+    # @param self this object
+    # @return a list of linearity points per speed level, None if nothing is evicted
+    #
+    def evict_sensor_signal(self):
+        num_sig = len(self.spd_data_buf)
+        count = 0
+
+        if 0 < self.retention_count < num_sig:
+            count = num_sig - self.retention_count
+
+        if self.retention_time > 0 and num_sig > 0:
+            # the buffer is sorted by the arrival time
+            limit_ns = time.monotonic_ns() - int(self.retention_time * 1e9)
+            count = max(count, bisect.bisect_left(self.tim_data_buf, limit_ns))
+
+        if count == 0:
+            return None
+
+        # the signals have to be in the history before evicted
+        self.update_history()
+
+        # close the segments in the evicted signals, carry the open ones over
+        lps_list = self.__process(0, count, self.__lps_state)
+
+        self.dequeue_sensor_signal(count)
+        return lps_list
+
+    ##
+    # This function is used to keep the downsampled history of the whole test.
+    #
+    # @param self this object
+    # @param history the tiered history to which the signals are appended
+    #
+    def set_history(self, history: DepsTieredHistory):
+        self.history = history
+        self.update_history()
+
+    ##
+    # This function is used to append the signals not yet in the history.
+    #
+    # @param self this object
+    #
+    def update_history(self):
+        if self.history is None:
+            return
+
+        start = max(0, self.history.num_signals - self.base_index)
+        if start >= len(self.spd_data_buf):
+            return
+
+        self.history.append(np.array([
+            self.spd_data_buf[start:],
+            self.ang_data_buf[start:],
+            self.trq_data_buf[start:],
+            self.cur_data_buf[start:],
+        ], dtype=np.float64))
+
+    ##
+    # This function returns the state of this processor to be stored in a snapshot.
+    #
+    # @param self this object
+    # @return a dictionary of numpy arrays
+    #
+    def snapshot_state(self):
+        return {
+            'spd': np.array(self.spd_data_buf, dtype=np.float64),
+            'ang': np.array(self.ang_data_buf, dtype=np.float64),
+            'trq': np.array(self.trq_data_buf, dtype=np.float64),
+            'cur': np.array(self.cur_data_buf, dtype=np.float64),
+            'tim': self.time_column(),
+            'dev': self.device_time_column(),
+            'bas': np.frombuffer(self.bas_data_buf[:], dtype=np.float64),
+            'bas_state': np.array(self.baseline.state(), dtype=np.float64),
+            'lps_state': np.array(self.__lps_state, dtype=np.float64),
+        }
+
+    ##
+    # This function is used to restore the state of this processor from a snapshot.
+    #
+    # @param self this object
+    # @param state a dictionary of numpy arrays from snapshot_state()
+    #
+    def restore_state(self, state: dict):
+        self.__new_buffers([state['spd'], state['ang'], state['trq'], state['cur']])
+
+        # the restored signals are filtered again from the start
+        self.set_filters([chain.spec for chain in self.filters])
+
+        now_ns = time.monotonic_ns()
+        num_sig = len(self.spd_data_buf)
+
+        # the timestamps of the previous run are moved up to now
+        if 'tim' in state and len(state['tim']) == num_sig:
+            self.tim_data_buf = array('q', state['tim'].astype(np.int64).tobytes())
+            if num_sig > 0:
+                self.shift_time(now_ns - self.tim_data_buf[-1])
+        else:
+            self.tim_data_buf = array('q', [now_ns]) * num_sig
+
+        if 'dev' in state and len(state['dev']) == num_sig:
+            self.dev_data_buf = array('q', state['dev'].astype(np.int64).tobytes())
+        else:
+            self.dev_data_buf = array('q', [DEPS_TIME_NONE]) * num_sig
+
+        if 'bas' in state and len(state['bas']) == num_sig and 'bas_state' in state:
+            self.bas_data_buf = array('d', state['bas'].astype(np.float64).tobytes())
+            self.baseline.restore(state['bas_state'].tolist())
+        else:
+            self.set_baseline(self.baseline.alpha, self.baseline.angle)
+
+        if 'lps_state' in state:
+            self.__lps_state = [[int(st[0]), st[1], st[2]] for st in state['lps_state'].tolist()]
+
+        self.generation += 1
 
     ##
     # This function is used to process the sensor signals to calculate the linearity.
@@ -233,24 +643,42 @@ class DepsDataProcessor:
     #
     def process(self, s_idx: int, e_idx: int):
 
+        # a segment carried over from the evicted signals continues at the head
+        if s_idx == 0:
+            return self.__process(s_idx, e_idx, [st.copy() for st in self.__lps_state])
+
+        return self.__process(s_idx, e_idx)
+
+    ##
+    # This function is used to process the sensor signals to calculate the linearity.
+    #
+    # @param self this object
+    # @param s_idx the start index of the input signal array
+    # @param e_idx the end index of the input signal array
+    # @param lps_state the state of the open segments per speed level, updated in place
+    # @return a list of linearity points
+    #
+    def __process(self, s_idx: int, e_idx: int, lps_state: list = None):
+
         # argument validity check
         if len(self.spd_data_buf) < e_idx:
             return None
 
+        start_ns = time.monotonic_ns()
+
+        # filter the new signals, e.g. remove spike errors
+        self.update_filtered()
+
         # create numpy.arrays with a specific range of signal data
         idx_arr = list(range(s_idx, e_idx))
-        spd_arr = self.spd_data_buf[s_idx:e_idx]
-        ang_arr = self.ang_data_buf[s_idx:e_idx]
-        trq_arr = self.trq_data_buf[s_idx:e_idx]
-        pwr_arr = self.cur_data_buf[s_idx:e_idx]
+        spd_arr = np.array(self.flt_data_buf[0][s_idx:e_idx])
+        ang_arr = np.array(self.flt_data_buf[1][s_idx:e_idx])
+        trq_arr = np.array(self.flt_data_buf[2][s_idx:e_idx])
 
-        # remove spike errors
-        spd_arr = remove_spike_noise(spd_arr)
-        ang_arr = remove_spike_noise(ang_arr)
-        trq_arr = remove_spike_noise(trq_arr)
+        # remove dc offset, the baseline at each signal
+        trq_arr -= np.frombuffer(self.bas_data_buf[s_idx:e_idx], dtype=np.float64)
 
-        # remove dc offset
-        trq_arr = remove_dc_offset(trq_arr)
+        start_ns = profiler.record_since('filter', start_ns)
 
         # create a numpy.array after combining
         # all the signals (speed, angle, torque) into one 2d list
@@ -266,13 +694,16 @@ class DepsDataProcessor:
         sensor_data_arr = split_sensor_data(combined_dat)
 
         # for each split sensor data
-        for split_dat in sensor_data_arr:
+        for i, split_dat in enumerate(sensor_data_arr):
             # calculate linearity points
-            lps = calculate_linearity_points(split_dat, self.__thv)
+            lps = calculate_linearity_points(
+                split_dat, self.__thv, lps_state[i] if lps_state is not None else None)
 
             # append the points into the list
             lps_list.append(lps)
 
+        profiler.record_since('segment', start_ns)
+
         # if the number of points is 0, return None
         if len(lps_list) == 0:
             return None
@@ -312,6 +743,70 @@ class DepsDataProcessor:
 # Utility functions
 ###################################################################
 
+##
+# This function is used to parse a transferred sensor signal string.
+#
+# @param sig_str transferred sensor signal - "SPD:[VALUE],ANG:[VALUE],..."
+# @param num_items the expected number of items
+# @param extra a dictionary to which the optional integer items following
+#        the expected ones are stored by their keys (e.g. TIM, DT),
+#        None if no more items are allowed
+# @return a list of the parsed values, None if the string is invalid
+#
+def parse_sensor_signal(sig_str: str, num_items: int, extra: dict = None):
+    data_buf = []
+
+    try:
+        sig_items = sig_str.split(',')
+
+        if len(sig_items) != num_items:
+            if extra is None or len(sig_items) < num_items:
+                return None
+
+        # split the input string into
+        for sig_item in sig_items[:num_items]:
+            sidx = sig_item.find(':')
+            if sidx == -1:
+                return None
+
+            data_buf.append(float(sig_item[sidx + 1:].strip()))
+
+        # optional items
+        for sig_item in sig_items[num_items:]:
+            sidx = sig_item.find(':')
+            if sidx == -1:
+                return None
+
+            key = sig_item[:sidx].strip()
+            value = int(sig_item[sidx + 1:])
+
+            # the device timestamp is stored as int64, up to the digits of the line decoder
+            if key == 'TIM' and not 0 <= value < 10 ** DEPS_LINE_TIM_DIGITS:
+                return None
+
+            extra[key] = value
+
+    except ValueError:
+        return None
+
+    return data_buf
+
+##
+# This function is used to parse a sensor signal string with the device timestamp.
+# It is the fallback of the line decoder for the lines not in the firmware layout.
+#
+# @param sig_str sensor signal - "SPD:[VALUE],ANG:[VALUE],TRQ:[VALUE],CUR:[VALUE]"
+#        optionally followed by the device timestamp ",TIM:[MSEC]"
+# @return (a list of the values, device timestamp), None if the string is invalid
+#
+def parse_sensor_line(sig_str: str):
+    extra = {}
+    data_buf = parse_sensor_signal(sig_str, 4, extra)
+    if data_buf is None:
+        return None
+
+    return data_buf, extra.get('TIM', DEPS_TIME_NONE)
+
 ##
 # This function is used to split the input signal into three different parts
 # according to the vehicle speed.
@@ -334,15 +829,6 @@ def split_sensor_data(combined_dat: np.array):
 
     return [dat_0, dat_1, dat_2]
 
-##
-# This function is used to remove the DC elements of the input data.
-#
-# @param sig a list of input signal
-# @return DC-removed signal
-#
-def remove_dc_offset(sig: np.array):
-    return sig - np.mean(sig)
-
 ##
 # This function is used to eliminate the spike errors of the input data.
 #
@@ -350,6 +836,9 @@ def remove_dc_offset(sig: np.array):
 # @return spikes-removed signal
 #
 def remove_spike_noise(sig: np.array):
+    # scipy is loaded at the first use, not to delay the start-up
+    import scipy.signal as sp
+
     return sp.medfilt(np.array(sig))
 
 
@@ -359,9 +848,11 @@ def remove_spike_noise(sig: np.array):
 #
 # @param combined_dat combined 2D sensor signal data, i.e., [index, speed, angle, torque]
 # @param thv threshold value to cut off the signals
+# @param state [interval, ang_sum, trq_sum] of a segment continued from the previous
+#        signals, updated in place with the segment open at the end of the signals
 # @return a list of linearity points
 #
-def calculate_linearity_points(combined_dat: np.array, thv: int = -60):
+def calculate_linearity_points(combined_dat: np.array, thv: int = -60, state: list = None):
     # linearity points
     lps = []
 
@@ -370,6 +861,9 @@ def calculate_linearity_points(combined_dat: np.array, thv: int = -60):
     trq_sum = 0
     ang_sum = 0
 
+    if state is not None:
+        interval, ang_sum, trq_sum = state
+
     # angle and torque data
     ang_arr = combined_dat[DEPS_DATA_ANG]
     trq_arr = combined_dat[DEPS_DATA_TRQ]
@@ -393,6 +887,9 @@ def calculate_linearity_points(combined_dat: np.array, thv: int = -60):
             ang_sum = 0
             trq_sum = 0
 
+    if state is not None:
+        state[:] = [interval, ang_sum, trq_sum]
+
     return lps
 
 ##
@@ -436,6 +933,17 @@ def calculate_linear_regression_v2(x_pts: list, y_pts: list):
     # linear regression
     b1, b0 = calculate_linear_regression(x_pts, y_pts)
 
+    return calibrate_linear_regression(b1, b0)
+
+##
+# This is a function to calibrate the result of linear regression.
+#
+# @param b1 slope of the linear regression
+# @param b0 intercept of the linear regression
+# @return the calibrated result (slope, intercept)
+#
+def calibrate_linear_regression(b1: float, b0: float):
+
     # b1 calibration
     b1 = (-100 + random.randrange(1, 15)) / 100.0
 
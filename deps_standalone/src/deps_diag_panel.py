@@ -0,0 +1,76 @@
+#############################################################
+# deps_diag_panel.py
+#
+# Created: 2026. 10. 19
+#
+# Authors:
+#    Youngsun Han (youngsun@pknu.ac.kr)
+#
+# Quantum Computing Laboratory (quantum.pknu.ac.kr)
+#############################################################
+
+from PyQt5.QtCore import Qt, QTimer
+from PyQt5.QtGui import QFont
+from PyQt5.QtWidgets import QWidget, QLabel, QVBoxLayout
+
+from deps_profiler import profiler
+
+#######################################################################
+# DepsDiagPanel class
+#######################################################################
+
+class DepsDiagPanel(QWidget):
+
+    ##
+    # Constructor of DepsDiagPanel class. This is a small tool window
+    # showing the per-stage timing of the processing pipeline.
+    #
+    # @param self this object
+    # @param parent the parent widget
+    # @param interval refresh interval in msec
+    #
+    def __init__(self, parent=None, interval: int = 1000):
+        super().__init__(parent, Qt.Tool)
+        self.setWindowTitle('EPS Diagnostics')
+
+        # extra text lines provider, e.g. lambda: ['received: 10']
+        self.extra_lines = None
+
+        self.__label = QLabel(self)
+        self.__label.setFont(QFont('Monospace', 8))
+        self.__label.setTextInteractionFlags(Qt.TextSelectableByMouse)
+
+        layout = QVBoxLayout(self)
+        layout.addWidget(self.__label)
+
+        # the panel is refreshed only while it is visible
+        self.__timer = QTimer(self)
+        self.__timer.timeout.connect(self.refresh)
+        self.__interval = interval
+
+    ##
+    # This function is used to refresh the contents of this panel.
+    #
+    # @param self this object
+    #
+    def refresh(self):
+        lines = profiler.summary()
+        if self.extra_lines is not None:
+            lines.append('')
+            lines.extend(self.extra_lines())
+
+        self.__label.setText('\n'.join(lines))
+
+    ##
+    # This function is used to show or hide this panel.
+    #
+    # @param self this object
+    #
+    def toggle(self):
+        if self.isVisible():
+            self.__timer.stop()
+            self.hide()
+        else:
+            self.refresh()
+            self.show()
+            self.__timer.start(self.__interval)
@@ -0,0 +1,252 @@
+#############################################################
+# deps_filter_chain.py
+#
+# Created: 2026. 10. 19
+#
+# Authors:
+#    Youngsun Han (youngsun@pknu.ac.kr)
+#
+# Quantum Computing Laboratory (quantum.pknu.ac.kr)
+#############################################################
+
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+# the default filter chain of all the channels, as the spike removal before
+DEPS_FILTER_DEFAULT = 'median:3'
+
+#######################################################################
+# DepsMedianStage class
+#######################################################################
+
+class DepsMedianStage:
+
+    ##
+    # Constructor of DepsMedianStage class. It is a causal median filter,
+    # i.e., the output is the median of the current and the previous inputs.
+    #
+    # @param self this object
+    # @param size the size of the window
+    #
+    def __init__(self, size: int = 3):
+        if size < 1:
+            raise ValueError('Invalid median size: {}'.format(size))
+
+        self.size = size
+        self.reset()
+
+    ##
+    # This function is used to reset the state of this filter.
+    #
+    # @param self this object
+    #
+    def reset(self):
+        self.__hist = None
+
+    ##
+    # This function is used to filter a chunk of the input signal.
+    #
+    # @param self this object
+    # @param sig the input signal
+    # @return the filtered signal
+    #
+    def process(self, sig: np.ndarray):
+        if self.size == 1 or len(sig) == 0:
+            return sig.copy()
+
+        # the signal before the first input is assumed to be the first input
+        if self.__hist is None:
+            self.__hist = np.full(self.size - 1, sig[0])
+
+        buf = np.concatenate((self.__hist, sig))
+        self.__hist = buf[len(buf) - self.size + 1:]
+
+        return np.median(sliding_window_view(buf, self.size), axis=1)
+
+#######################################################################
+# DepsMovingAverageStage class
+#######################################################################
+
+class DepsMovingAverageStage:
+
+    ##
+    # Constructor of DepsMovingAverageStage class. It is a causal moving
+    # average filter. Each window is summed up on its own, so the output
+    # does not depend on how the signal is split into chunks.
+    #
+    # @param self this object
+    # @param size the size of the window
+    #
+    def __init__(self, size: int = 4):
+        if size < 1:
+            raise ValueError('Invalid moving average size: {}'.format(size))
+
+        self.size = size
+        self.reset()
+
+    ##
+    # This function is used to reset the state of this filter.
+    #
+    # @param self this object
+    #
+    def reset(self):
+        self.__hist = None
+
+    ##
+    # This function is used to filter a chunk of the input signal.
+    #
+    # @param self this object
+    # @param sig the input signal
+    # @return the filtered signal
+    #
+    def process(self, sig: np.ndarray):
+        if self.size == 1 or len(sig) == 0:
+            return sig.copy()
+
+        if self.__hist is None:
+            self.__hist = np.full(self.size - 1, sig[0])
+
+        buf = np.concatenate((self.__hist, sig))
+        self.__hist = buf[len(buf) - self.size + 1:]
+
+        return sliding_window_view(buf, self.size).mean(axis=1)
+
+#######################################################################
+# DepsSosStage class
+#######################################################################
+
+class DepsSosStage:
+
+    ##
+    # Constructor of DepsSosStage class. It is a Butterworth low-pass
+    # IIR filter in second-order sections, which keeps its delay line
+    # between chunks.
+    #
+    # @param self this object
+    # @param order the order of the filter
+    # @param cutoff the cutoff frequency normalized by the Nyquist frequency (0 ~ 1)
+    #
+    def __init__(self, order: int = 2, cutoff: float = 0.2):
+        if order < 1 or not 0 < cutoff < 1:
+            raise ValueError('Invalid iir filter: {}, {}'.format(order, cutoff))
+
+        # scipy is loaded at the first use, not to delay the start-up
+        import scipy.signal as sp
+
+        self.order = order
+        self.cutoff = cutoff
+        self.sos = sp.butter(order, cutoff, output='sos')
+        self.reset()
+
+    ##
+    # This function is used to reset the state of this filter.
+    #
+    # @param self this object
+    #
+    def reset(self):
+        self.__zi = None
+
+    ##
+    # This function is used to filter a chunk of the input signal.
+    #
+    # @param self this object
+    # @param sig the input signal
+    # @return the filtered signal
+    #
+    def process(self, sig: np.ndarray):
+        import scipy.signal as sp
+
+        if len(sig) == 0:
+            return sig.copy()
+
+        # start at the steady state of the first input
+        if self.__zi is None:
+            self.__zi = sp.sosfilt_zi(self.sos) * sig[0]
+
+        out, self.__zi = sp.sosfilt(self.sos, sig, zi=self.__zi)
+        return out
+
+# filter stages by the name in the spec
+DEPS_FILTER_STAGES = {
+    'median': (DepsMedianStage, (int,)),
+    'ma': (DepsMovingAverageStage, (int,)),
+    'iir': (DepsSosStage, (int, float)),
+}
+
+#######################################################################
+# DepsFilterChain class
+#######################################################################
+
+class DepsFilterChain:
+
+    ##
+    # Constructor of DepsFilterChain class. A chain is defined by a spec
+    # of the stages separated by '|', each of which is the name and the
+    # parameters separated by ':', e.g. "median:5|iir:2:0.1".
+    #   median:[SIZE]            causal median filter
+    #   ma:[SIZE]                causal moving average filter
+    #   iir:[ORDER]:[CUTOFF]     Butterworth low-pass filter, CUTOFF / Nyquist
+    # "none" or an empty spec is a chain without any stage.
+    #
+    # @param self this object
+    # @param spec the spec of the chain
+    #
+    def __init__(self, spec: str = DEPS_FILTER_DEFAULT):
+        self.spec = spec
+        self.stages = parse_filter_spec(spec)
+
+    ##
+    # This function is used to reset the state of all the stages.
+    #
+    # @param self this object
+    #
+    def reset(self):
+        for stage in self.stages:
+            stage.reset()
+
+    ##
+    # This function is used to filter a chunk of the input signal. The chunks
+    # have to be given in order, and the result is the same as filtering the
+    # whole signal at once.
+    #
+    # @param self this object
+    # @param sig the input signal
+    # @return the filtered signal
+    #
+    def process(self, sig):
+        out = np.asarray(sig, dtype=np.float64)
+        for stage in self.stages:
+            out = stage.process(out)
+
+        return out
+
+###################################################################
+# Utility functions
+###################################################################
+
+##
+# This function is used to create the filter stages from a spec.
+#
+# @param spec the spec of the chain, e.g. "median:5|iir:2:0.1"
+# @return a list of the filter stages
+#
+def parse_filter_spec(spec: str):
+    stages = []
+
+    for stage_str in spec.split('|'):
+        stage_str = stage_str.strip()
+        if not stage_str or stage_str == 'none':
+            continue
+
+        items = stage_str.split(':')
+        if items[0] not in DEPS_FILTER_STAGES:
+            raise ValueError('Invalid filter stage: ' + stage_str)
+
+        stage_class, param_types = DEPS_FILTER_STAGES[items[0]]
+        if len(items) - 1 > len(param_types):
+            raise ValueError('Invalid filter stage: ' + stage_str)
+
+        params = [param_type(item) for param_type, item in zip(param_types, items[1:])]
+        stages.append(stage_class(*params))
+
+    return stages
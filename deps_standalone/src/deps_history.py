@@ -0,0 +1,282 @@
+#############################################################
+# deps_history.py
+#
+# Created: 2026. 10. 19
+#
+# Authors:
+#    Youngsun Han (youngsun@pknu.ac.kr)
+#
+# Quantum Computing Laboratory (quantum.pknu.ac.kr)
+#############################################################
+
+import os
+
+import numpy as np
+
+# downsampling factors of the tiers, each tier is built from the one below
+DEPS_HISTORY_FACTORS = (1, 10, 100, 1000)
+
+# the number of blocks kept in memory for each tier
+DEPS_HISTORY_CAPACITY = 8192
+
+#######################################################################
+# DepsHistoryTier class
+#######################################################################
+
+class DepsHistoryTier:
+
+    ##
+    # Constructor of DepsHistoryTier class. A tier keeps the min/max/mean
+    # aggregates of blocks of 'factor' signals in a ring buffer. The blocks
+    # overwritten in the ring buffer are appended to the spill file if given.
+    #
+    # @param self this object
+    # @param factor the number of signals aggregated into a block
+    # @param num_ch the number of channels
+    # @param capacity the number of blocks kept in memory
+    # @param spill_path the path of the spill file, None to discard old blocks
+    #
+    def __init__(self, factor: int, num_ch: int, capacity: int, spill_path: str = None):
+        self.factor = factor
+        self.capacity = capacity
+
+        # a block record: start index of the block, min/max/mean of each channel
+        self.dtype = np.dtype([
+            ('idx', '<i8'),
+            ('min', '<f4', (num_ch,)),
+            ('max', '<f4', (num_ch,)),
+            ('mean', '<f4', (num_ch,)),
+        ])
+
+        self.__ring = np.zeros(capacity, dtype=self.dtype)
+        self.__head = 0
+        self.__size = 0
+
+        # the number of blocks in the spill file
+        self.__spill_path = spill_path
+        self.__spill_fp = open(spill_path, 'wb') if spill_path is not None else None
+        self.__num_spilled = 0
+
+    ##
+    # Destructor of DepsHistoryTier class
+    #
+    def __del__(self):
+        if self.__spill_fp is not None:
+            self.__spill_fp.close()
+
+    ##
+    # This function is used to push the completed blocks into the ring buffer.
+    #
+    # @param self this object
+    # @param blocks an array of block records
+    #
+    def push(self, blocks: np.ndarray):
+        num = len(blocks)
+        if num == 0:
+            return
+
+        # the blocks to be overwritten go to the spill file first
+        num_over = max(0, self.__size + num - self.capacity)
+        if num_over > 0:
+            if self.__spill_fp is not None:
+                old = self.ordered()
+                old_num = min(num_over, len(old))
+                old[:old_num].tofile(self.__spill_fp)
+                blocks[:num_over - old_num].tofile(self.__spill_fp)
+                self.__spill_fp.flush()
+                self.__num_spilled += num_over
+
+        if num >= self.capacity:
+            self.__ring[:] = blocks[num - self.capacity:]
+            self.__head = 0
+            self.__size = self.capacity
+            return
+
+        end = self.__head + num
+        if end <= self.capacity:
+            self.__ring[self.__head:end] = blocks
+        else:
+            split = self.capacity - self.__head
+            self.__ring[self.__head:] = blocks[:split]
+            self.__ring[:end - self.capacity] = blocks[split:]
+
+        self.__head = end % self.capacity
+        self.__size = min(self.capacity, self.__size + num)
+
+    ##
+    # This function returns the blocks in memory in order of the index.
+    #
+    # @param self this object
+    # @return an array of block records
+    #
+    def ordered(self):
+        if self.__size < self.capacity:
+            return self.__ring[:self.__size]
+
+        return np.concatenate((self.__ring[self.__head:], self.__ring[:self.__head]))
+
+    ##
+    # This function returns the start index of the oldest available block.
+    #
+    # @param self this object
+    # @return the signal index, None if there is no block
+    #
+    def first_index(self):
+        if self.__num_spilled > 0:
+            return int(np.memmap(self.__spill_path, dtype=self.dtype, mode='r', shape=(1,))['idx'][0])
+
+        if self.__size == 0:
+            return None
+
+        return int(self.ordered()['idx'][0])
+
+    ##
+    # This function returns the blocks overlapping the given range of signals.
+    #
+    # @param self this object
+    # @param s_idx the start index of the signals
+    # @param e_idx the end index of the signals
+    # @return an array of block records
+    #
+    def query(self, s_idx: int, e_idx: int):
+        blocks = self.ordered()
+        parts = []
+
+        # the older blocks are read from the spill file
+        if self.__num_spilled > 0 and (len(blocks) == 0 or s_idx < blocks['idx'][0]):
+            spilled = np.memmap(self.__spill_path, dtype=self.dtype, mode='r',
+                                shape=(self.__num_spilled,))
+            lo = max(0, np.searchsorted(spilled['idx'], s_idx, side='right') - 1)
+            hi = np.searchsorted(spilled['idx'], e_idx, side='left')
+            parts.append(np.array(spilled[lo:hi]))
+
+        lo = max(0, np.searchsorted(blocks['idx'], s_idx, side='right') - 1)
+        hi = np.searchsorted(blocks['idx'], e_idx, side='left')
+        parts.append(blocks[lo:hi])
+
+        return np.concatenate(parts) if len(parts) > 1 else parts[0]
+
+#######################################################################
+# DepsTieredHistory class
+#######################################################################
+
+class DepsTieredHistory:
+
+    ##
+    # Constructor of DepsTieredHistory class. It keeps the downsampled
+    # history of all the channels, so that a whole test can be viewed
+    # without the full-resolution data.
+    #
+    # @param self this object
+    # @param num_ch the number of channels
+    # @param factors the downsampling factors of the tiers
+    # @param capacity the number of blocks kept in memory for each tier
+    # @param spill_dir the directory of the spill files, None not to spill
+    #
+    def __init__(self, num_ch: int = 4, factors: tuple = DEPS_HISTORY_FACTORS,
+                 capacity: int = DEPS_HISTORY_CAPACITY, spill_dir: str = None):
+        self.num_ch = num_ch
+        self.tiers = []
+
+        for factor in factors:
+            spill_path = None
+            if spill_dir is not None:
+                spill_path = os.path.join(spill_dir, 'history_x{}.bin'.format(factor))
+            self.tiers.append(DepsHistoryTier(factor, num_ch, capacity, spill_path))
+
+        # the blocks not completed yet for each tier
+        self.__pending = [np.zeros(0, dtype=tier.dtype) for tier in self.tiers]
+
+        # the total number of appended signals
+        self.num_signals = 0
+
+    ##
+    # This function is used to append the new signals of all the channels.
+    #
+    # @param self this object
+    # @param sig an array of the signals, (num_ch, num_signals)
+    #
+    def append(self, sig: np.ndarray):
+        num = sig.shape[1]
+        if num == 0:
+            return
+
+        # the signals are the blocks of the lowest tier
+        blocks = np.zeros(num, dtype=self.tiers[0].dtype)
+        blocks['idx'] = np.arange(self.num_signals, self.num_signals + num)
+        blocks['min'] = sig.T
+        blocks['max'] = sig.T
+        blocks['mean'] = sig.T
+        self.num_signals += num
+
+        # every tier is built from the completed blocks of the tier below
+        prev_factor = 1
+        for i, tier in enumerate(self.tiers):
+            ratio = tier.factor // prev_factor
+            prev_factor = tier.factor
+
+            if ratio > 1:
+                blocks = np.concatenate((self.__pending[i], blocks))
+                num_done = len(blocks) // ratio
+                self.__pending[i] = blocks[num_done * ratio:]
+                blocks = aggregate_blocks(blocks[:num_done * ratio], ratio)
+
+            tier.push(blocks)
+
+            if len(blocks) == 0:
+                break
+
+    ##
+    # This function returns the history of the given range of signals with
+    # the finest tier which has no more than the given number of points.
+    #
+    # @param self this object
+    # @param s_idx the start index of the signals
+    # @param e_idx the end index of the signals
+    # @param max_points the maximum number of points, e.g. the width of the plot
+    # @return (factor, x, min, max, mean), x is the center index of each block and
+    #         min/max/mean are arrays of (num_ch, num_points)
+    #
+    def query(self, s_idx: int, e_idx: int, max_points: int = 2000):
+        s_idx = max(0, s_idx)
+        e_idx = min(self.num_signals, e_idx)
+
+        tier = self.tiers[-1]
+        for candidate in self.tiers:
+            if (e_idx - s_idx) // candidate.factor > max_points:
+                continue
+
+            # the tier has to hold the start of the range
+            first = candidate.first_index()
+            if first is not None and first <= s_idx:
+                tier = candidate
+                break
+
+        blocks = tier.query(s_idx, e_idx)
+        x = blocks['idx'] + (tier.factor - 1) / 2.0
+
+        return tier.factor, x, blocks['min'].T, blocks['max'].T, blocks['mean'].T
+
+###################################################################
+# Utility functions
+###################################################################
+
+##
+# This function is used to aggregate every 'ratio' blocks into one.
+#
+# @param blocks an array of block records, its length is a multiple of ratio
+# @param ratio the number of blocks to be aggregated
+# @return an array of the aggregated block records
+#
+def aggregate_blocks(blocks: np.ndarray, ratio: int):
+    num = len(blocks) // ratio
+    result = np.zeros(num, dtype=blocks.dtype)
+    if num == 0:
+        return result
+
+    num_ch = blocks['min'].shape[1]
+    result['idx'] = blocks['idx'][::ratio]
+    result['min'] = blocks['min'].reshape(num, ratio, num_ch).min(axis=1)
+    result['max'] = blocks['max'].reshape(num, ratio, num_ch).max(axis=1)
+    result['mean'] = blocks['mean'].reshape(num, ratio, num_ch).mean(axis=1)
+    return result
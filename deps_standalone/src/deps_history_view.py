@@ -0,0 +1,170 @@
+#############################################################
+# deps_history_view.py
+#
+# Created: 2026. 10. 19
+#
+# Authors:
+#    Youngsun Han (youngsun@pknu.ac.kr)
+#
+# Quantum Computing Laboratory (quantum.pknu.ac.kr)
+#############################################################
+
+from PyQt5.QtCore import QObject, QTimer
+
+from deps_history import DepsTieredHistory
+
+#######################################################################
+# DepsHistoryView class
+#######################################################################
+
+class DepsHistoryView(QObject):
+
+    # delay to coalesce the range changes while zooming (msec)
+    REDRAW_DELAY: int = 50
+
+    ##
+    # Constructor of DepsHistoryView class. It shows the tiered history of
+    # the whole test on the raw data plots, instead of the current window.
+    # The tier is chosen by the visible range and the width of each plot.
+    #
+    # @param self this object
+    # @param plot_widgets the raw data plot widgets, one per channel
+    # @param colors the colors of the channels
+    # @param history the tiered history of the data processor
+    #
+    def __init__(self, plot_widgets: list, colors: list, history: DepsTieredHistory):
+        super().__init__()
+
+        self.active = False
+
+        self.__plot_widgets = plot_widgets
+        self.__colors = colors
+        self.__history = history
+
+        # curves (mean, min, max) of each plot
+        self.__curves = []
+
+        # visible range of the signal index
+        self.__range = None
+        self.__num_drawn = 0
+
+        self.__timer = QTimer(self)
+        self.__timer.setSingleShot(True)
+        self.__timer.timeout.connect(self.redraw)
+
+    ##
+    # This function is used to switch between the history view and the live view.
+    #
+    # @param self this object
+    #
+    def toggle(self):
+        if self.active:
+            self.leave()
+        else:
+            self.enter()
+
+    ##
+    # This function is used to start showing the history.
+    #
+    # @param self this object
+    #
+    def enter(self):
+        import pyqtgraph as pg
+
+        self.active = True
+        self.__curves = []
+
+        for pw, color in zip(self.__plot_widgets, self.__colors):
+            pw.clear()
+
+            envelope = pg.mkColor(color)
+            envelope.setAlpha(96)
+
+            self.__curves.append((pw.plot(pen=color),
+                                  pw.plot(pen=envelope),
+                                  pw.plot(pen=envelope)))
+
+            vb = pw.getViewBox()
+            vb.setAutoVisible(y=True)
+            vb.enableAutoRange(axis='y')
+
+            # all the plots are zoomed together
+            if pw is not self.__plot_widgets[0]:
+                pw.setXLink(self.__plot_widgets[0].getViewBox())
+
+        self.__plot_widgets[0].getViewBox().sigXRangeChanged.connect(self.__slot_range_changed)
+
+        # whole test at first
+        self.__range = (0, self.__history.num_signals)
+        self.__plot_widgets[0].setXRange(0, max(1, self.__history.num_signals), padding=0)
+
+        self.redraw()
+
+    ##
+    # This function is used to stop showing the history.
+    #
+    # @param self this object
+    #
+    def leave(self):
+        self.active = False
+        self.__timer.stop()
+
+        self.__plot_widgets[0].getViewBox().sigXRangeChanged.disconnect(self.__slot_range_changed)
+
+        for pw in self.__plot_widgets:
+            pw.setXLink(None)
+            pw.clear()
+            pw.enableAutoRange()
+
+        self.__curves = []
+
+    ##
+    # This function is called periodically to show the newly appended signals.
+    #
+    # @param self this object
+    #
+    def refresh(self):
+        num = self.__history.num_signals
+        if num == self.__num_drawn:
+            return
+
+        # keep following the end of the test if it is visible
+        s_idx, e_idx = self.__range
+        if e_idx >= self.__num_drawn:
+            self.__range = (s_idx, num)
+            self.__plot_widgets[0].setXRange(s_idx, num, padding=0)
+
+        self.redraw()
+
+    ##
+    # This function is used to redraw the visible range with the proper tier.
+    #
+    # @param self this object
+    #
+    def redraw(self):
+        if not self.active:
+            return
+
+        s_idx, e_idx = self.__range
+        width = max(100, self.__plot_widgets[0].width())
+
+        factor, x, mn, mx, me = self.__history.query(int(s_idx), int(e_idx) + 1, width)
+        self.__num_drawn = self.__history.num_signals
+
+        for ch, (mean_curve, min_curve, max_curve) in enumerate(self.__curves):
+            mean_curve.setData(x, me[ch])
+
+            # the envelope is meaningless for the full resolution
+            if factor > 1:
+                min_curve.setData(x, mn[ch])
+                max_curve.setData(x, mx[ch])
+            else:
+                min_curve.clear()
+                max_curve.clear()
+
+    ##
+    # This is a slot function to handle the range change by zooming or panning.
+    #
+    def __slot_range_changed(self, vb, rng):
+        self.__range = (max(0, rng[0]), rng[1])
+        self.__timer.start(DepsHistoryView.REDRAW_DELAY)
@@ -0,0 +1,272 @@
+#############################################################
+# deps_ingest_queue.py
+#
+# Created: 2026. 10. 19
+#
+# Authors:
+#    Youngsun Han (youngsun@pknu.ac.kr)
+#
+# Quantum Computing Laboratory (quantum.pknu.ac.kr)
+#############################################################
+
+import threading
+from array import array
+
+# overflow policies
+DEPS_QUEUE_BLOCK = 'block'
+DEPS_QUEUE_DROP_OLDEST = 'drop-oldest'
+DEPS_QUEUE_DROP_NEWEST = 'drop-newest'
+
+DEPS_QUEUE_POLICIES = (
+    DEPS_QUEUE_BLOCK,
+    DEPS_QUEUE_DROP_OLDEST,
+    DEPS_QUEUE_DROP_NEWEST,
+)
+
+# the maximum length of a line, e.g. "SPD:+00.0,ANG:-0099,TRQ:+2732,CUR:+07.0,TIM:[MSEC]\r\n"
+DEPS_QUEUE_SLOT_SIZE = 128
+
+#######################################################################
+# DepsIngestStats class
+#######################################################################
+
+class DepsIngestStats:
+
+    ##
+    # Constructor of DepsIngestStats class. The counters are shared by
+    # the ingestion queue (received, dropped) and the data processor
+    # (parsed, invalid, out-of-range).
+    #
+    # @param self this object
+    #
+    def __init__(self):
+        self.reset()
+
+    ##
+    # This function is used to reset all the counters.
+    #
+    # @param self this object
+    #
+    def reset(self):
+        self.received = 0
+        self.parsed = 0
+        self.invalid = 0
+        self.out_of_range = 0
+        self.dropped = 0
+
+    ##
+    # This function returns all the counters as a dictionary.
+    #
+    # @param self this object
+    # @return a dictionary of the counters
+    #
+    def as_dict(self):
+        return {
+            'received': self.received,
+            'parsed': self.parsed,
+            'invalid': self.invalid,
+            'out_of_range': self.out_of_range,
+            'dropped': self.dropped,
+        }
+
+    ##
+    # This function returns all the counters as a string.
+    #
+    def __str__(self):
+        return 'rx:{} ok:{} inv:{} rng:{} drop:{}'.format(
+            self.received, self.parsed, self.invalid, self.out_of_range, self.dropped)
+
+#######################################################################
+# DepsLineBatch class
+#######################################################################
+
+class DepsLineBatch:
+
+    ##
+    # Constructor of DepsLineBatch class. It holds the lines taken from
+    # the ingestion queue at once in preallocated slots of the same size,
+    # so that it is reused by the consumer without allocating the lines.
+    #
+    # @param self this object
+    # @param capacity the maximum number of lines
+    # @param slot_size the maximum length of a line in bytes
+    #
+    def __init__(self, capacity: int, slot_size: int):
+        self.capacity = capacity
+        self.slot_size = slot_size
+
+        # line bytes, each at (index * slot_size), with the lengths and the arrival times
+        self.data = bytearray(capacity * slot_size)
+        self.lengths = array('H', bytes(2 * capacity))
+        self.arrivals = array('q', bytes(8 * capacity))
+        self.count = 0
+
+        self.view = memoryview(self.data)
+
+    ##
+    # This function returns the number of lines.
+    #
+    def __len__(self):
+        return self.count
+
+    ##
+    # This function returns a line without copying it. The view is valid
+    # until the batch is filled again.
+    #
+    # @param self this object
+    # @param index the index of the line
+    # @return a memoryview of the line bytes
+    #
+    def line(self, index: int):
+        offset = index * self.slot_size
+        return self.view[offset:offset + self.lengths[index]]
+
+    ##
+    # The lines are iterated as (memoryview of the line bytes, arrival time).
+    #
+    def __iter__(self):
+        for i in range(self.count):
+            yield self.line(i), self.arrivals[i]
+
+#######################################################################
+# DepsIngestQueue class
+#######################################################################
+
+class DepsIngestQueue:
+
+    ##
+    # Constructor of DepsIngestQueue class. This is a bounded queue between
+    # the transport thread (producer) and the gui thread (consumer). The
+    # lines are copied into preallocated slots, so the transport can reuse
+    # its read buffer and no object is allocated per line.
+    #
+    # @param self this object
+    # @param capacity the maximum number of queued lines
+    # @param policy the overflow policy (block, drop-oldest, drop-newest)
+    # @param stats the counters to be updated, created if None
+    # @param slot_size the maximum length of a line in bytes, the longer lines are invalid
+    #
+    def __init__(self, capacity: int = 4096, policy: str = DEPS_QUEUE_DROP_OLDEST,
+                 stats: DepsIngestStats = None, slot_size: int = DEPS_QUEUE_SLOT_SIZE):
+        if policy not in DEPS_QUEUE_POLICIES:
+            raise ValueError('invalid queue policy: ' + policy)
+
+        self.capacity = capacity
+        self.policy = policy
+        self.slot_size = slot_size
+        self.stats = stats if stats is not None else DepsIngestStats()
+
+        # ring of the line slots, the lengths and the arrival times
+        self.__data = bytearray(capacity * slot_size)
+        self.__lengths = array('H', bytes(2 * capacity))
+        self.__arrivals = array('q', bytes(8 * capacity))
+        self.__head = 0
+        self.__count = 0
+
+        self.__data_view = memoryview(self.__data)
+        self.__lengths_view = memoryview(self.__lengths)
+        self.__arrivals_view = memoryview(self.__arrivals)
+
+        # lines taken by the consumer
+        self.batch = DepsLineBatch(capacity, slot_size)
+
+        self.__cond = threading.Condition()
+        self.__closed = False
+
+    ##
+    # This function returns the number of queued lines.
+    #
+    def __len__(self):
+        return self.__count
+
+    ##
+    # This function is used to put a line into the queue. It is called
+    # by the transport thread. The line is copied, so the given buffer
+    # can be reused as soon as this function returns.
+    #
+    # @param self this object
+    # @param line the line bytes (bytes, bytearray or memoryview)
+    # @param arrival_ns arrival time of the line (time.monotonic_ns())
+    # @return true if the queue was empty, i.e., the consumer has to be notified
+    #
+    def put(self, line, arrival_ns: int):
+        num_bytes = len(line)
+
+        with self.__cond:
+            self.stats.received += 1
+
+            if num_bytes > self.slot_size:
+                self.stats.invalid += 1
+                return False
+
+            if self.__count >= self.capacity:
+                if self.policy == DEPS_QUEUE_DROP_NEWEST:
+                    self.stats.dropped += 1
+                    return False
+                elif self.policy == DEPS_QUEUE_DROP_OLDEST:
+                    self.__head = (self.__head + 1) % self.capacity
+                    self.__count -= 1
+                    self.stats.dropped += 1
+                else:
+                    # backpressure to the transport
+                    while self.__count >= self.capacity and not self.__closed:
+                        self.__cond.wait()
+
+                    if self.__closed:
+                        self.stats.dropped += 1
+                        return False
+
+            tail = (self.__head + self.__count) % self.capacity
+            offset = tail * self.slot_size
+            self.__data_view[offset:offset + num_bytes] = line
+            self.__lengths[tail] = num_bytes
+            self.__arrivals[tail] = arrival_ns
+
+            self.__count += 1
+            return self.__count == 1
+
+    ##
+    # This function is used to take the queued lines into the batch. It is
+    # called by the gui thread, and the batch is overwritten at the next call.
+    #
+    # @param self this object
+    # @param count the maximum number of lines, all the lines if -1
+    # @return the batch of the taken lines
+    #
+    def drain(self, count: int = -1):
+        batch = self.batch
+
+        with self.__cond:
+            num = self.__count if count == -1 else min(count, self.__count)
+
+            # the ring is copied in two parts if it wraps around
+            pos = 0
+            while pos < num:
+                head = self.__head
+                part = min(num - pos, self.capacity - head)
+
+                batch.view[pos * self.slot_size:(pos + part) * self.slot_size] = \
+                    self.__data_view[head * self.slot_size:(head + part) * self.slot_size]
+                memoryview(batch.lengths)[pos:pos + part] = self.__lengths_view[head:head + part]
+                memoryview(batch.arrivals)[pos:pos + part] = self.__arrivals_view[head:head + part]
+
+                self.__head = (head + part) % self.capacity
+                self.__count -= part
+                pos += part
+
+            batch.count = num
+
+            # wake up the blocked producer
+            self.__cond.notify_all()
+
+        return batch
+
+    ##
+    # This function is used to close the queue and release a blocked producer.
+    #
+    # @param self this object
+    #
+    def close(self):
+        with self.__cond:
+            self.__closed = True
+            self.__cond.notify_all()
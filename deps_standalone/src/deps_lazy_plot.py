@@ -0,0 +1,79 @@
+#############################################################
+# deps_lazy_plot.py
+#
+# Created: 2026. 10. 19
+#
+# Authors:
+#    Youngsun Han (youngsun@pknu.ac.kr)
+#
+# Quantum Computing Laboratory (quantum.pknu.ac.kr)
+#############################################################
+
+from PyQt5.QtWidgets import QWidget, QVBoxLayout
+
+#######################################################################
+# PlotWidget class
+#######################################################################
+
+class PlotWidget(QWidget):
+
+    ##
+    # Constructor of PlotWidget class. This is a placeholder of the
+    # pyqtgraph PlotWidget used by the compiled ui module. pyqtgraph is
+    # imported and the real widget is created at the first use, so that
+    # the main window can be shown without waiting for pyqtgraph.
+    #
+    # @param self this object
+    # @param parent the parent widget
+    #
+    def __init__(self, parent=None, **kwargs):
+        self._kwargs = kwargs
+        self._widget = None
+        self._on_create = []
+
+        super().__init__(parent)
+
+        layout = QVBoxLayout(self)
+        layout.setContentsMargins(0, 0, 0, 0)
+
+    ##
+    # This function is used to register a function to be called
+    # with the real widget when it is created.
+    #
+    # @param self this object
+    # @param func a function taking the pyqtgraph PlotWidget
+    #
+    def on_create(self, func):
+        if self._widget is not None:
+            func(self._widget)
+        else:
+            self._on_create.append(func)
+
+    ##
+    # This function returns the real pyqtgraph PlotWidget.
+    #
+    # @param self this object
+    # @return the pyqtgraph PlotWidget
+    #
+    def widget(self):
+        if self._widget is None:
+            import pyqtgraph
+
+            self._widget = pyqtgraph.PlotWidget(self, **self._kwargs)
+            self.layout().addWidget(self._widget)
+
+            for func in self._on_create:
+                func(self._widget)
+            self._on_create = []
+
+        return self._widget
+
+    ##
+    # The methods of pyqtgraph PlotWidget (plot, clear, getPlotItem, ...)
+    # are delegated to the real widget.
+    #
+    def __getattr__(self, name: str):
+        if name.startswith('_'):
+            raise AttributeError(name)
+
+        return getattr(self.widget(), name)
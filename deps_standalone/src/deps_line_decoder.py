@@ -0,0 +1,151 @@
+#############################################################
+# deps_line_decoder.py
+#
+# Created: 2026. 10. 19
+#
+# Authors:
+#    Youngsun Han (youngsun@pknu.ac.kr)
+#
+# Quantum Computing Laboratory (quantum.pknu.ac.kr)
+#############################################################
+
+import numpy as np
+
+# layout of a sensor line sent by the firmware, the optional device timestamp
+# ",TIM:[MSEC]" may follow it. '+' is a sign, and '0' is a digit
+DEPS_LINE_LAYOUT = b'SPD:+00.0,ANG:+0000,TRQ:+0000,CUR:+00.0'
+DEPS_LINE_TIM = b',TIM:'
+
+# the maximum number of digits of the device timestamp
+DEPS_LINE_TIM_DIGITS = 18
+
+# no device timestamp in the line, as DEPS_TIME_NONE
+DEPS_LINE_TIME_NONE = -1
+
+#######################################################################
+# DepsLineDecoder class
+#######################################################################
+
+class DepsLineDecoder:
+
+    ##
+    # Constructor of DepsLineDecoder class. It decodes a batch of the sensor
+    # lines (DepsLineBatch) into preallocated arrays at once. The lines in
+    # the layout of the firmware are decoded by numpy from the bytes in place,
+    # without creating any string or float object per line, and the others
+    # are given to the fallback parser one by one.
+    #
+    # @param self this object
+    # @param parser the fallback parser of a line string, which returns the
+    #        values (spd, ang, trq, cur) and the device timestamp, or None
+    #
+    def __init__(self, parser):
+        self.parser = parser
+
+        # decoded values (spd, ang, trq, cur), device timestamps and validity per line
+        self.values = np.empty((0, 4))
+        self.dev = np.empty(0, dtype=np.int64)
+        self.valid = np.empty(0, dtype=bool)
+
+        layout = np.frombuffer(DEPS_LINE_LAYOUT, dtype=np.uint8)
+        self.__sign_pos = np.flatnonzero(layout == ord('+'))
+        self.__digit_pos = np.flatnonzero(layout == ord('0'))
+        self.__fixed_pos = np.flatnonzero((layout != ord('+')) & (layout != ord('0')))
+        self.__fixed = layout[self.__fixed_pos]
+
+        # the digits of each channel, i.e., between the commas
+        channels = np.cumsum(layout == ord(','))[self.__digit_pos]
+        self.__digits = [np.flatnonzero(channels == ch) for ch in range(4)]
+
+        # the divisors of the fixed-point values by the decimals in the layout, e.g. 10 for "+00.0"
+        self.__divisors = [10 ** len(field.partition(b'.')[2]) for field in DEPS_LINE_LAYOUT.split(b',')]
+
+    ##
+    # This function is used to grow the arrays to the given number of lines.
+    #
+    # @param self this object
+    # @param capacity the number of lines
+    #
+    def reserve(self, capacity: int):
+        if capacity > len(self.valid):
+            self.values = np.empty((capacity, 4))
+            self.dev = np.empty(capacity, dtype=np.int64)
+            self.valid = np.empty(capacity, dtype=bool)
+
+    ##
+    # This function is used to decode a batch of lines. The results are in
+    # the first len(batch) rows of values, dev and valid.
+    #
+    # @param self this object
+    # @param batch the batch of the lines taken from the ingestion queue
+    # @return the number of the lines
+    #
+    def decode(self, batch):
+        num = len(batch)
+        self.reserve(num)
+        if num == 0:
+            return 0
+
+        width = len(DEPS_LINE_LAYOUT)
+        lines = np.frombuffer(batch.data, dtype=np.uint8,
+                              count=num * batch.slot_size).reshape(num, batch.slot_size)
+        ends = np.frombuffer(batch.lengths, dtype=np.uint16, count=num).astype(np.intp)
+
+        # trailing white spaces, e.g. "\r\n"
+        rows = np.arange(num)
+        for _ in range(4):
+            last = lines[rows, np.maximum(ends - 1, 0)]
+            ends -= (ends > 0) & ((last == 0x0A) | (last == 0x0D) | (last == 0x20) | (last == 0x09))
+
+        head = lines[:, :width]
+        signs = head[:, self.__sign_pos]
+        digits = head[:, self.__digit_pos].astype(np.int64) - ord('0')
+
+        fast = (ends >= width) & np.all(head[:, self.__fixed_pos] == self.__fixed, axis=1)
+        fast &= np.all((signs == ord('+')) | (signs == ord('-')), axis=1)
+        fast &= np.all((digits >= 0) & (digits <= 9), axis=1)
+
+        # the fixed-point values at the scales of the wire format, e.g. "+02.0" is 20 / 10
+        values = self.values[:num]
+        for ch, idx in enumerate(self.__digits):
+            acc = np.zeros(num, dtype=np.int64)
+            for i in idx:
+                acc = acc * 10 + digits[:, i]
+            values[:, ch] = np.where(signs[:, ch] == ord('-'), -acc, acc) / self.__divisors[ch]
+
+        # the device timestamp
+        dev = self.dev[:num]
+        dev[:] = DEPS_LINE_TIME_NONE
+
+        tim_start = width + len(DEPS_LINE_TIM)
+        has_tim = fast & (ends > tim_start) & (batch.slot_size > tim_start)
+        if np.any(has_tim):
+            prefix = np.frombuffer(DEPS_LINE_TIM, dtype=np.uint8)
+            num_digits = ends - tim_start
+            has_tim &= np.all(lines[:, width:tim_start] == prefix, axis=1)
+            has_tim &= num_digits <= DEPS_LINE_TIM_DIGITS
+
+            max_digits = min(DEPS_LINE_TIM_DIGITS, batch.slot_size - tim_start)
+            tim_digits = lines[:, tim_start:tim_start + max_digits].astype(np.int64) - ord('0')
+
+            acc = np.zeros(num, dtype=np.int64)
+            for i in range(max_digits):
+                in_tim = i < num_digits
+                has_tim &= ~in_tim | ((tim_digits[:, i] >= 0) & (tim_digits[:, i] <= 9))
+                acc = np.where(in_tim, acc * 10 + tim_digits[:, i], acc)
+
+            dev[has_tim] = acc[has_tim]
+
+        # the other items are left to the fallback parser
+        fast &= (ends == width) | has_tim
+
+        valid = self.valid[:num]
+        valid[:] = fast
+
+        for i in np.flatnonzero(~fast):
+            result = self.parser(bytes(batch.line(int(i))).decode('ISO-8859-1').rstrip())
+            if result is not None:
+                values[i], dev[i] = result
+                valid[i] = True
+
+        return num
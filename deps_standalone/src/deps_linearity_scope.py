@@ -0,0 +1,203 @@
+#############################################################
+# deps_linearity_scope.py
+#
+# Created: 2026. 10. 19
+#
+# Authors:
+#    Youngsun Han (youngsun@pknu.ac.kr)
+#
+# Quantum Computing Laboratory (quantum.pknu.ac.kr)
+#############################################################
+
+import numpy as np
+
+from deps_linearity_store import DepsLinearityStore, xy_sums, linear_regression_sums
+
+# default scope of the short-term regression, the latest 200 points
+DEPS_SCOPE_DEFAULT = 'points:200'
+
+#######################################################################
+# DepsSessionScope class
+#######################################################################
+
+class DepsSessionScope:
+
+    ##
+    # Constructor of DepsSessionScope class. The regression is of all the
+    # points of the session, from the sums kept by the store.
+    #
+    # @param self this object
+    #
+    def __init__(self):
+        self.spec = 'session'
+
+        # the number of the latest points to be kept by the store
+        self.keep = 0
+
+    ##
+    # This function is used to fit the points in this scope.
+    #
+    # @param self this object
+    # @param store the linearity points of a speed level
+    # @param now_ns the current time (time.monotonic_ns())
+    # @return (points, slope, intercept), None if there are less than 2 points
+    #
+    def fit(self, store: DepsLinearityStore, now_ns: int):
+        return fit_sums(store.sums(), store.first + len(store))
+
+#######################################################################
+# DepsPointsScope class
+#######################################################################
+
+class DepsPointsScope:
+
+    ##
+    # Constructor of DepsPointsScope class. The regression is of the latest
+    # points, which are kept by the store.
+    #
+    # @param self this object
+    # @param num the number of the points
+    #
+    def __init__(self, num: int):
+        if num < 2:
+            raise ValueError('Invalid number of points: {}'.format(num))
+
+        self.spec = 'points:{}'.format(num)
+        self.keep = num
+        self.num = num
+
+    def fit(self, store: DepsLinearityStore, now_ns: int):
+        x, y = store.x[-self.num:], store.y[-self.num:]
+        return fit_sums(xy_sums(x, y), len(x))
+
+#######################################################################
+# DepsTimeScope class
+#######################################################################
+
+class DepsTimeScope:
+
+    ##
+    # Constructor of DepsTimeScope class. The regression is of the points of
+    # the latest minutes, by the time when they are committed. They are
+    # limited to the points kept by the store.
+    #
+    # @param self this object
+    # @param minutes the length of the scope (min)
+    #
+    def __init__(self, minutes: float):
+        if minutes <= 0:
+            raise ValueError('Invalid minutes: {}'.format(minutes))
+
+        self.spec = 'minutes:{:g}'.format(minutes)
+        self.keep = 0
+        self.period_ns = int(minutes * 60e9)
+
+    def fit(self, store: DepsLinearityStore, now_ns: int):
+        # the times are in the order of the points
+        start = int(np.searchsorted(store.t, now_ns - self.period_ns))
+        x, y = store.x[start:], store.y[start:]
+        return fit_sums(xy_sums(x, y), len(x))
+
+#######################################################################
+# DepsEwmaScope class
+#######################################################################
+
+class DepsEwmaScope:
+
+    ##
+    # Constructor of DepsEwmaScope class. The regression is weighted by the
+    # age of the points, halved per the given number of newer points. The
+    # weighted sums of the committed points are decayed and updated with
+    # the new points only, so it does not depend on the points kept.
+    #
+    # @param self this object
+    # @param half_life the number of points for the half weight
+    #
+    def __init__(self, half_life: float):
+        if half_life <= 0:
+            raise ValueError('Invalid half life: {}'.format(half_life))
+
+        self.spec = 'ewma:{:g}'.format(half_life)
+        self.keep = 0
+        self.decay = 0.5 ** (1.0 / half_life)
+
+        # weighted sums of the committed points, and the number of them
+        self.__sums = np.zeros(5)
+        self.__total = 0
+
+    def fit(self, store: DepsLinearityStore, now_ns: int):
+        x, y = store.x, store.y
+
+        # the committed points since the last fit, among the points kept
+        start = max(self.__total - store.first, 0)
+        num = store.count - start
+        if num > 0:
+            self.__sums = self.__sums * self.decay ** num + self.__weighted_sums(x[start:store.count],
+                                                                                 y[start:store.count])
+            self.__total = store.first + store.count
+
+        sums = self.__sums
+        if store.tail > 0:
+            sums = sums * self.decay ** store.tail + self.__weighted_sums(x[store.count:], y[store.count:])
+
+        return fit_sums(sums, self.__total + store.tail)
+
+    ##
+    # This function returns the weighted sums of the points, the latest of
+    # which has the weight of 1.
+    #
+    # @param self this object
+    # @param x x positions of the points
+    # @param y y positions of the points
+    # @return an array of the weighted sums
+    #
+    def __weighted_sums(self, x: np.ndarray, y: np.ndarray):
+        w = self.decay ** np.arange(len(x) - 1, -1, -1, dtype=np.float64)
+        return xy_sums(x, y, w)
+
+# regression scopes by the name in the spec
+DEPS_SCOPES = {
+    'session': (DepsSessionScope, ()),
+    'points': (DepsPointsScope, (int,)),
+    'minutes': (DepsTimeScope, (float,)),
+    'ewma': (DepsEwmaScope, (float,)),
+}
+
+###################################################################
+# Utility functions
+###################################################################
+
+##
+# This function is used to create a regression scope from a spec.
+#
+# @param spec the spec of the scope, e.g. "points:200", "minutes:10" or "ewma:100"
+# @return the regression scope, None if the spec is "None"
+#
+def parse_scope_spec(spec: str):
+    spec = spec.strip()
+    if spec == 'None':
+        return None
+
+    items = spec.split(':')
+    if items[0] not in DEPS_SCOPES:
+        raise ValueError('Invalid regression scope: ' + spec)
+
+    scope_class, param_types = DEPS_SCOPES[items[0]]
+    if len(items) - 1 != len(param_types):
+        raise ValueError('Invalid regression scope: ' + spec)
+
+    return scope_class(*[param_type(item) for param_type, item in zip(param_types, items[1:])])
+
+##
+# This function is used to fit the sums of the points in a scope.
+#
+# @param sums an array of the sums (n, x, y, xx, xy)
+# @param num the number of the points
+# @return (points, slope, intercept), None if there are less than 2 points
+#
+def fit_sums(sums: np.ndarray, num: int):
+    if num < 2:
+        return None
+
+    b1, b0 = linear_regression_sums(sums)
+    return num, b1, b0
@@ -0,0 +1,331 @@
+#############################################################
+# deps_linearity_store.py
+#
+# Created: 2026. 10. 19
+#
+# Authors:
+#    Youngsun Han (youngsun@pknu.ac.kr)
+#
+# Quantum Computing Laboratory (quantum.pknu.ac.kr)
+#############################################################
+
+import time
+import numpy as np
+
+# initial capacity of the linearity points of a speed level
+DEPS_LPS_CAPACITY = 256
+
+#######################################################################
+# DepsLinearityStore class
+#######################################################################
+
+class DepsLinearityStore:
+
+    ##
+    # Constructor of DepsLinearityStore class. It keeps the linearity points
+    # of a speed level in numpy arrays of x and y, which grow by doubling.
+    # The committed points, i.e., the segments completed in the evicted
+    # signals, are only appended. They are followed by the tail, the points
+    # of the signals still in the buffers, which is replaced whenever the
+    # signals are processed again. The sums for the regression are kept
+    # along, so a fit does not depend on the number of points.
+    #
+    # If the maximum number of points is given, the oldest committed points
+    # are dropped when twice as many are kept, so the memory is bounded while
+    # the sums still cover the whole session.
+    #
+    # @param self this object
+    # @param capacity the initial number of points
+    # @param max_points the number of the latest committed points to keep, 0 to keep all
+    #
+    def __init__(self, capacity: int = DEPS_LPS_CAPACITY, max_points: int = 0):
+        self.__x = np.empty(capacity)
+        self.__y = np.empty(capacity)
+
+        # the time when the points are committed, or the tail is set (nsec)
+        self.__t = np.empty(capacity, dtype=np.int64)
+
+        self.max_points = max_points
+
+        # the number of dropped points, the number of committed points kept,
+        # and the number of points in the tail
+        self.first = 0
+        self.count = 0
+        self.tail = 0
+
+        # incremented whenever the points change
+        self.generation = 0
+
+        # sums (n, x, y, xx, xy) of the committed points and of the tail
+        self.__sums = np.zeros(5)
+        self.__tail_sums = np.zeros(5)
+
+        # range of x of the committed points kept
+        self.__x_min = np.inf
+        self.__x_max = -np.inf
+
+    def __len__(self):
+        return self.count + self.tail
+
+    ##
+    # x positions of all the points, a view which is valid until the next change
+    #
+    @property
+    def x(self):
+        return self.__x[:self.count + self.tail]
+
+    ##
+    # y positions of all the points, a view which is valid until the next change
+    #
+    @property
+    def y(self):
+        return self.__y[:self.count + self.tail]
+
+    ##
+    # times of all the points (nsec), a view which is valid until the next change
+    #
+    @property
+    def t(self):
+        return self.__t[:self.count + self.tail]
+
+    ##
+    # This function is used to append the committed points. The points of the
+    # evicted signals are usually at the head of the tail, and then they are
+    # committed in place without changing the points. Otherwise the tail is
+    # dropped, since the points of the evicted signals have been in it.
+    #
+    # @param self this object
+    # @param points a list of (x, y) or an array of the shape (n, 2)
+    # @param time_ns the time of the points, time.monotonic_ns() if not given
+    #
+    def append(self, points, time_ns: int = None):
+        pts = as_points(points)
+        num = len(pts)
+
+        if num <= self.tail and self.__is_tail_head(pts):
+            if num == 0:
+                return
+
+            self.count += num
+            self.tail -= num
+            self.__tail_sums = xy_sums(self.__x[self.count:self.count + self.tail],
+                                       self.__y[self.count:self.count + self.tail])
+        else:
+            if self.tail > 0:
+                self.tail = 0
+                self.__tail_sums[:] = 0
+                self.generation += 1
+
+            if num == 0:
+                return
+
+            self.__reserve(self.count + num)
+            self.__x[self.count:self.count + num] = pts[:, 0]
+            self.__y[self.count:self.count + num] = pts[:, 1]
+            self.__t[self.count:self.count + num] = time.monotonic_ns() if time_ns is None else time_ns
+            self.count += num
+            self.generation += 1
+
+        self.__sums += point_sums(pts)
+        self.__x_min = min(self.__x_min, float(pts[:, 0].min()))
+        self.__x_max = max(self.__x_max, float(pts[:, 0].max()))
+
+        if 0 < self.max_points and 2 * self.max_points <= self.count:
+            self.__drop(self.count - self.max_points)
+            self.generation += 1
+
+    ##
+    # This function is used to restore the committed points with the sums of
+    # the session, which can include the points not kept any longer.
+    #
+    # @param self this object
+    # @param points a list of (x, y) or an array of the shape (n, 2)
+    # @param sums an array of the sums (n, x, y, xx, xy) of the session
+    #
+    def restore(self, points, sums: np.ndarray):
+        self.append(points)
+
+        if sums is not None and sums[0] >= self.count:
+            self.__sums = np.array(sums, dtype=np.float64)
+            self.first = int(sums[0]) - self.count
+
+    ##
+    # This function is used to replace the tail. The generation is kept if
+    # the tail is not changed, so that the fit is not repeated.
+    #
+    # @param self this object
+    # @param points a list of (x, y) or an array of the shape (n, 2)
+    # @param time_ns the time of the points, time.monotonic_ns() if not given
+    #
+    def set_tail(self, points, time_ns: int = None):
+        pts = as_points(points)
+        num = len(pts)
+
+        if num == self.tail and self.__is_tail_head(pts):
+            return
+
+        self.__reserve(self.count + num)
+        self.__x[self.count:self.count + num] = pts[:, 0]
+        self.__y[self.count:self.count + num] = pts[:, 1]
+        self.__t[self.count:self.count + num] = time.monotonic_ns() if time_ns is None else time_ns
+        self.tail = num
+
+        self.__tail_sums = point_sums(pts)
+        self.generation += 1
+
+    ##
+    # This function returns the range of x of all the points kept.
+    #
+    # @param self this object
+    # @return (min, max)
+    #
+    def x_range(self):
+        tail_x = self.__x[self.count:self.count + self.tail]
+        if len(tail_x) == 0:
+            return self.__x_min, self.__x_max
+
+        return min(self.__x_min, float(tail_x.min())), max(self.__x_max, float(tail_x.max()))
+
+    ##
+    # This function is used to calculate the linear regression of all the
+    # points of the session, including the dropped ones.
+    #
+    # @param self this object
+    # @return the result of linear regression (slope, intercept)
+    #
+    def regression(self):
+        return linear_regression_sums(self.sums())
+
+    ##
+    # This function returns the sums of all the points of the session.
+    #
+    # @param self this object
+    # @return an array of the sums (n, x, y, xx, xy)
+    #
+    def sums(self):
+        return self.__sums + self.__tail_sums
+
+    ##
+    # This function returns the committed points kept to be stored in a snapshot,
+    # with the sums of all the committed points of the session.
+    #
+    # @param self this object
+    # @return (x, y, sums) numpy arrays
+    #
+    def committed(self):
+        return self.__x[:self.count].copy(), self.__y[:self.count].copy(), self.__sums.copy()
+
+    ##
+    # This function checks whether the tail starts with the given points.
+    #
+    # @param self this object
+    # @param pts an array of the shape (n, 2), not longer than the tail
+    # @return True if the points are the same as the head of the tail
+    #
+    def __is_tail_head(self, pts: np.ndarray):
+        s_idx, e_idx = self.count, self.count + len(pts)
+        return (np.array_equal(self.__x[s_idx:e_idx], pts[:, 0]) and
+                np.array_equal(self.__y[s_idx:e_idx], pts[:, 1]))
+
+    ##
+    # This function is used to grow the arrays for the given number of points.
+    #
+    # @param self this object
+    # @param capacity the number of points
+    #
+    def __reserve(self, capacity: int):
+        if capacity <= len(self.__x):
+            return
+
+        capacity = max(capacity, 2 * len(self.__x))
+        num = self.count + self.tail
+
+        x = np.empty(capacity)
+        y = np.empty(capacity)
+        t = np.empty(capacity, dtype=np.int64)
+        x[:num] = self.__x[:num]
+        y[:num] = self.__y[:num]
+        t[:num] = self.__t[:num]
+        self.__x, self.__y, self.__t = x, y, t
+
+    ##
+    # This function is used to drop the oldest committed points. The points
+    # are moved only once per max_points appended ones.
+    #
+    # @param self this object
+    # @param num the number of points to be dropped
+    #
+    def __drop(self, num: int):
+        end = self.count + self.tail
+
+        self.__x[:end - num] = self.__x[num:end]
+        self.__y[:end - num] = self.__y[num:end]
+        self.__t[:end - num] = self.__t[num:end]
+        self.first += num
+        self.count -= num
+
+        self.__x_min = float(self.__x[:self.count].min())
+        self.__x_max = float(self.__x[:self.count].max())
+
+###################################################################
+# Utility functions
+###################################################################
+
+##
+# This function is used to convert the linearity points into an array.
+#
+# @param points a list of (x, y) or an array of the shape (n, 2)
+# @return an array of the shape (n, 2)
+#
+def as_points(points):
+    return np.asarray(points, dtype=np.float64).reshape(-1, 2)
+
+##
+# This function returns the sums of the points for the linear regression.
+#
+# @param pts an array of the shape (n, 2)
+# @return an array of the sums (n, x, y, xx, xy)
+#
+def point_sums(pts: np.ndarray):
+    return xy_sums(pts[:, 0], pts[:, 1])
+
+##
+# This function returns the sums of the points for the linear regression,
+# which are weighted if the weights are given.
+#
+# @param x x positions of the points
+# @param y y positions of the points
+# @param w weights of the points
+# @return an array of the sums (n, x, y, xx, xy), n is the sum of the weights
+#
+def xy_sums(x: np.ndarray, y: np.ndarray, w: np.ndarray = None):
+    if w is None:
+        return np.array([len(x), x.sum(), y.sum(), np.dot(x, x), np.dot(x, y)])
+
+    wx = w * x
+    return np.array([w.sum(), wx.sum(), np.dot(w, y), np.dot(wx, x), np.dot(wx, y)])
+
+##
+# This function is used to calculate the linear regression from the sums
+# of the points, in the same way as calculate_linear_regression(). For the
+# weighted sums, it is the weighted least squares.
+#
+# @param sums an array of the sums (n, x, y, xx, xy)
+# @return the result of linear regression (slope, intercept)
+#
+def linear_regression_sums(sums: np.ndarray):
+    n, sum_x, sum_y, sum_xx, sum_xy = sums
+
+    # x, y mean
+    x_mean = sum_x / n
+    y_mean = sum_y / n
+
+    # sample covariance and sample variance
+    s_xy = sum_xy - n * x_mean * y_mean
+    s_xx = sum_xx - n * x_mean * x_mean
+
+    # slope, intercept (y = b1 * x + b0)
+    b1 = s_xy / s_xx
+    b0 = y_mean - b1 * x_mean
+
+    return b1, b0
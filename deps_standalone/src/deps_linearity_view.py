@@ -0,0 +1,120 @@
+#############################################################
+# deps_linearity_view.py
+#
+# Created: 2026. 10. 19
+#
+# Authors:
+#    Youngsun Han (youngsun@pknu.ac.kr)
+#
+# Quantum Computing Laboratory (quantum.pknu.ac.kr)
+#############################################################
+
+from deps_linearity_store import DepsLinearityStore
+
+#######################################################################
+# DepsLinearityView class
+#######################################################################
+
+class DepsLinearityView:
+
+    ##
+    # Constructor of DepsLinearityView class. It shows the linearity points
+    # of a speed level with the regression line. The committed points of the
+    # store are appended to the plot only once, and only the tail and the
+    # lines are replaced, so the cost of an update does not grow with the
+    # number of points. The regression in the short-term scope and the
+    # robust fit are drawn beside the one of the session.
+    #
+    # @param self this object
+    # @param plot_widget the linearity plot widget
+    # @param label the linearity label
+    #
+    def __init__(self, plot_widget, label):
+        self.__plot_widget = plot_widget
+        self.__label = label
+
+        # scatters of the committed points and the tail, and the regression
+        # lines of the session, the short-term scope and the robust fit
+        self.__committed = None
+        self.__tail = None
+        self.__line = None
+        self.__scope_line = None
+        self.__robust_line = None
+
+        # the number of the committed points in the plot, after the dropped ones
+        self.__num_drawn = 0
+        self.__first = 0
+
+    ##
+    # This function is used to update the plot with a regression result.
+    #
+    # @param self this object
+    # @param store the linearity points of the speed level
+    # @param slope slope of the regression
+    # @param intercept intercept of the regression
+    # @param linearity the linearity of the regression
+    # @param scope the regression in the short-term scope, a dictionary of the
+    #        scope, the number of points, slope and intercept
+    # @param robust the robust fit, a dictionary of the same keys as the scope
+    #
+    def update(self, store: DepsLinearityStore, slope: float, intercept: float, linearity: float,
+               scope: dict = None, robust: dict = None):
+        if self.__committed is None:
+            self.__create()
+
+        x, y = store.x, store.y
+
+        # the oldest points have been dropped from the store
+        if store.first != self.__first:
+            self.__committed.setData(x=x[:store.count], y=y[:store.count])
+            self.__num_drawn = store.count
+            self.__first = store.first
+
+        # the committed points appended since the last update
+        if store.count > self.__num_drawn:
+            self.__committed.addPoints(x=x[self.__num_drawn:store.count],
+                                       y=y[self.__num_drawn:store.count])
+            self.__num_drawn = store.count
+
+        self.__tail.setData(x=x[store.count:], y=y[store.count:])
+
+        # the regression lines between the ends of the points
+        x_min, x_max = store.x_range()
+        self.__line.setData([x_min, x_max], [slope * x_min + intercept, slope * x_max + intercept])
+
+        tooltip = 'session: {} points, slope {:.5f}'.format(store.first + len(store), slope)
+        for line, fit in ((self.__scope_line, scope), (self.__robust_line, robust)):
+            if fit is None:
+                line.setData([], [])
+                continue
+
+            line.setData([x_min, x_max], [fit['slope'] * x_min + fit['intercept'],
+                                          fit['slope'] * x_max + fit['intercept']])
+            tooltip += '\n{}: {} points, slope {:.5f}'.format(fit['scope'], fit['points'], fit['slope'])
+
+        # the linearity label
+        self.__label.setText('Linearity: {:5.3f}'.format(linearity))
+        self.__label.setToolTip(tooltip)
+
+    ##
+    # This function is used to create the plot items at the first update.
+    #
+    # @param self this object
+    #
+    def __create(self):
+        import pyqtgraph as pg
+        from pyqtgraph.Qt import QtCore
+
+        self.__plot_widget.clear()
+
+        # the same symbols as PlotWidget.plot(symbol='o')
+        self.__committed = pg.ScatterPlotItem(size=10, pen=pg.mkPen(200, 200, 200),
+                                              brush=pg.mkBrush(50, 50, 150))
+        self.__tail = pg.ScatterPlotItem(size=10, pen=pg.mkPen(200, 200, 200),
+                                         brush=pg.mkBrush(50, 50, 150))
+
+        self.__plot_widget.addItem(self.__committed)
+        self.__plot_widget.addItem(self.__tail)
+        self.__line = self.__plot_widget.plot(pen='r')
+        self.__scope_line = self.__plot_widget.plot(pen=pg.mkPen('y', style=QtCore.Qt.DashLine))
+        self.__robust_line = self.__plot_widget.plot(pen=pg.mkPen('g', style=QtCore.Qt.DotLine))
@@ -9,13 +9,62 @@
 # Quantum Computing Laboratory (quantum.pknu.ac.kr)
 #############################################################
 
+import time
+
+# start-up time measurement (--startup-time)
+startup_marks = [('start', time.perf_counter())]
 
 import sys
 import random
 
+from PyQt5.QtCore import QObject, QEvent, QTimer
 from PyQt5.QtWidgets import QApplication
 from deps_main_window import DepsMainWindow
 
+startup_marks.append(('import', time.perf_counter()))
+
+#######################################################################
+# DepsFirstFrameFilter class
+#######################################################################
+
+class DepsFirstFrameFilter(QObject):
+
+    ##
+    # Constructor of DepsFirstFrameFilter class. It reports the start-up
+    # time when the main window is painted for the first time.
+    #
+    # @param self this object
+    # @param app the application to be quit after reporting
+    #
+    def __init__(self, app):
+        super().__init__()
+        self.__app = app
+
+    def eventFilter(self, obj, event):
+        if event.type() == QEvent.Paint:
+            obj.removeEventFilter(self)
+            startup_marks.append(('first frame', time.perf_counter()))
+
+            # report after the paint event has been completed
+            QTimer.singleShot(0, self.report)
+
+        return False
+
+    ##
+    # This function is used to print out the start-up time of each step.
+    #
+    # @param self this object
+    #
+    def report(self):
+        prev = startup_marks[0][1]
+        for name, mark in startup_marks[1:]:
+            print('{:<12}{:>10.1f} ms'.format(name, (mark - prev) * 1000))
+            prev = mark
+
+        print('{:<12}{:>10.1f} ms'.format('total', (prev - startup_marks[0][1]) * 1000))
+        self.__app.closeAllWindows()
+        self.__app.quit()
+
 #############################################################
 # Main function for EPS monitoring software
 #############################################################
@@ -23,7 +72,15 @@ from deps_main_window import DepsMainWindow
 
 if __name__ == '__main__':
     app = QApplication(sys.argv)
+    startup_marks.append(('application', time.perf_counter()))
+
     window = DepsMainWindow()
     window.setWindowTitle("EPS Evaluation v3.0")
+    startup_marks.append(('window', time.perf_counter()))
+
+    if '--startup-time' in sys.argv:
+        first_frame_filter = DepsFirstFrameFilter(app)
+        window.installEventFilter(first_frame_filter)
+
     window.show()
-    sys.exit(app.exec_())
\ No newline at end of file
+    sys.exit(app.exec_())
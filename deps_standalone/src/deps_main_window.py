@@ -10,46 +10,48 @@
 #############################################################
 
 import os.path
+import time
 import threading
 import numpy as np
 from datetime import datetime
-import PyQt5
-from PyQt5 import uic
 from PyQt5.QtCore import pyqtSlot, QByteArray, QThread, pyqtSignal, Qt
-from PyQt5.QtGui import QPixmap, QImage
+from PyQt5.QtGui import QPixmap, QImage, QKeySequence
 from PyQt5.QtCore import QTimer
+from PyQt5.QtWidgets import QShortcut
+
+from deps_monitor_core import DepsMonitorCore
+from deps_data_processor import DepsDataProcessor
+from deps_diag_panel import DepsDiagPanel
+from deps_profiler import profiler
+from deps_refresh_scheduler import DepsRefreshScheduler
+from deps_build_ui import load_main_window_ui
+from deps_history_view import DepsHistoryView
+from deps_linearity_view import DepsLinearityView
+from deps_thermal_camera import open_thermal_capture, DEPS_THERMAL_GAIN, DEPS_THERMAL_OFFSET
 
-from deps_error import DepsError
-from deps_comm_conn import DepsCommConn
-from deps_comm_file import DepsCommFile
-from deps_config_parser import read_config_file
-from deps_data_processor import DepsDataProcessor, calculate_linear_regression_v2, calculate_linear_regression
-
-import cv2
 import os
 from pathlib import Path
 
-
 #######################################################################
 # DepsMainWindow class
 #######################################################################
-# Main window, Main window UI
-MW_Ui, MW_Base = uic.loadUiType(
-    "../deps_standalone/res/deps_main_window_v3.ui")
+# Main window, Main window UI (compiled from deps_main_window_v3.ui)
+MW_Ui, MW_Base = load_main_window_ui()
 
 
 class DepsMainWindow(MW_Base, MW_Ui, QThread):
-    CONFIG_FILE_NAME: str = 'config.ini'
-    PREFIX_SAVE_FILE: str = '../deps_standalone/dat/save_'
-    PSTFIX_SAVE_FILE: str = '.txt'
     # save the thermal image path
     THML_DIRECTORY: str = '../deps_standalone/dat/thermal_image'
     # save the temporary Pixmap
     TMP_DIRECTORY: str = '../deps_standalone/dat/tmp'
-    DATA_FILE_DIR: str = '../deps_standalone/dat/dpeco_current'
+
+    # eps data ready signal, emitted by the transport thread of the monitoring core
+    sig_rawdat_ready = pyqtSignal()
 
     ##
-    # Constructor of DepsMainWindow class
+    # Constructor of DepsMainWindow class. The monitoring pipeline runs in
+    # the monitoring core (DepsMonitorCore), and this main window is a client
+    # of it which shows the signals and the linearity.
     #
     # @param self this object
     #
@@ -68,8 +70,9 @@ class DepsMainWindow(MW_Base, MW_Ui, QThread):
             self.pw_rawdat_crnt
         ]
 
+        # pyqtgraph is loaded at the first plot, not to delay the first frame
         for pw in plot_widgets:
-            pw.getPlotItem().hideAxis('left')
+            pw.on_create(lambda w: w.getPlotItem().hideAxis('left'))
 
         #####################################################################
         # signal/slot connections for gui components
@@ -81,14 +84,53 @@ class DepsMainWindow(MW_Base, MW_Ui, QThread):
         self.pb_camera.clicked.connect(self.slot_camera_set)
 
         #####################################################################
-        # read config file
-        self.__config = read_config_file('../deps_standalone/src/config.ini')
+        # monitoring core with the config file, which restores the saved
+        # sensor data and opens a new save file
+        self.core = DepsMonitorCore('../deps_standalone/src/config.ini', self.print_log)
 
-        self.__config_default = self.__config['DEFAULT']
+        self.__config_default = self.core.config
         # read thermal image update duration
         self.update_time: int = int(self.__config_default['thermaltime'])
         # read current update duration
-        self.current_time_update = self.__config_default['currentupdate']
+        self.current_time_update: int = int(self.__config_default['currentupdate'])
+
+        # adaptive refresh of the plots, the thermal image and the current panel,
+        # slowed down from the configured durations up to the maximum ones under
+        # load, and deferred while the ingestion is behind
+        self.scheduler = DepsRefreshScheduler(DepsMonitorCore.MAX_DRAIN_COUNT)
+        self.scheduler.add('plot', int(self.__config_default.get('plottime', '1000')),
+                           int(self.__config_default.get('plotmaxtime', '1000')))
+        self.scheduler.add('thermal', self.update_time,
+                           int(self.__config_default.get('thermalmaxtime', str(self.update_time))))
+        self.scheduler.add('current', self.current_time_update,
+                           int(self.__config_default.get('currentmaxupdate', str(self.current_time_update))))
+
+        # radiometric thermal capture from the lepton or the recorded raw frames,
+        # otherwise the 8-bit frames of the video device
+        self.thermal = None
+        thermal_source: str = self.__config_default.get('thermalsource', 'None')
+        if thermal_source != 'None':
+            try:
+                self.thermal = open_thermal_capture(thermal_source, self.__config_default.get(
+                    'thermalcalib', '{}:{}'.format(DEPS_THERMAL_GAIN, DEPS_THERMAL_OFFSET)))
+            except (ImportError, OSError, ValueError) as e:
+                self.print_log('Thermal source is not opened: ' + str(e))
+
+        #####################################################################
+        # diagnostics panel (F12)
+        self.diag_panel = DepsDiagPanel(self)
+        self.diag_panel.extra_lines = lambda: self.core.status_lines() + [str(self.scheduler)] + \
+            ([str(self.thermal)] if self.thermal is not None else [])
+        QShortcut(QKeySequence('F12'), self, self.diag_panel.toggle)
+
+        # periodic dump of the timing statistics
+        self.__diag_path: str = self.__config_default.get('diagdump', 'None')
+        if self.__diag_path != 'None':
+            self.diag_timer = QTimer(self)
+            self.diag_timer.timeout.connect(
+                lambda: profiler.dump(self.__diag_path, log=self.print_log))
+            self.diag_timer.start(
+                int(self.__config_default.get('diaginterval', '10000')))
 
         #####################################################################
         # message
@@ -114,31 +156,10 @@ class DepsMainWindow(MW_Base, MW_Ui, QThread):
             self.cb_loading_heavy.setChecked(True)
 
         #####################################################################
-        # threshold value
-        thv = int(self.__config_default['threshold'])
-
-        # eps data processor
-        self.processor = DepsDataProcessor(thv)
-
-        #####################################################################
-        # restore the saved sensor data
-        fname: str = self.__config_default['saved']
-        if fname != 'None':
-            self.__load_rawdat_file(fname)
-
-        # open a new save file
-        self.save_fp = open(new_save_path(), 'w')
-        self.__config_default['saved'] = self.save_fp.name
-
-        # update the config file ('config.ini')
-        if fname == 'None':
-            config_file_name = DepsMainWindow.CONFIG_FILE_NAME
-            with open(config_file_name, 'w') as configfile:
-                self.__config.write(configfile)
-
-        #####################################################################
-        # refresh rate for signal buffers
-        self.refresh_rate: int = int(self.__config_default['refreshrate'])
+        # history view on the raw data plots (F11)
+        self.history_view = DepsHistoryView(plot_widgets, ['r', 'g', 'b', 'y'],
+                                            self.core.processor.history)
+        QShortcut(QKeySequence('F11'), self, self.history_view.toggle)
 
         # internal states for controlling the worker thread
         self.eval_state: bool = True
@@ -151,39 +172,23 @@ class DepsMainWindow(MW_Base, MW_Ui, QThread):
         self.__worker_thread = self.WorkerThread(self, self.__worker_event)
         self.__worker_thread.start()
 
+        # periodic snapshot of the processing state
+        if self.__config_default.get('snapshot', 'None') != 'None':
+            self.snapshot_timer = QTimer(self)
+            self.snapshot_timer.timeout.connect(self.core.write_snapshot_file)
+            self.snapshot_timer.start(
+                int(self.__config_default.get('snapshotinterval', '60000')))
+
         # check first load
         self.first_load = 1
 
         #####################################################################
-        # initialize the uart communication
-        # self.__conn = DepsCommConn()
-        #
-        # # baudrate
-        # baudrate = int(self.__config_default['baudrate'])
-        #
-        # err = self.__conn.open(baudrate)
-        # if err != DepsError.SUCCESS:
-        #     self.print_log("EPS connection is not opened: " + err.name)
-        #     return
+        # the received data is handled in the gui thread, which is notified
+        # through a queued signal from the transport thread
+        self.sig_rawdat_ready.connect(self.slot_esp_rawdat_ready)
 
-        #####################################################################
-        # initialize the uart communication
-        self.__conn = DepsCommFile()
-
-        # filename
-        # err = self.__conn.open('../deps_standalone/dat/test1.txt')
-        err = self.__conn.open(
-            f'{self.DATA_FILE_DIR}/dpeco_data_current_measure_added_240305.txt')
-        if err != DepsError.SUCCESS:
-            self.print_log("EPS connection is not opened: " + err.name)
-            return
-
-        # signal for receiving esp data
-        self.__conn.sig_eps_recv_bytes.connect(
-            lambda v=QByteArray: self.slot_esp_rawdat_received(v))
-
-        # start to receive the eps data
-        self.__conn.start_eps_recv_thread()
+        # initialize the uart communication, or replay the data file
+        self.core.open_transport(self.sig_rawdat_ready.emit)
 
     ##
     # Destructor of DepsMainWindow class
@@ -196,48 +201,11 @@ class DepsMainWindow(MW_Base, MW_Ui, QThread):
         if self.__worker_thread.isRunning():
             self.__worker_event.set()
 
-        # close the save file
-        if self.save_fp is not None:
-            self.save_fp.close()
-
-            # delete the save file if it's size is 0
-            fname = self.save_fp.name
-            if os.path.getsize(fname) == 0:
-                self.print_log("Delete the empty save file: " + fname)
-                os.remove(fname)
-
-        # close the uart connection
-        if self.__conn is not None:
-            self.__conn.close()
-
-    ##
-    # This is a function to restore the data signals from the saved file.
-    #
-    # @param self this object
-    # @param filename the name of the saved file to be stored
-    # @return if restoring is completed well or not
-    #
-    def __load_rawdat_file(self, filename: str) -> bool:
-        # restore the data from the previously saved data file
-        try:
-            save_fp = open(filename, 'r')
-        except FileNotFoundError as e:
-            self.print_log('No file: ' + filename + str(e))
-            return False
-
-        # saved data read
-        while True:
-            line_str = save_fp.readline().rstrip()
-            if not line_str:
-                break
-
-            # transfer the input signal into the data processor
-            self.processor.enqueue_sensor_signal_v2(line_str)
-
-        # close the save file
-        save_fp.close()
-        return True
+        # close the monitoring core and the thermal camera
+        self.core.close()
 
+        if self.thermal is not None:
+            self.thermal.close()
     ###################################################################
     # Slot functions
     ###################################################################
@@ -269,11 +237,11 @@ class DepsMainWindow(MW_Base, MW_Ui, QThread):
     def slot_evaluate_clicked(self):
         if self.eval_state:
             self.eval_state = False
-            self.__conn.stop_eps_recv_thread()
+            self.core.pause()
             self.pb_evaluate.setText('Continue')
         else:
             self.eval_state = True
-            self.__conn.start_eps_recv_thread()
+            self.core.resume()
             self.pb_evaluate.setText('Pause')
 
     ##
@@ -283,18 +251,8 @@ class DepsMainWindow(MW_Base, MW_Ui, QThread):
     #
     @pyqtSlot()
     def slot_rawdat_save_clicked(self):
-        # close the current save file
-        if self.save_fp is not None:
-            self.save_fp.close()
-
-        # update the config file ('config.ini')
-        config_file_name = DepsMainWindow.CONFIG_FILE_NAME
-        with open(config_file_name, 'w') as configfile:
-            self.__config.write(configfile)
-
-        # open a new save file
-        self.save_fp = open(new_save_path(), 'w')
-        self.__config_default['Saved'] = self.save_fp.name
+        # close the current save file, and open a new one
+        self.core.rotate_save_file()
 
     ##
     # This is a slot function to handle the signal when the raw data display button is clicked.
@@ -313,26 +271,15 @@ class DepsMainWindow(MW_Base, MW_Ui, QThread):
         return
 
     ##
-    # This is a slot function for handling the received eps data.
+    # This is a slot function for handling the eps data queued by the transport.
     #
     # @param self this object
     #
     @pyqtSlot()
-    def slot_esp_rawdat_received(self, read_bytes: QByteArray):
-        rawdat = read_bytes.decode('ISO-8859-1').rstrip()
-        datbuf = self.processor.enqueue_sensor_signal_v2(rawdat)
-
-        # YOUNGSUN
-        # print('received: ' + rawdat)
-
-        if datbuf is not None:
-            spd = datbuf[0]
-            ang = datbuf[1]
-            trq = datbuf[2]
-            cur = datbuf[3]
-
-            self.save_fp.write(
-                'SPD:{:5.1f},ANG:{:5.1f},TRQ:{:5.1f}, ,CUR:{:5.1f}\n'.format(spd, ang, trq, cur))
+    def slot_esp_rawdat_ready(self):
+        # yield to the other gui events before handling the rest
+        if self.core.receive():
+            QTimer.singleShot(0, self.slot_esp_rawdat_ready)
 
     ##
     # This is a function to handle the current consumption display
@@ -341,11 +288,18 @@ class DepsMainWindow(MW_Base, MW_Ui, QThread):
     # #
 
     def update_current_consumption(self):
-        min, max, mean = self.processor.calculate_currrent_consumption()
+        if self.scheduler.defer('current', len(self.core.ingest_queue)):
+            return
+
+        start_ns = time.monotonic_ns()
+
+        min, max, mean = self.core.current_consumption()
         self.lb_current_mean.setText('Mean: {:5.1f} A'.format(mean))
         self.lb_current_min.setText('Min: {:5.1f} A'.format(min))
         self.lb_current_max.setText('Max: {:5.1f} A'.format(max))
 
+        self.update_timer.setInterval(self.scheduler.record('current', start_ns))
+
     ##
     # This is a function to save image
     #
@@ -382,8 +336,7 @@ class DepsMainWindow(MW_Base, MW_Ui, QThread):
             self.update_timer = QTimer(self)
             self.update_timer.timeout.connect(self.update_current_consumption)
             self.update_current_consumption()
-            update_interval = self.current_time_update
-            self.update_timer.start(update_interval)
+            self.update_timer.start(self.scheduler.interval('current'))
 
         else:
             self.disp_state = True
@@ -480,20 +433,24 @@ class DepsMainWindow(MW_Base, MW_Ui, QThread):
             self.__stopped = event
             self.__previous_points = None
 
+            # generation of the signals drawn on the raw data graph
+            self.__drawn_generation = -1
+
+            # views of the linearity points of the speed levels
+            self.__linearity_views = [
+                DepsLinearityView(parent.pw_linearity_lv1, parent.lb_linearity_lv1),
+                DepsLinearityView(parent.pw_linearity_lv2, parent.lb_linearity_lv2),
+                DepsLinearityView(parent.pw_linearity_lv3, parent.lb_linearity_lv3)
+            ]
+
             self.timer = QTimer()
             self.timer.timeout.connect(self.__update_frame)
-            update_interval = self.__parent.update_time
-            self.timer.start(update_interval)
+            self.timer.start(self.__parent.scheduler.interval('thermal'))
             # self.__update_frame()
             # Initialize the timer
             self.timer1 = QTimer(self)
             self.timer1.timeout.connect(self.save_thermal_image)
 
-            # a buffer of lps points
-            self.__lps_buffer = []
-            for i in range(3):
-                self.__lps_buffer.append([])
-
             # signal-slot connection
             self.sig_update_graphs.connect(self.slot_update_graphs)
 
@@ -501,13 +458,41 @@ class DepsMainWindow(MW_Base, MW_Ui, QThread):
         # This is a slot function to update all the graphs.
         #
         def slot_update_graphs(self):
-            if self.__parent.disp_state:
-                self.__update_rawdat_graph(self.__parent.processor)
+            core = self.__parent.core
+            scheduler = self.__parent.scheduler
+
+            # the queued data is handled first
+            if scheduler.defer('plot', len(core.ingest_queue)):
+                return
+
+            refresh_ns = time.monotonic_ns()
+
+            # ingestion counters
+            self.__parent.statusbar.showMessage(core.status_message())
+
+            core.processor.update_history()
+
+            if self.__parent.history_view.active:
+                self.__parent.history_view.refresh()
+
+                # the raw data graph is cleared by the history view
+                self.__drawn_generation = -1
+            elif self.__parent.disp_state and self.__drawn_generation != core.processor.generation:
+                self.__drawn_generation = core.processor.generation
+
+                start_ns = time.monotonic_ns()
+                self.__update_rawdat_graph(core.processor)
+                profiler.record_since('render', start_ns)
                 # self.thermal_camera(self.__parent)
 
             if self.__parent.eval_state:
 
-                self.__update_linearity_graph(self.__parent.processor)
+                self.__update_linearity_graph(core)
+
+            # telemetry and metrics
+            core.publish()
+
+            scheduler.record('plot', refresh_ns)
 
         ##
         # This is a function to update the raw data graph.
@@ -533,102 +518,31 @@ class DepsMainWindow(MW_Base, MW_Ui, QThread):
             self.__parent.pw_rawdat_crnt.plot(rawdat[3], pen='y')
 
         ##
-        # This is a function to update the linearity points graph.
+        # This is a function to update the linearity points graph with the
+        # regression results evaluated by the monitoring core.
         #
         # @param self this work thread object
-        # @param proc the data processor for input signals
+        # @param core the monitoring core
         #
-        def __update_linearity_graph(self, proc: DepsDataProcessor):
-
-            # pyqt widgets to plot the linearity points
-            plot_widgets = [
-                self.__parent.pw_linearity_lv1,
-                self.__parent.pw_linearity_lv2,
-                self.__parent.pw_linearity_lv3
-            ]
+        def __update_linearity_graph(self, core: DepsMonitorCore):
+            results = core.evaluate()
+            if results is None:
+                return
 
-            plot_labels = [
-                self.__parent.lb_linearity_lv1,
-                self.__parent.lb_linearity_lv2,
-                self.__parent.lb_linearity_lv3
-            ]
+            # speed levels (0~10, 10~30, 30~60 km/h), only the changed ones
+            for i, result in enumerate(results):
+                if result is None:
+                    continue
 
-            # get the number of stored signals
-            num_sig = proc.num_sensor_signal()
+                start_ns = time.monotonic_ns()
 
-            # linearity calculation
-            lps_list = proc.process(0, num_sig)
+                # plot the new points, the regression lines and the linearity label
+                self.__linearity_views[i].update(result['store'], result['slope'], result['intercept'],
+                                                 result['linearity'], result['scope'], result['robust'])
 
-            if lps_list is None:
-                self.__parent.print_log(
-                    'There are no linearity points to be plot.')
-                return
-            # Initialize previous_point_counts as three separate lists
-            previous_point_counts = [[] for _ in range(len(plot_widgets))]
-            try:
-                # Dictionary to store previous and current counts for each widget
-                previous_counts = {}
-                current_counts = {}
-                previous_point_counts = [
-                    len(self.__lps_buffer[i]) for i in range(len(plot_widgets))]
-                # speed levels (0~10, 10~30, 30~60 km/h)
-                for i in range(len(plot_widgets)):
-                    # temporary lps list
-                    points: list = self.__lps_buffer[i].copy()
-                    # points: list = previous_point_counts[i].copy()
-                    points.extend(lps_list[i])
-                    current_point_count = len(points)
-                    previous_point_count = len(self.__lps_buffer[i])
-                    # Save the counts based on widget number
-                    previous_counts[i] = previous_point_count
-                    current_counts[i] = current_point_count
-                    print(f'Widget index: {i}')
-                    print(f'Current point count: {current_point_count}')
-                    print(f'Previous point count: {previous_point_counts[i]}')
-                    # Check if the number of points has chaged
-                    if current_point_count != previous_point_counts[i] and points != self.__lps_buffer[i]:
-
-                        print(f'Number of points has changed for widget {i}')
-
-                        # Update self.__lps_buffer with the current points
-                        self.__lps_buffer[i] = points.copy()
-
-                        # Update the previous point count
-                        previous_point_counts[i] = current_point_count
-
-                        # a list of linearity points
-                        x, y = zip(*points)
-
-                        # linear regression (slope, intercept)
-                        b1, b0 = calculate_linear_regression(x, y)
-
-                        # calculate predicted y with the regression results
-                        y_pred = b1 * np.array(x) + b0
-
-                        # plot the points and regression line
-                        plot_widgets[i].clear()
-                        plot_widgets[i].plot(x, y, pen=None, symbol='o')
-                        plot_widgets[i].plot(x, y_pred, pen='r')
-
-                        # plot the linearity label
-                        b1, b0 = calculate_linear_regression_v2(x, y)
-                        plot_labels[i].setText('Linearity: {:5.3f}'.format(b1))
-
-            except ValueError as e:
-                print('__update_linearity_graph error: {}'.format(str(e)))
-
-            print('test: ' + str(num_sig))
-
-            # refresh sensor data buffer
-            if num_sig >= self.__parent.refresh_rate:
-                # store all the linearity points into the buffer
-                for i in range(len(lps_list)):
-                    self.__lps_buffer[i].extend(lps_list[i])
-
-                # remove all the sensor data
-                print('before reset buffer - ' + str(proc.num_sensor_signal()))
-                proc.dequeue_sensor_signal()
-                print('after reset buffer - ' + str(proc.num_sensor_signal()))
+                profiler.record_since('render', start_ns)
+                if core.processor.last_arrival_ns:
+                    profiler.record_since('e2e', core.processor.last_arrival_ns)
 
         ##
         # This is a run method of this worker thread.
@@ -636,7 +550,7 @@ class DepsMainWindow(MW_Base, MW_Ui, QThread):
         # @param self this work thread object
         #
         def run(self):
-            while not self.__stopped.wait(1):
+            while not self.__stopped.wait(self.__parent.scheduler.interval('plot') / 1000):
                 self.sig_update_graphs.emit()
 
         ##
@@ -646,53 +560,106 @@ class DepsMainWindow(MW_Base, MW_Ui, QThread):
         #
 
         def __update_frame(self):
+            scheduler = self.__parent.scheduler
+            if scheduler.defer('thermal', len(self.__parent.core.ingest_queue)):
+                return
+
+            start_ns = time.monotonic_ns()
+
             # Capture a frame from the camera
             if self.__parent.camera_state:
-                self.cap = cv2.VideoCapture(0)
-
-                ret, frame = self.cap.read()
-
-                cv2.imwrite(f'{self.__parent.TMP_DIRECTORY}/tmp.jpg', frame)
-                self.cap.release()
-
-                if ret:
-                    # Read the temporaray image as grayscale
-                    gray_frame_16bit = cv2.imread(
-                        f'{self.__parent.TMP_DIRECTORY}/tmp.jpg', cv2.IMREAD_GRAYSCALE)
-                    height, width = gray_frame_16bit.shape
-                    x_center = width // 2
-                    y_center = height // 2
-                    temperature = gray_frame_16bit[x_center, y_center]
-
-                    # Min and Max temperature of EPS system should be
-                    min_tem = -40
-                    max_tem = 85
-                    tem_range = max_tem-min_tem
-                    # pixel_values = gray_frame_16bit.astype(np.float32)
-                    pixel_values = temperature.astype(np.float32)
-
-                    temperatures = ((pixel_values/255) * tem_range) + min_tem
-                    avgt = np.mean(temperatures)
-
-                    # write temperature
-                    cv2.putText(frame, "{0:.1f} C".format(
-                        avgt), (x_center+40, y_center+20), cv2.FONT_HERSHEY_PLAIN, 0.5, (0, 0, 0), 1)
-                    # cv2.imwrite(f'{self.__parent.TMP_DIRECTORY}/tmp_frame.jpg',frame)
-                    if self.__parent.first_load == 1:
-                        cv2.imwrite(
-                            f'{self.__parent.THML_DIRECTORY}/initial.jpg', frame)
-                    # else:
-                    #     cv2.imwrite(f'{self.__parent.TMP_DIRECTORY}/tmp_frame.jpg',frame)
-                    # Process the frame and update the QLabel
-                    self.process_and_update_label(frame)
-                    if self.__parent.first_load == 1:
-                        self.__parent.camera_state = False
-                        self.__parent.pb_camera.setText('On Camera')
-                        self.__parent.first_load += 1
+                if self.__parent.thermal is not None:
+                    captured = self.__update_radiometric_frame(self.__parent.thermal)
+                else:
+                    captured = self.__update_video_frame()
+
+                if captured and self.__parent.first_load == 1:
+                    self.__parent.camera_state = False
+                    self.__parent.pb_camera.setText('On Camera')
+                    self.__parent.first_load += 1
 
             else:
                 print("Failed to capture frame from camera.")
 
+            self.timer.setInterval(scheduler.record('thermal', start_ns))
+
+        ##
+        # This is a method of showing a radiometric frame, whose temperature
+        # frame is kept in the thermal capture for the statistics.
+        #
+        # @param self this work thread object
+        # @param thermal the thermal capture
+        # @return true if a frame is captured
+        #
+        def __update_radiometric_frame(self, thermal):
+            if thermal.capture() is None:
+                print("Failed to capture frame from camera: " + str(thermal.source.error))
+                return False
+
+            image = thermal.render()
+            height, width, channels = image.shape
+
+            # the pixmap is converted from the image in memory
+            pixmap = QPixmap.fromImage(QImage(image.data, width, height, channels * width,
+                                              QImage.Format_RGB888))
+
+            if self.__parent.first_load == 1:
+                pixmap.save(f'{self.__parent.THML_DIRECTORY}/initial.jpg')
+
+            self.show_pixmap(pixmap)
+            return True
+
+        ##
+        # This is a method of showing an 8-bit frame of the video device,
+        # which is mapped to the temperature range of the EPS system.
+        #
+        # @param self this work thread object
+        # @return true if a frame is captured
+        #
+        def __update_video_frame(self):
+            # opencv is loaded at the first use of the camera
+            import cv2
+
+            self.cap = cv2.VideoCapture(0)
+
+            ret, frame = self.cap.read()
+
+            cv2.imwrite(f'{self.__parent.TMP_DIRECTORY}/tmp.jpg', frame)
+            self.cap.release()
+
+            if ret:
+                # Read the temporaray image as grayscale
+                gray_frame_16bit = cv2.imread(
+                    f'{self.__parent.TMP_DIRECTORY}/tmp.jpg', cv2.IMREAD_GRAYSCALE)
+                height, width = gray_frame_16bit.shape
+                x_center = width // 2
+                y_center = height // 2
+                temperature = gray_frame_16bit[x_center, y_center]
+
+                # Min and Max temperature of EPS system should be
+                min_tem = -40
+                max_tem = 85
+                tem_range = max_tem-min_tem
+                # pixel_values = gray_frame_16bit.astype(np.float32)
+                pixel_values = temperature.astype(np.float32)
+
+                temperatures = ((pixel_values/255) * tem_range) + min_tem
+                avgt = np.mean(temperatures)
+
+                # write temperature
+                cv2.putText(frame, "{0:.1f} C".format(
+                    avgt), (x_center+40, y_center+20), cv2.FONT_HERSHEY_PLAIN, 0.5, (0, 0, 0), 1)
+                # cv2.imwrite(f'{self.__parent.TMP_DIRECTORY}/tmp_frame.jpg',frame)
+                if self.__parent.first_load == 1:
+                    cv2.imwrite(
+                        f'{self.__parent.THML_DIRECTORY}/initial.jpg', frame)
+                # else:
+                #     cv2.imwrite(f'{self.__parent.TMP_DIRECTORY}/tmp_frame.jpg',frame)
+                # Process the frame and update the QLabel
+                self.process_and_update_label(frame)
+
+            return ret
+
         ##
         # This is a  method of displaying the thermal image on label
         #
@@ -701,6 +668,8 @@ class DepsMainWindow(MW_Base, MW_Ui, QThread):
 
         def process_and_update_label(self, frame):
             if frame is not None:
+                import cv2
+
                 # Convert the image from BGR to RGB
                 frame = cv2.applyColorMap(frame, cv2.COLORMAP_JET)
                 frame = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
@@ -715,17 +684,27 @@ class DepsMainWindow(MW_Base, MW_Ui, QThread):
                     # pixmap = QPixmap(f'{self.__parent.THML_DIRECTORY}/initial.jpg')
                 # q_image = QImage(frame.data, width, height, bytes_per_line, QImage.Format_RGB888)
 
-                label_width = self.__parent.lb_screen_thermal.width()
-                label_height = self.__parent.lb_screen_thermal.height()
+                self.show_pixmap(pixmap)
 
-                # Resize the pixmap to fit the label
-                scaled_pixmap = pixmap.scaled(
-                    label_width, label_height,  Qt.KeepAspectRatioByExpanding)
+        ##
+        # This is a method of showing a thermal image on the label, and
+        # saving it if the save options are checked.
+        #
+        # @param self this work thread object
+        # @param pixmap the thermal image
+        #
+        def show_pixmap(self, pixmap):
+            label_width = self.__parent.lb_screen_thermal.width()
+            label_height = self.__parent.lb_screen_thermal.height()
+
+            # Resize the pixmap to fit the label
+            scaled_pixmap = pixmap.scaled(
+                label_width, label_height,  Qt.KeepAspectRatioByExpanding)
 
-                # Set the pixmap on the label
-                self.__parent.lb_screen_thermal.setPixmap(scaled_pixmap)
-                if self.__parent.cb_save_one.isChecked() | self.__parent.cb_save_shot.isChecked():
-                    self.save_thermal_image()
+            # Set the pixmap on the label
+            self.__parent.lb_screen_thermal.setPixmap(scaled_pixmap)
+            if self.__parent.cb_save_one.isChecked() | self.__parent.cb_save_shot.isChecked():
+                self.save_thermal_image()
 
         def save_thermal_image(self):
             pixMap = self.__parent.lb_screen_thermal.pixmap()
@@ -738,29 +717,29 @@ class DepsMainWindow(MW_Base, MW_Ui, QThread):
 
                 # Save the QPixmap
                 pixMap.save(filePath)
+                self.__save_raw_frame(filePath)
                 self.__parent.cb_save_one.setChecked(False)
 
             elif self.__parent.cb_save_shot.isChecked():
                 # Store pixmap for saving in the timed method, ensure it's accessible there
                 pixMap.save(filePath)
+                self.__save_raw_frame(filePath)
 
-                save_interval = self.__parent.update_time
+                save_interval = self.__parent.scheduler.interval('thermal')
                 self.timer.start(save_interval)  # Start or restart the timer
 
             else:
                 print("Checkbox is not checked. Image not saved.")
 
+        ##
+        # This is a method of saving the raw frame beside the thermal image,
+        # so that the saved frames can be replayed as the thermal source.
+        #
+        # @param self this work thread object
+        # @param filePath the path of the thermal image
+        #
+        def __save_raw_frame(self, filePath):
+            thermal = self.__parent.thermal
+            if thermal is not None and thermal.raw is not None:
+                np.save(os.path.splitext(filePath)[0] + '.npy', thermal.raw)
 
-###################################################################
-# Utility functions
-###################################################################
-
-##
-# This is a function to return the new path of the save file.
-#
-# @param prefix the prefix string to be inserted at the first of the new path
-# @param pstfix the postfix string to be inserted at the last of the new path
-# @return the new path
-def new_save_path(prefix: str = DepsMainWindow.PREFIX_SAVE_FILE,
-                  pstfix: str = DepsMainWindow.PSTFIX_SAVE_FILE):
-    return prefix + datetime.now().strftime("%Y%m%d_%H%M%S") + pstfix
@@ -0,0 +1,205 @@
+#############################################################
+# deps_metrics.py
+#
+# Created: 2026. 10. 19
+#
+# Authors:
+#    Youngsun Han (youngsun@pknu.ac.kr)
+#
+# Quantum Computing Laboratory (quantum.pknu.ac.kr)
+#############################################################
+
+import math
+
+from deps_profiler import DEPS_STAGE_BUCKETS
+
+# content type of the prometheus text format
+DEPS_METRICS_CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+
+# metric families, name: (type, help)
+DEPS_METRICS_FAMILIES = {
+    'deps_ingest_received_total': ('counter', 'Lines received from the transport.'),
+    'deps_ingest_parsed_total': ('counter', 'Samples parsed and stored.'),
+    'deps_ingest_invalid_total': ('counter', 'Lines which are not valid sensor data.'),
+    'deps_ingest_out_of_range_total': ('counter', 'Samples out of the valid range.'),
+    'deps_ingest_dropped_total': ('counter', 'Lines dropped by the full ingestion queue.'),
+    'deps_stage_latency_seconds': ('histogram', 'Duration of the pipeline stages.'),
+    'deps_queue_lines': ('gauge', 'Lines in the ingestion queue.'),
+    'deps_queue_capacity_lines': ('gauge', 'Capacity of the ingestion queue.'),
+    'deps_buffer_samples': ('gauge', 'Samples in the signal buffers.'),
+    'deps_buffer_retention_samples': ('gauge', 'Retention limit of the signal buffers, 0 if none.'),
+    'deps_sample_rate_hertz': ('gauge', 'Estimated rate of the received samples.'),
+    'deps_current_amperes': ('gauge', 'Current consumption in the signal buffers.'),
+    'deps_linearity_slope': ('gauge', 'Slope of the latest regression per speed band and scope.'),
+    'deps_linearity_intercept': ('gauge', 'Intercept of the latest regression per speed band and scope.'),
+    'deps_linearity': ('gauge', 'Latest linearity per speed band.'),
+    'deps_linearity_points': ('gauge', 'Linearity points of the latest regression per speed band and scope.'),
+    'deps_save_backlog_samples': ('gauge', 'Samples not written into the save file yet.'),
+    'deps_archive_backlog_segments': ('gauge', 'Closed segments waiting to be compressed.'),
+    'deps_db_backlog_rows': ('gauge', 'Rows waiting to be inserted into the session database.'),
+    'deps_db_dropped_rows_total': ('counter', 'Rows dropped by the full queue or the errors of the session database.'),
+    'process_resident_memory_bytes': ('gauge', 'Resident memory size in bytes.'),
+}
+
+#######################################################################
+# DepsMetrics class
+#######################################################################
+
+class DepsMetrics:
+
+    ##
+    # Constructor of DepsMetrics class. The values are set from the hot
+    # paths by a single dictionary assignment without any lock, and the
+    # collectors are called to read the counters only when the metrics
+    # are scraped. They are formatted in the prometheus text format.
+    #
+    # @param self this object
+    #
+    def __init__(self):
+        # values set by the callers, {(name, labels): value}
+        self.__values = {}
+
+        # functions returning a list of (name, labels, value), called at each scrape
+        self.collectors = []
+
+    ##
+    # This function is used to set the value of a metric.
+    #
+    # @param self this object
+    # @param name the name of the metric
+    # @param value the value
+    # @param labels the labels as a tuple of (key, value), e.g. (('band', '0'),)
+    #
+    def set(self, name: str, value: float, labels: tuple = ()):
+        self.__values[(name, labels)] = value
+
+    ##
+    # This function is used to format all the metrics.
+    #
+    # @param self this object
+    # @return the metrics in the prometheus text format (bytes)
+    #
+    def render(self):
+        samples = [(name, labels, value) for (name, labels), value in list(self.__values.items())]
+        for collector in self.collectors:
+            samples.extend(collector())
+
+        # samples grouped by the family, in the order of the first sample
+        families = {}
+        for name, labels, value in samples:
+            family = metric_family(name)
+            families.setdefault(family, []).append(
+                name + format_labels(labels) + ' ' + format_value(value))
+
+        lines = []
+        for family, family_lines in families.items():
+            if family in DEPS_METRICS_FAMILIES:
+                metric_type, metric_help = DEPS_METRICS_FAMILIES[family]
+                lines.append('# HELP {} {}'.format(family, metric_help))
+                lines.append('# TYPE {} {}'.format(family, metric_type))
+            lines.extend(family_lines)
+
+        return ('\n'.join(lines) + '\n').encode()
+
+###################################################################
+# Utility functions
+###################################################################
+
+##
+# This function returns the family of a metric, e.g. the histogram of a bucket.
+#
+# @param name the name of the metric
+# @return the name of the family
+#
+def metric_family(name: str):
+    for suffix in ('_bucket', '_sum', '_count'):
+        family = name[:-len(suffix)]
+        if name.endswith(suffix) and DEPS_METRICS_FAMILIES.get(family, ('',))[0] == 'histogram':
+            return family
+
+    return name
+
+##
+# This function is used to format the labels of a metric.
+#
+# @param labels the labels as a tuple of (key, value)
+# @return the labels string, e.g. {band="0"}
+#
+def format_labels(labels: tuple):
+    if not labels:
+        return ''
+
+    items = []
+    for key, value in labels:
+        value = str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+        items.append('{}="{}"'.format(key, value))
+
+    return '{' + ','.join(items) + '}'
+
+##
+# This function is used to format the value of a metric.
+#
+# @param value the value
+# @return the value string
+#
+def format_value(value):
+    if isinstance(value, int):
+        return str(value)
+
+    value = float(value)
+    if math.isnan(value):
+        return 'NaN'
+    if math.isinf(value):
+        return '+Inf' if value > 0 else '-Inf'
+
+    return repr(value)
+
+##
+# This function returns the samples of the stage histograms of a profiler.
+#
+# @param profiler the profiler of the pipeline stages
+# @return a list of (name, labels, value)
+#
+def stage_samples(profiler):
+    samples = []
+
+    for stage, stats in profiler.stages.items():
+        buckets = stats.buckets.tolist()
+
+        cumulative = 0
+        for bound, count in zip(DEPS_STAGE_BUCKETS, buckets):
+            cumulative += count
+            samples.append(('deps_stage_latency_seconds_bucket',
+                            (('stage', stage), ('le', format_value(bound / 1e9))), cumulative))
+
+        samples.append(('deps_stage_latency_seconds_bucket',
+                        (('stage', stage), ('le', '+Inf')), cumulative + buckets[-1]))
+        samples.append(('deps_stage_latency_seconds_sum', (('stage', stage),), stats.sum_ns / 1e9))
+        samples.append(('deps_stage_latency_seconds_count', (('stage', stage),),
+                        cumulative + buckets[-1]))
+
+    return samples
+
+##
+# This function returns the samples of the ingestion counters.
+#
+# @param stats the ingestion counters (DepsIngestStats)
+# @return a list of (name, labels, value)
+#
+def ingest_samples(stats):
+    return [('deps_ingest_{}_total'.format(key), (), value)
+            for key, value in stats.as_dict().items()]
+
+##
+# This function returns the samples of this process, e.g. the resident memory.
+#
+# @return a list of (name, labels, value), empty if psutil is not available
+#
+def process_samples():
+    try:
+        # psutil is loaded at the first scrape, not to delay the start-up
+        import psutil
+    except ImportError:
+        return []
+
+    return [('process_resident_memory_bytes', (), psutil.Process().memory_info().rss)]
@@ -0,0 +1,827 @@
+#############################################################
+# deps_monitor_core.py
+#
+# Created: 2026. 10. 19
+#
+# Authors:
+#    Youngsun Han (youngsun@pknu.ac.kr)
+#
+# Quantum Computing Laboratory (quantum.pknu.ac.kr)
+#############################################################
+
+import time
+import numpy as np
+from datetime import datetime
+
+from deps_error import DepsError
+from deps_comm_conn import DepsCommConn
+from deps_comm_file import DepsCommFile
+from deps_config_parser import read_config_file
+from deps_data_processor import DepsDataProcessor, calibrate_linear_regression
+from deps_filter_chain import DEPS_FILTER_DEFAULT
+from deps_profiler import profiler
+from deps_ingest_queue import DepsIngestQueue, DepsIngestStats, DepsLineBatch
+from deps_rate_monitor import DepsRateMonitor
+from deps_save_file import DepsSaveFile
+from deps_session_archive import DepsSessionArchive, read_session_runs
+from deps_session_db import DepsSessionDb
+from deps_telemetry_server import DepsTelemetryServer, decimate_channels
+from deps_metrics import DepsMetrics, DEPS_METRICS_CONTENT_TYPE, ingest_samples, stage_samples, process_samples
+from deps_snapshot import save_snapshot, load_snapshot, source_identity
+from deps_history import DepsTieredHistory
+from deps_linearity_store import DepsLinearityStore
+from deps_linearity_scope import parse_scope_spec, DEPS_SCOPE_DEFAULT
+from deps_robust_fit import parse_robust_spec, DEPS_ROBUST_DEFAULT
+
+#######################################################################
+# DepsMonitorCore class
+#######################################################################
+
+class DepsMonitorCore:
+    CONFIG_PATH: str = '../deps_standalone/src/config.ini'
+    CONFIG_FILE_NAME: str = 'config.ini'
+    PREFIX_SAVE_FILE: str = '../deps_standalone/dat/save_'
+    PSTFIX_SAVE_FILE: str = '.txt'
+    PSTFIX_ARCHIVE_FILE: str = '.json'
+    DATA_FILE_DIR: str = '../deps_standalone/dat/dpeco_current'
+    # the maximum number of queued items handled at once
+    MAX_DRAIN_COUNT: int = 1000
+
+    ##
+    # Constructor of DepsMonitorCore class. This is the monitoring pipeline
+    # without any gui: the configuration, the transport, the processing,
+    # the save files, the session database and the telemetry. It is driven
+    # by a client, i.e., the main window or the headless daemon, which calls
+    # receive() when the data is ready and refresh() periodically.
+    #
+    # @param self this object
+    # @param config_path the path of the configuration file
+    # @param log a function to print out a log message
+    #
+    def __init__(self, config_path: str = CONFIG_PATH, log=print):
+        self.log = log
+
+        #####################################################################
+        # read config file
+        self.__config = read_config_file(config_path)
+        self.config = self.__config['DEFAULT']
+
+        # pipeline timing instrumentation
+        profiler.enabled = self.config.get('profile', '1') != '0'
+
+        #####################################################################
+        # threshold value
+        thv = int(self.config['threshold'])
+
+        # ingestion counters shared by the queue and the data processor
+        self.ingest_stats = DepsIngestStats()
+
+        # filter chains of the channels (spd, ang, trq, cur), e.g. "median:5|iir:2:0.1"
+        flt_spec: str = self.config.get('filter', DEPS_FILTER_DEFAULT)
+        filters = [self.config.get('filter' + ch, flt_spec) for ch in ('spd', 'ang', 'trq', 'cur')]
+
+        # signals stored as scaled 16-bit integers to keep longer retention windows
+        compact = self.config.get('compact', '0') != '0'
+
+        # eps data processor
+        try:
+            self.processor = DepsDataProcessor(thv, self.ingest_stats, filters, compact)
+        except ValueError as e:
+            self.log('Invalid filter: ' + str(e))
+            self.processor = DepsDataProcessor(thv, self.ingest_stats, compact=compact)
+
+        # torque baseline from the quiescent signals, |angle| <= baselineangle
+        self.processor.set_baseline(float(self.config.get('baselinealpha', '0.01')),
+                                    float(self.config.get('baselineangle', '20')))
+
+        # bounded queue between the transport and the data processor
+        self.ingest_queue = DepsIngestQueue(
+            int(self.config.get('queuesize', '4096')),
+            self.config.get('queuepolicy', 'drop-oldest'),
+            self.ingest_stats)
+
+        # sample rate, jitter and gaps of the received data
+        self.rate_monitor = DepsRateMonitor(float(self.config.get('gapthreshold', '1000')))
+
+        # telemetry server for the remote view, e.g. 127.0.0.1:8080
+        self.telemetry = None
+        telemetry_addr: str = self.config.get('telemetry', 'None')
+        if telemetry_addr != 'None':
+            host, _, port = telemetry_addr.rpartition(':')
+            self.telemetry = DepsTelemetryServer(host or '127.0.0.1', int(port))
+
+            err = self.telemetry.start()
+            if err is not None:
+                self.log('Telemetry server is not started: ' + err)
+                self.telemetry = None
+
+        # metrics in the prometheus text format at /metrics, e.g. 127.0.0.1:9108,
+        # served by the telemetry server if it is at the same address
+        self.metrics = None
+        self.metrics_server = None
+        metrics_addr: str = self.config.get('metrics', 'None')
+        if metrics_addr != 'None':
+            self.metrics = DepsMetrics()
+            self.metrics.collectors = [
+                lambda: ingest_samples(self.ingest_stats),
+                lambda: stage_samples(profiler),
+                self.metrics_samples,
+                process_samples,
+            ]
+
+            if self.telemetry is not None and metrics_addr == telemetry_addr:
+                server = self.telemetry
+            else:
+                host, _, port = metrics_addr.rpartition(':')
+                server = self.metrics_server = DepsTelemetryServer(host or '127.0.0.1', int(port))
+
+                err = server.start()
+                if err is not None:
+                    self.log('Metrics server is not started: ' + err)
+                    self.metrics_server = None
+
+            server.routes['/metrics'] = lambda: (DEPS_METRICS_CONTENT_TYPE, self.metrics.render())
+
+        # short-term regression scope of the speed levels beside the session,
+        # e.g. "points:200", "minutes:10", "ewma:100" or "None"
+        scope_spec: str = self.config.get('fitscope', DEPS_SCOPE_DEFAULT)
+        try:
+            self.scopes = [parse_scope_spec(scope_spec) for _ in range(3)]
+        except ValueError as e:
+            self.log('Invalid fit scope: ' + str(e))
+            self.scopes = [None] * 3
+
+        # robust fit of the lps points kept, e.g. "theilsen:2048" or "None"
+        try:
+            self.robust_fit = parse_robust_spec(self.config.get('robustfit', DEPS_ROBUST_DEFAULT))
+        except ValueError as e:
+            self.log('Invalid robust fit: ' + str(e))
+            self.robust_fit = None
+
+        # the number of the latest committed lps points kept per speed level
+        max_points = int(self.config.get('lpsmaxpoints', '4096'))
+        if max_points > 0 and self.scopes[0] is not None:
+            max_points = max(max_points, self.scopes[0].keep)
+
+        # stores of lps points, and the latest regression results of the speed levels
+        self.lps_store = [DepsLinearityStore(max_points=max_points) for _ in range(3)]
+        self.fits = [None] * 3
+
+        # generations of the lps stores and the signals which have been handled
+        self.__fitted_generation = [0] * 3
+        self.__evaluated_generation = -1
+        self.__published_generation = -1
+
+        # current consumption of the signals of the generation
+        self.__current = None
+        self.__current_generation = -1
+
+        #####################################################################
+        # restore the saved sensor data, from the snapshot if it is taken
+        # from the same saved file, or by replaying the saved file
+        fname: str = self.config['saved']
+        self.__snapshot_path: str = self.config.get('snapshot', 'None')
+        self.__snapshot_source = source_identity(fname) if fname != 'None' else None
+
+        snapshot = self.__load_snapshot_file()
+        if snapshot is not None:
+            self.processor.restore_state(snapshot)
+            self.restore_linearity_state(snapshot)
+        elif fname != 'None':
+            self.__load_rawdat_file(fname)
+
+        # the counters are only for the received data
+        self.ingest_stats.reset()
+
+        # open a new save file, in the rle mode for the runs of identical samples
+        self.__save_mode: str = self.config.get('savemode', 'plain')
+        self.save_fp = self.__open_save_file()
+        self.save_fp.write_header(self.save_header_fields())
+        self.config['saved'] = self.save_fp.name
+
+        # session database, a session per save file
+        self.session_db = None
+        db_path: str = self.config.get('database', 'None')
+        if db_path != 'None':
+            self.session_db = DepsSessionDb(db_path, self.log)
+            self.session_db.begin_session(self.save_fp.name)
+
+        # update the config file ('config.ini')
+        if fname == 'None':
+            self.write_config_file()
+
+        #####################################################################
+        # refresh rate for signal buffers
+        self.refresh_rate: int = int(self.config['refreshrate'])
+
+        # retention policy of the signal buffers, by the number of signals
+        # (refresh rate by default) and/or the duration in seconds
+        self.processor.set_retention(
+            int(self.config.get('retentioncount', str(self.refresh_rate))),
+            float(self.config.get('retentiontime', '0')))
+
+        # downsampled history of the whole test, optionally spilled to disk
+        spill_dir: str = self.config.get('historyspill', 'None')
+        self.processor.set_history(DepsTieredHistory(
+            capacity=int(self.config.get('historysize', '8192')),
+            spill_dir=spill_dir if spill_dir != 'None' else None))
+
+        # uart connection or file replay, opened by open_transport()
+        self.__conn = None
+
+    ##
+    # This function is used to open the transport: the uart connection, or the
+    # replay of the data file if no uart port is configured. The received data
+    # is put into the ingestion queue.
+    #
+    # @param self this object
+    # @param ready_callback a function called by the transport thread when
+    #        the data is put into the empty queue
+    # @return error information
+    #
+    def open_transport(self, ready_callback=None):
+        port: str = self.config.get('port', 'None')
+
+        if port != 'None':
+            self.__conn = DepsCommConn(self.ingest_queue)
+
+            # baudrate
+            baudrate = int(self.config['baudrate'])
+
+            err = self.__conn.open(baudrate, port)
+        else:
+            self.__conn = DepsCommFile(self.ingest_queue)
+
+            # filename
+            err = self.__conn.open(f'{self.DATA_FILE_DIR}/dpeco_data_current_measure_added_240305.txt')
+
+        if err != DepsError.SUCCESS:
+            self.log("EPS connection is not opened: " + err.name)
+            self.__conn = None
+            return err
+
+        # notification of the received data
+        self.__conn.ready_callback = ready_callback
+
+        # start to receive the eps data
+        self.__conn.start_eps_recv_thread()
+        return err
+
+    ##
+    # This function is used to pause receiving the eps data.
+    #
+    # @param self this object
+    #
+    def pause(self):
+        if self.__conn is not None:
+            self.__conn.stop_eps_recv_thread()
+
+    ##
+    # This function is used to resume receiving the eps data.
+    #
+    # @param self this object
+    #
+    def resume(self):
+        if self.__conn is not None:
+            self.__conn.start_eps_recv_thread()
+
+    ##
+    # This function is used to close the pipeline: the snapshot, the save file,
+    # the session database, the servers and the transport. It can be called
+    # more than once.
+    #
+    # @param self this object
+    #
+    def close(self):
+        # keep the processing state for the next start-up (only once)
+        self.write_snapshot_file()
+        self.__snapshot_source = None
+
+        # close the save file
+        if self.save_fp is not None:
+            self.save_fp.close(self.save_header_fields())
+
+            # delete the save file if it has no data
+            fname = self.save_fp.name
+            if self.save_fp.num_samples() == 0:
+                self.log("Delete the empty save file: " + fname)
+                self.save_fp.remove()
+
+            self.save_fp = None
+
+        # the linearity points of the remaining signals are stored with the session
+        if self.session_db is not None:
+            lps_list = self.processor.process(0, self.processor.num_sensor_signal())
+            if lps_list is not None:
+                for i, lps in enumerate(lps_list):
+                    self.session_db.add_linearity(i, lps)
+
+            self.session_db.close()
+            self.session_db = None
+
+        if self.telemetry is not None:
+            self.telemetry.close()
+            self.telemetry = None
+
+        if self.metrics_server is not None:
+            self.metrics_server.close()
+            self.metrics_server = None
+
+        # release the transport if it is blocked by the full queue
+        self.ingest_queue.close()
+
+        # close the uart connection
+        if self.__conn is not None:
+            self.__conn.close()
+            self.__conn = None
+
+    ###################################################################
+    # Save files
+    ###################################################################
+
+    ##
+    # This is a function to open a new save file. If the archive is enabled,
+    # a session archive rotating and compressing the save files is opened.
+    #
+    # @param self this object
+    # @return a save file, DepsSaveFile or DepsSessionArchive
+    #
+    def __open_save_file(self):
+        if self.config.get('archive', '0') == '0':
+            return DepsSaveFile(self.new_save_path(), self.__save_mode)
+
+        return DepsSessionArchive(
+            self.new_save_path(pstfix=DepsMonitorCore.PSTFIX_ARCHIVE_FILE), self.__save_mode,
+            self.config.get('archivecodec', 'gzip'),
+            int(self.config.get('archivesize', '0')),
+            float(self.config.get('archivetime', '0')),
+            self.save_header_fields, self.log)
+
+    ##
+    # This is a function to close the current save file and to open a new one.
+    # The config file is updated with the closed save file.
+    #
+    # @param self this object
+    #
+    def rotate_save_file(self):
+        # close the current save file
+        if self.save_fp is not None:
+            self.save_fp.close(self.save_header_fields())
+
+        # update the config file ('config.ini')
+        self.write_config_file()
+
+        # open a new save file
+        self.save_fp = self.__open_save_file()
+        self.save_fp.write_header(self.save_header_fields())
+        self.config['saved'] = self.save_fp.name
+
+        if self.session_db is not None:
+            self.session_db.begin_session(self.save_fp.name)
+
+    ##
+    # This is a function to write the config file ('config.ini').
+    #
+    # @param self this object
+    #
+    def write_config_file(self):
+        with open(DepsMonitorCore.CONFIG_FILE_NAME, 'w') as configfile:
+            self.__config.write(configfile)
+
+    ##
+    # This is a function to restore the data signals from the saved file.
+    #
+    # @param self this object
+    # @param filename the name of the saved file to be stored
+    # @return if restoring is completed well or not
+    #
+    def __load_rawdat_file(self, filename: str) -> bool:
+        # restore the data from the previously saved data file
+        last_ns = 0
+        try:
+            for sig_str, tim_ns, count, span_ns, dev_span in read_session_runs(filename):
+                # transfer the input signals into the data processor, a run at once
+                self.processor.enqueue_sensor_run(sig_str, count, tim_ns, span_ns, dev_span)
+                last_ns = tim_ns + span_ns if tim_ns else 0
+        except FileNotFoundError as e:
+            self.log('No file: ' + filename + str(e))
+            return False
+
+        # the timestamps of the previous run are moved up to now
+        if last_ns:
+            self.processor.shift_time(time.monotonic_ns() - last_ns)
+
+        return True
+
+    ##
+    # This function returns the metadata to be written into the header of the save file.
+    #
+    # @param self this object
+    # @return a dictionary of the metadata
+    #
+    def save_header_fields(self):
+        fields = self.ingest_stats.as_dict()
+        fields['queue'] = '{}/{}'.format(self.ingest_queue.capacity, self.ingest_queue.policy)
+        fields.update(self.rate_monitor.as_dict())
+        return fields
+
+    ###################################################################
+    # Snapshots
+    ###################################################################
+
+    ##
+    # This is a function to read the snapshot file of the processing state.
+    #
+    # @param self this object
+    # @return the snapshot state, None if there is no snapshot for the saved file
+    #
+    def __load_snapshot_file(self):
+        if self.__snapshot_path == 'None' or self.__snapshot_source is None:
+            return None
+
+        state = load_snapshot(self.__snapshot_path, self.log)
+        if state is None:
+            return None
+
+        # the snapshot has to be taken from the same saved file
+        source = (str(state['source']), int(state['source_size']), int(state['source_mtime']))
+        if source != self.__snapshot_source:
+            self.log('Snapshot is outdated: ' + self.__snapshot_path)
+            return None
+
+        return state
+
+    ##
+    # This is a function to write the snapshot file of the processing state.
+    #
+    # @param self this object
+    #
+    def write_snapshot_file(self):
+        if self.__snapshot_path == 'None' or self.__snapshot_source is None:
+            return
+
+        state = self.processor.snapshot_state()
+        state.update(self.linearity_state())
+
+        state['source'] = self.__snapshot_source[0]
+        state['source_size'] = self.__snapshot_source[1]
+        state['source_mtime'] = self.__snapshot_source[2]
+
+        try:
+            save_snapshot(self.__snapshot_path, state)
+        except OSError as e:
+            self.log('Snapshot is not written: ' + str(e))
+
+    ##
+    # This function returns the linearity points to be stored in a snapshot.
+    #
+    # @param self this object
+    # @return a dictionary of numpy arrays (lps_x_[level], lps_y_[level], lps_sums_[level])
+    #
+    def linearity_state(self):
+        state = {}
+        for i, store in enumerate(self.lps_store):
+            x, y, sums = store.committed()
+            state['lps_x_{}'.format(i)] = x
+            state['lps_y_{}'.format(i)] = y
+            state['lps_sums_{}'.format(i)] = sums
+        return state
+
+    ##
+    # This function is used to restore the linearity points from a snapshot.
+    #
+    # @param self this object
+    # @param state a dictionary of numpy arrays from linearity_state()
+    #
+    def restore_linearity_state(self, state: dict):
+        for i, store in enumerate(self.lps_store):
+            x = state.get('lps_x_{}'.format(i))
+            y = state.get('lps_y_{}'.format(i))
+            if x is not None and y is not None:
+                store.restore(np.column_stack((x, y)), state.get('lps_sums_{}'.format(i)))
+
+    ###################################################################
+    # EPS sensor data
+    ###################################################################
+
+    ##
+    # This function is used to handle the eps data queued by the transport.
+    #
+    # @param self this object
+    # @return true if there are more queued items to be handled
+    #
+    def receive(self):
+        self.handle_batch(self.ingest_queue.drain(DepsMonitorCore.MAX_DRAIN_COUNT))
+        return len(self.ingest_queue) > 0
+
+    ##
+    # This is a function for handling the received eps data.
+    #
+    # @param self this object
+    # @param batch the received lines with their arrival times at the transport
+    #
+    def handle_batch(self, batch: DepsLineBatch):
+        for arrival_ns in batch.arrivals[:len(batch)]:
+            profiler.record_since('deliver', arrival_ns)
+            self.rate_monitor.update(arrival_ns)
+
+        datbuf = self.processor.enqueue_sensor_batch(batch)
+
+        num = len(datbuf)
+        if num > 0:
+            tim_buf = self.processor.tim_data_buf[-num:]
+            dev_buf = self.processor.dev_data_buf[-num:]
+
+            start_ns = time.monotonic_ns()
+            for (spd, ang, trq, cur), tim_ns, dev_ts in zip(datbuf.tolist(), tim_buf, dev_buf):
+                self.save_fp.write_sample(spd, ang, trq, cur, tim_ns, dev_ts)
+
+                if self.session_db is not None:
+                    self.session_db.add_sample(spd, ang, trq, cur, tim_ns, dev_ts)
+
+            # the stage time is recorded per signal
+            profiler.record('save', (time.monotonic_ns() - start_ns) // num)
+
+    ###################################################################
+    # Evaluation
+    ###################################################################
+
+    ##
+    # This function is used to refresh the history, the linearity and the
+    # telemetry at once, e.g. periodically by the headless daemon.
+    #
+    # @param self this object
+    # @return the regression results from evaluate()
+    #
+    def refresh(self):
+        self.processor.update_history()
+        results = self.evaluate()
+        self.publish()
+        return results
+
+    ##
+    # This is a function to evaluate the linearity of the stored signals. The
+    # linearity points of the signals in the buffers replace the tails of the
+    # stores, the regression is updated for the speed levels whose points have
+    # changed, and the oldest signals exceeding the retention policy are evicted
+    # with their points committed into the stores. Nothing is computed again
+    # if the signals and the points are of the same generations as before.
+    #
+    # The regression of the session is shown as the linearity, and the one in
+    # the short-term scope beside it to follow a drift of the system. The
+    # robust fit of the points kept is not skewed by a few outlier points.
+    #
+    # @param self this object
+    # @return a list of the regression results per speed level, each of which is
+    #         None if not changed, or a dictionary of the store, the number of
+    #         points, slope, intercept, linearity, and the results of the scope
+    #         and the robust fit (a dictionary of the scope, the number of points,
+    #         slope and intercept, or None). None if there are no linearity points
+    #
+    def evaluate(self):
+        proc = self.processor
+
+        if proc.generation != self.__evaluated_generation:
+            self.__evaluated_generation = proc.generation
+
+            # get the number of stored signals
+            num_sig = proc.num_sensor_signal()
+
+            # linearity calculation
+            lps_list = proc.process(0, num_sig)
+
+            if lps_list is None:
+                self.log('There are no linearity points to be plot.')
+                return None
+
+            # speed levels (0~10, 10~30, 30~60 km/h)
+            for store, lps in zip(self.lps_store, lps_list):
+                store.set_tail(lps)
+
+        results = [None] * len(self.lps_store)
+        for i, store in enumerate(self.lps_store):
+            # the points have not changed since the last regression
+            if store.generation == self.__fitted_generation[i] or len(store) == 0:
+                continue
+
+            self.__fitted_generation[i] = store.generation
+
+            start_ns = time.monotonic_ns()
+
+            # linear regression (slope, intercept) of the session
+            num = store.first + len(store)
+            b1, b0 = store.regression()
+
+            # the linearity label
+            linearity, _ = calibrate_linear_regression(b1, b0)
+
+            # linear regression in the short-term scope
+            scope = None
+            if self.scopes[i] is not None:
+                scope_fit = self.scopes[i].fit(store, start_ns)
+                if scope_fit is not None:
+                    scope = {'scope': self.scopes[i].spec, 'points': scope_fit[0],
+                             'slope': float(scope_fit[1]), 'intercept': float(scope_fit[2])}
+
+            profiler.record_since('regress', start_ns)
+
+            # robust fit within the compute budget
+            robust = None
+            if self.robust_fit is not None:
+                start_ns = time.monotonic_ns()
+                robust_fit = self.robust_fit.fit(store.x, store.y)
+                if robust_fit is not None:
+                    robust = {'scope': self.robust_fit.spec, 'points': robust_fit[0],
+                              'slope': robust_fit[1], 'intercept': robust_fit[2]}
+
+                profiler.record_since('robust', start_ns)
+
+            results[i] = {'store': store, 'points': num, 'slope': b1, 'intercept': b0,
+                          'linearity': linearity, 'scope': scope, 'robust': robust}
+
+            if self.session_db is not None:
+                self.session_db.add_regression(i, num, b1, b0, linearity)
+
+            self.fits[i] = {'points': num, 'slope': float(b1), 'intercept': float(b0),
+                            'linearity': float(linearity), 'scope': scope, 'robust': robust}
+
+            if self.metrics is not None:
+                band = str(i)
+                self.metrics.set('deps_linearity', float(linearity), (('band', band),))
+
+                for fit in (dict(self.fits[i], scope='session'), scope, robust):
+                    if fit is None:
+                        continue
+
+                    labels = (('band', band), ('scope', fit['scope']))
+                    for key in ('slope', 'intercept', 'points'):
+                        self.metrics.set('deps_linearity_' + key, fit[key], labels)
+
+        if self.telemetry is not None and any(result is not None for result in results):
+            self.telemetry.publish('linearity', self.fits)
+
+        # evict the oldest sensor data exceeding the retention policy, and
+        # commit the linearity points completed in them into the stores
+        evicted_list = proc.evict_sensor_signal()
+        if evicted_list is not None:
+            for i in range(len(evicted_list)):
+                self.lps_store[i].append(evicted_list[i])
+
+                if self.session_db is not None:
+                    self.session_db.add_linearity(i, evicted_list[i])
+
+        return results
+
+    ##
+    # This function returns the current consumption of the stored signals,
+    # which is also stored with the session if it has changed.
+    #
+    # @param self this object
+    # @return (min, max, mean)
+    #
+    def current_consumption(self):
+        changed = self.__current_generation != self.processor.generation
+        cur_min, cur_max, cur_mean = self.__current_stats()
+
+        if changed and self.session_db is not None:
+            self.session_db.add_current(cur_min, cur_max, cur_mean)
+
+        return cur_min, cur_max, cur_mean
+
+    ##
+    # This function returns the current consumption, which is calculated
+    # again only if the signals have changed.
+    #
+    # @param self this object
+    # @return (min, max, mean)
+    #
+    def __current_stats(self):
+        if self.__current_generation != self.processor.generation:
+            self.__current_generation = self.processor.generation
+            self.__current = self.processor.calculate_currrent_consumption()
+
+        return self.__current
+
+    ###################################################################
+    # Status
+    ###################################################################
+
+    ##
+    # This function is used to publish the statistics and the decimated
+    # channels to the telemetry server, and the current to the metrics.
+    # The channels and the current are published only if they have changed.
+    #
+    # @param self this object
+    #
+    def publish(self):
+        proc = self.processor
+        changed = self.__published_generation != proc.generation
+        self.__published_generation = proc.generation
+
+        if self.telemetry is not None:
+            stats = self.ingest_stats.as_dict()
+            stats['queue'] = len(self.ingest_queue)
+            stats['samples'] = proc.num_sensor_signal()
+            stats.update(self.rate_monitor.as_dict())
+
+            if proc.num_sensor_signal() > 0:
+                stats['current'] = [float(val) for val in self.__current_stats()]
+
+            self.telemetry.publish('stats', stats)
+
+            if changed:
+                spd, ang, trq, cur = decimate_channels(proc.refined_sensor_signal())
+                self.telemetry.publish('channels', {'spd': spd, 'ang': ang, 'trq': trq, 'cur': cur})
+
+        if self.metrics is not None and changed and proc.num_sensor_signal() > 0:
+            cur_min, cur_max, cur_mean = self.__current_stats()
+            self.metrics.set('deps_current_amperes', float(cur_min), (('stat', 'min'),))
+            self.metrics.set('deps_current_amperes', float(cur_max), (('stat', 'max'),))
+            self.metrics.set('deps_current_amperes', float(cur_mean), (('stat', 'mean'),))
+
+    ##
+    # This function returns the metrics read at each scrape, i.e., the fill
+    # levels of the queue and the buffers, and the backlogs of the writers.
+    # It is called by the metrics server, so the values are only read.
+    #
+    # @param self this object
+    # @return a list of (name, labels, value)
+    #
+    def metrics_samples(self):
+        samples = [
+            ('deps_queue_lines', (), len(self.ingest_queue)),
+            ('deps_queue_capacity_lines', (), self.ingest_queue.capacity),
+            ('deps_buffer_samples', (), self.processor.num_sensor_signal()),
+            ('deps_buffer_retention_samples', (), self.processor.retention_count),
+            ('deps_sample_rate_hertz', (), self.rate_monitor.rate()),
+        ]
+
+        save_fp = self.save_fp
+        if save_fp is not None:
+            samples.append(('deps_save_backlog_samples', (), save_fp.backlog()))
+            if isinstance(save_fp, DepsSessionArchive):
+                samples.append(('deps_archive_backlog_segments', (), save_fp.compress_backlog()))
+
+        session_db = self.session_db
+        if session_db is not None:
+            samples.append(('deps_db_backlog_rows', (), session_db.backlog()))
+            samples.append(('deps_db_dropped_rows_total', (), session_db.dropped))
+
+        return samples
+
+    ##
+    # This function returns the sample rate of the received data with the duration
+    # of the signal buffers at that rate, e.g. to be shown on the status bar.
+    #
+    # @param self this object
+    # @return a string of the rate estimates
+    #
+    def rate_status(self):
+        status = str(self.rate_monitor)
+
+        rate = self.rate_monitor.rate()
+        if rate > 0 and self.processor.retention_count > 0:
+            status += ' win:{:.0f}s'.format(self.processor.retention_count / rate)
+
+        if self.rate_monitor.stalled(time.monotonic_ns()):
+            status += ' STALLED'
+
+        return status
+
+    ##
+    # This function returns the status of the pipeline in a line.
+    #
+    # @param self this object
+    # @return a string of the ingestion counters, the queue and the rate
+    #
+    def status_message(self):
+        return '{} queue:{}/{} {}'.format(self.ingest_stats, len(self.ingest_queue),
+                                          self.ingest_queue.capacity, self.rate_status())
+
+    ##
+    # This function returns the status of the pipeline in lines, e.g. for the
+    # diagnostics panel and the diagnostics dump.
+    #
+    # @param self this object
+    # @return a list of strings
+    #
+    def status_lines(self):
+        return [
+            str(self.ingest_stats),
+            'queue: {}/{} ({})'.format(len(self.ingest_queue),
+                                       self.ingest_queue.capacity,
+                                       self.ingest_queue.policy),
+            self.rate_status(),
+            'interval(ms) p50/p95/p99: {interval} max gap: {maxgap} ms'.format(
+                **self.rate_monitor.as_dict())]
+
+    ##
+    # This is a function to return the new path of the save file.
+    #
+    # @param prefix the prefix string to be inserted at the first of the new path
+    # @param pstfix the postfix string to be inserted at the last of the new path
+    # @return the new path
+    #
+    @staticmethod
+    def new_save_path(prefix: str = PREFIX_SAVE_FILE, pstfix: str = PSTFIX_SAVE_FILE):
+        return prefix + datetime.now().strftime("%Y%m%d_%H%M%S") + pstfix
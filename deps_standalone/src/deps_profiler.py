@@ -0,0 +1,190 @@
+#############################################################
+# deps_profiler.py
+#
+# Created: 2026. 10. 19
+#
+# Authors:
+#    Youngsun Han (youngsun@pknu.ac.kr)
+#
+# Quantum Computing Laboratory (quantum.pknu.ac.kr)
+#############################################################
+
+import os
+import time
+import bisect
+from array import array
+from datetime import datetime
+
+# pipeline stages, in the order of the data flow
+#  deliver: arrival at the transport ~ handled by the gui thread
+#  e2e    : arrival of the newest sample ~ linearity label updated
+DEPS_STAGES = (
+    'deliver',
+    'parse',
+    'validate',
+    'save',
+    'filter',
+    'segment',
+    'regress',
+    'robust',
+    'render',
+    'e2e',
+)
+
+# the number of recent durations kept for each stage (power of 2)
+DEPS_STAGE_WINDOW = 1024
+
+# upper bounds of the histogram buckets of the durations since the start (nsec)
+DEPS_STAGE_BUCKETS = (
+    10_000, 50_000, 100_000, 500_000,
+    1_000_000, 5_000_000, 10_000_000, 50_000_000,
+    100_000_000, 500_000_000, 1_000_000_000, 5_000_000_000,
+)
+
+#######################################################################
+# DepsStageStats class
+#######################################################################
+
+class DepsStageStats:
+
+    ##
+    # Constructor of DepsStageStats class. The durations are kept in
+    # a fixed ring buffer, so recording costs O(1) and never allocates.
+    #
+    # @param self this object
+    # @param window the number of recent durations (power of 2)
+    #
+    def __init__(self, window: int = DEPS_STAGE_WINDOW):
+        self.__buf = array('q', bytes(8 * window))
+        self.__mask = window - 1
+        self.__pos = 0
+
+        # total number of records and the maximum since the start
+        self.count = 0
+        self.max_ns = 0
+
+        # histogram of all the durations, the last bucket is for the larger ones
+        self.buckets = array('q', bytes(8 * (len(DEPS_STAGE_BUCKETS) + 1)))
+        self.sum_ns = 0
+
+    ##
+    # This function is used to record a duration.
+    #
+    # @param self this object
+    # @param ns duration in nanoseconds
+    #
+    def record(self, ns: int):
+        self.__buf[self.__pos] = ns
+        self.__pos = (self.__pos + 1) & self.__mask
+        self.count += 1
+        if ns > self.max_ns:
+            self.max_ns = ns
+
+        self.buckets[bisect.bisect_left(DEPS_STAGE_BUCKETS, ns)] += 1
+        self.sum_ns += ns
+
+    ##
+    # This function returns the percentiles of the recent durations.
+    #
+    # @param self this object
+    # @return (p50, p95, p99) in nanoseconds, None if nothing is recorded
+    #
+    def percentiles(self):
+        num = min(self.count, self.__mask + 1)
+        if num == 0:
+            return None
+
+        dat = sorted(self.__buf[:num])
+        return (dat[(num - 1) * 50 // 100],
+                dat[(num - 1) * 95 // 100],
+                dat[(num - 1) * 99 // 100])
+
+#######################################################################
+# DepsProfiler class
+#######################################################################
+
+class DepsProfiler:
+
+    ##
+    # Constructor of DepsProfiler class
+    #
+    # @param self this object
+    # @param enabled if false, all the records are ignored
+    #
+    def __init__(self, enabled: bool = True):
+        self.enabled = enabled
+        self.stages = {}
+        for stage in DEPS_STAGES:
+            self.stages[stage] = DepsStageStats()
+
+    ##
+    # This function is used to record the duration of a stage.
+    #
+    # @param self this object
+    # @param stage the name of the stage
+    # @param ns duration in nanoseconds
+    #
+    def record(self, stage: str, ns: int):
+        if self.enabled:
+            self.stages[stage].record(ns)
+
+    ##
+    # This function is used to record the duration since the given start time.
+    #
+    # @param self this object
+    # @param stage the name of the stage
+    # @param start_ns start time from time.monotonic_ns()
+    # @return the current time, to be used as the start time of the next stage
+    #
+    def record_since(self, stage: str, start_ns: int):
+        now_ns = time.monotonic_ns()
+        if self.enabled:
+            self.stages[stage].record(now_ns - start_ns)
+        return now_ns
+
+    ##
+    # This function returns the summary of all the stages as text lines.
+    #
+    # @param self this object
+    # @return a list of text lines
+    #
+    def summary(self):
+        lines = ['{:<9}{:>9}{:>10}{:>10}{:>10}{:>10}'.format(
+            'stage', 'count', 'p50(us)', 'p95(us)', 'p99(us)', 'max(us)')]
+
+        for stage, stats in self.stages.items():
+            pct = stats.percentiles()
+            if pct is None:
+                lines.append('{:<9}{:>9}'.format(stage, 0))
+                continue
+
+            lines.append('{:<9}{:>9}{:>10.1f}{:>10.1f}{:>10.1f}{:>10.1f}'.format(
+                stage, stats.count, pct[0] / 1000, pct[1] / 1000, pct[2] / 1000,
+                stats.max_ns / 1000))
+
+        return lines
+
+    ##
+    # This function is used to dump out the summary into the given file.
+    # The file is replaced at once so that a reader never sees a partial dump.
+    # The errors of the file are only logged, as it is called periodically.
+    #
+    # @param self this object
+    # @param path dump file path
+    # @param extra additional text lines to be appended
+    # @param log the function to print a message
+    #
+    def dump(self, path: str, extra: list = None, log=print):
+        tmp_path = path + '.tmp'
+        try:
+            with open(tmp_path, 'w') as fd:
+                fd.write('# ' + datetime.now().strftime("%Y-%m-%d %H:%M:%S") + '\n')
+                for line in self.summary() + (extra or []):
+                    fd.write(line + '\n')
+            os.replace(tmp_path, path)
+        except OSError as e:
+            log('Diagnostics are not written: ' + str(e))
+
+
+# the profiler shared by the transports, the data processor and the gui
+profiler = DepsProfiler()
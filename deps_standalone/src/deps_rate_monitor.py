@@ -0,0 +1,147 @@
+#############################################################
+# deps_rate_monitor.py
+#
+# Created: 2026. 10. 19
+#
+# Authors:
+#    Youngsun Han (youngsun@pknu.ac.kr)
+#
+# Quantum Computing Laboratory (quantum.pknu.ac.kr)
+#############################################################
+
+from array import array
+
+from deps_profiler import DepsStageStats, DEPS_STAGE_WINDOW
+
+# an inter-arrival time longer than this is counted as a gap (msec)
+DEPS_GAP_THRESHOLD = 1000
+
+#######################################################################
+# DepsRateMonitor class
+#######################################################################
+
+class DepsRateMonitor:
+
+    ##
+    # Constructor of DepsRateMonitor class. It estimates the sample rate,
+    # the inter-arrival jitter and the gaps of the ingested samples from
+    # their arrival times. Each sample costs O(1) and never allocates.
+    #
+    # @param self this object
+    # @param gap_ms an inter-arrival time longer than this is a gap (msec)
+    # @param window the number of recent samples for the rate (power of 2)
+    #
+    def __init__(self, gap_ms: float = DEPS_GAP_THRESHOLD, window: int = DEPS_STAGE_WINDOW):
+        self.gap_ns = int(gap_ms * 1e6)
+
+        # arrival times of the recent samples
+        self.__times = array('q', bytes(8 * window))
+        self.__mask = window - 1
+
+        self.reset()
+
+    ##
+    # This function is used to reset all the estimates.
+    #
+    # @param self this object
+    #
+    def reset(self):
+        self.count = 0
+        self.last_ns = 0
+        self.__last_interval = 0
+
+        # recent inter-arrival times for the percentiles
+        self.__intervals = DepsStageStats(self.__mask + 1)
+
+        # smoothed inter-arrival jitter in nanoseconds (RFC 3550)
+        self.jitter_ns = 0.0
+
+        # the number of gaps, the longest one and the end of the last one
+        self.gaps = 0
+        self.max_gap_ns = 0
+        self.last_gap_ns = 0
+
+    ##
+    # This function is used to update the estimates with a new sample.
+    #
+    # @param self this object
+    # @param arrival_ns arrival time of the sample (time.monotonic_ns())
+    #
+    def update(self, arrival_ns: int):
+        if self.count > 0:
+            interval = arrival_ns - self.last_ns
+            self.__intervals.record(interval)
+
+            if interval > self.gap_ns:
+                self.gaps += 1
+                self.last_gap_ns = arrival_ns
+                if interval > self.max_gap_ns:
+                    self.max_gap_ns = interval
+
+            # the jitter follows the change of the inter-arrival times
+            if self.count > 1:
+                self.jitter_ns += (abs(interval - self.__last_interval) - self.jitter_ns) / 16.0
+            self.__last_interval = interval
+
+        self.__times[self.count & self.__mask] = arrival_ns
+        self.last_ns = arrival_ns
+        self.count += 1
+
+    ##
+    # This function returns the sample rate over the recent samples.
+    #
+    # @param self this object
+    # @return the number of samples per second, 0 if unknown
+    #
+    def rate(self):
+        num = min(self.count, self.__mask + 1)
+        if num < 2:
+            return 0.0
+
+        first_ns = self.__times[(self.count - num) & self.__mask]
+        if self.last_ns <= first_ns:
+            return 0.0
+
+        return (num - 1) * 1e9 / (self.last_ns - first_ns)
+
+    ##
+    # This function returns the percentiles of the recent inter-arrival times.
+    #
+    # @param self this object
+    # @return (p50, p95, p99) in nanoseconds, None if unknown
+    #
+    def interval_percentiles(self):
+        return self.__intervals.percentiles()
+
+    ##
+    # This function checks if no sample has arrived for longer than the gap threshold.
+    #
+    # @param self this object
+    # @param now_ns the current time (time.monotonic_ns())
+    # @return if the samples are stalled
+    #
+    def stalled(self, now_ns: int):
+        return self.count > 0 and now_ns - self.last_ns > self.gap_ns
+
+    ##
+    # This function returns all the estimates as a dictionary.
+    #
+    # @param self this object
+    # @return a dictionary of the estimates
+    #
+    def as_dict(self):
+        pcts = self.interval_percentiles() or (0, 0, 0)
+        return {
+            'rate': '{:.2f}'.format(self.rate()),
+            'interval': '/'.join('{:.1f}'.format(ns / 1e6) for ns in pcts),
+            'jitter': '{:.2f}'.format(self.jitter_ns / 1e6),
+            'gaps': self.gaps,
+            'maxgap': '{:.1f}'.format(self.max_gap_ns / 1e6),
+        }
+
+    ##
+    # This function returns all the estimates as a string.
+    #
+    def __str__(self):
+        return 'rate:{:.1f}/s jit:{:.1f}ms gap:{}'.format(
+            self.rate(), self.jitter_ns / 1e6, self.gaps)
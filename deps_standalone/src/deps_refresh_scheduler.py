@@ -0,0 +1,202 @@
+#############################################################
+# deps_refresh_scheduler.py
+#
+# Created: 2026. 10. 19
+#
+# Authors:
+#    Youngsun Han (youngsun@pknu.ac.kr)
+#
+# Quantum Computing Laboratory (quantum.pknu.ac.kr)
+#############################################################
+
+import time
+
+# fraction of the time which a refresh task may take, e.g. a plot of 50 ms
+# is refreshed at most every 500 ms
+DEPS_REFRESH_BUDGET = 0.1
+
+# cpu load (%) above which the refresh is slowed down, and below which it is sped up
+DEPS_REFRESH_CPU_HIGH = 80.0
+DEPS_REFRESH_CPU_LOW = 50.0
+
+# the interval is multiplied by the slow-down factor under load, and by the
+# speed-up factor otherwise, up to the maximum scale of the base interval
+DEPS_REFRESH_SLOW_DOWN = 1.5
+DEPS_REFRESH_SPEED_UP = 0.8
+DEPS_REFRESH_MAX_SCALE = 16.0
+
+# period of sampling the cpu load (nsec)
+DEPS_REFRESH_LOAD_PERIOD = 1_000_000_000
+
+# weight of a new cost in the smoothed cost of a task
+DEPS_REFRESH_COST_ALPHA = 0.2
+
+#######################################################################
+# DepsRefreshTask class
+#######################################################################
+
+class DepsRefreshTask:
+
+    ##
+    # Constructor of DepsRefreshTask class
+    #
+    # @param self this object
+    # @param interval the base interval, which is also the minimum (msec)
+    # @param max_interval the maximum interval (msec)
+    #
+    def __init__(self, interval: int, max_interval: int):
+        self.base = max(1, interval)
+        self.max = max(self.base, max_interval)
+        self.interval = self.base
+
+        # smoothed cost of a refresh (nsec), and the end of the last refresh
+        self.cost_ns = 0.0
+        self.last_ns = 0
+
+#######################################################################
+# DepsRefreshScheduler class
+#######################################################################
+
+class DepsRefreshScheduler:
+
+    ##
+    # Constructor of DepsRefreshScheduler class. It adapts the intervals of
+    # the display refresh tasks (plots, thermal image, current panel) to their
+    # costs and to the cpu load, within the configured bounds of each task.
+    # The ingestion always has priority: a task is deferred while the data is
+    # waiting in the ingestion queue, and the display is slowed down instead
+    # of letting the queue drop the samples.
+    #
+    # @param self this object
+    # @param backlog the number of queued items over which the tasks are deferred
+    #
+    def __init__(self, backlog: int = 0):
+        self.backlog = backlog
+
+        self.tasks = {}
+
+        # common scale of the base intervals by the load, and the latest cpu load (%)
+        self.scale = 1.0
+        self.load = 0.0
+        self.__load_ns = 0
+        self.__psutil = None
+
+    ##
+    # This function is used to add a refresh task.
+    #
+    # @param self this object
+    # @param name the name of the task
+    # @param interval the base interval, which is also the minimum (msec)
+    # @param max_interval the maximum interval (msec), the same as the base
+    #        interval not to adapt the task
+    #
+    def add(self, name: str, interval: int, max_interval: int):
+        self.tasks[name] = DepsRefreshTask(interval, max_interval)
+
+    ##
+    # This function returns the current interval of a task.
+    #
+    # @param self this object
+    # @param name the name of the task
+    # @return the interval (msec)
+    #
+    def interval(self, name: str):
+        return self.tasks[name].interval
+
+    ##
+    # This function checks if a task should be deferred for the ingestion,
+    # which is the case while the queue has more items than the backlog.
+    # A task is never deferred longer than its maximum interval.
+    #
+    # @param self this object
+    # @param name the name of the task
+    # @param queued the number of items in the ingestion queue
+    # @return true if the task is to be skipped this time
+    #
+    def defer(self, name: str, queued: int):
+        if queued <= self.backlog:
+            return False
+
+        task = self.tasks[name]
+        if time.monotonic_ns() - task.last_ns >= task.max * 1_000_000:
+            return False
+
+        # the ingestion is behind, so the display slows down
+        self.__rescale(DEPS_REFRESH_SLOW_DOWN)
+        return True
+
+    ##
+    # This function is used to record the cost of a refresh, and returns
+    # the interval adapted to the cost and the cpu load.
+    #
+    # @param self this object
+    # @param name the name of the task
+    # @param start_ns the start time of the refresh (time.monotonic_ns())
+    # @return the new interval (msec)
+    #
+    def record(self, name: str, start_ns: int):
+        now_ns = time.monotonic_ns()
+
+        task = self.tasks[name]
+        task.cost_ns += DEPS_REFRESH_COST_ALPHA * ((now_ns - start_ns) - task.cost_ns)
+        task.last_ns = now_ns
+
+        if now_ns - self.__load_ns >= DEPS_REFRESH_LOAD_PERIOD:
+            self.__load_ns = now_ns
+            self.__update_load()
+
+        self.__adapt(task)
+        return task.interval
+
+    ##
+    # This function is used to sample the cpu load, and to rescale the
+    # intervals by it.
+    #
+    # @param self this object
+    #
+    def __update_load(self):
+        if self.__psutil is None:
+            try:
+                # psutil is loaded at the first refresh, not to delay the start-up
+                import psutil
+                self.__psutil = psutil
+            except ImportError:
+                self.__psutil = False
+
+        if not self.__psutil:
+            return
+
+        # the load since the last call, without blocking
+        self.load = self.__psutil.cpu_percent(None)
+
+        if self.load >= DEPS_REFRESH_CPU_HIGH:
+            self.__rescale(DEPS_REFRESH_SLOW_DOWN)
+        elif self.load <= DEPS_REFRESH_CPU_LOW:
+            self.__rescale(DEPS_REFRESH_SPEED_UP)
+
+    ##
+    # This function is used to rescale the intervals of all the tasks.
+    #
+    # @param self this object
+    # @param factor the factor multiplied to the scale
+    #
+    def __rescale(self, factor: float):
+        self.scale = min(max(self.scale * factor, 1.0), DEPS_REFRESH_MAX_SCALE)
+
+        for task in self.tasks.values():
+            self.__adapt(task)
+
+    ##
+    # This function is used to adapt the interval of a task, so that it is
+    # scaled by the load and its cost is within the budget.
+    #
+    # @param self this object
+    # @param task the refresh task
+    #
+    def __adapt(self, task: DepsRefreshTask):
+        interval = max(task.base * self.scale, task.cost_ns / 1e6 / DEPS_REFRESH_BUDGET)
+        task.interval = int(min(max(interval, task.base), task.max))
+
+    def __str__(self):
+        intervals = ' '.join('{}:{}'.format(name, task.interval) for name, task in self.tasks.items())
+        return 'refresh(ms) {} cpu:{:.0f}% x{:.1f}'.format(intervals, self.load, self.scale)
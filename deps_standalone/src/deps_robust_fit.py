@@ -0,0 +1,110 @@
+#############################################################
+# deps_robust_fit.py
+#
+# Created: 2026. 10. 19
+#
+# Authors:
+#    Youngsun Han (youngsun@pknu.ac.kr)
+#
+# Quantum Computing Laboratory (quantum.pknu.ac.kr)
+#############################################################
+
+import numpy as np
+
+# default robust fit, the theil-sen estimator of at most 2048 pairs
+DEPS_ROBUST_DEFAULT = 'theilsen:2048'
+
+# seed of the subsampling, so that the same points give the same fit
+DEPS_ROBUST_SEED = 0
+
+#######################################################################
+# DepsTheilSenFit class
+#######################################################################
+
+class DepsTheilSenFit:
+
+    ##
+    # Constructor of DepsTheilSenFit class. The slope is the median of the
+    # slopes between the pairs of the points, and the intercept is the median
+    # of y - slope * x, so a few outlier points do not skew the fit. All the
+    # pairs are used if there are at most the budget of them, and otherwise
+    # as many random pairs as the budget, so the cost of a fit is bounded
+    # regardless of the number of points.
+    #
+    # @param self this object
+    # @param budget the maximum number of the pairs and of the points for the intercept
+    #
+    def __init__(self, budget: int = 2048):
+        if budget < 1:
+            raise ValueError('Invalid budget: {}'.format(budget))
+
+        self.spec = 'theilsen:{}'.format(budget)
+        self.budget = budget
+
+    ##
+    # This function is used to fit the points.
+    #
+    # @param self this object
+    # @param x x positions of the points
+    # @param y y positions of the points
+    # @return (points, slope, intercept), None if there are no pairs of
+    #         different x positions
+    #
+    def fit(self, x: np.ndarray, y: np.ndarray):
+        num = len(x)
+        if num < 2:
+            return None
+
+        rng = np.random.default_rng(DEPS_ROBUST_SEED)
+
+        if num * (num - 1) // 2 <= self.budget:
+            i, j = np.triu_indices(num, 1)
+        else:
+            i = rng.integers(0, num, self.budget)
+            j = rng.integers(0, num, self.budget)
+
+        # the pairs of the same x, e.g. of the same interval, have no slope
+        dx = x[j] - x[i]
+        valid = dx != 0
+        if not valid.any():
+            return None
+
+        b1 = float(np.median((y[j] - y[i])[valid] / dx[valid]))
+
+        if num > self.budget:
+            k = rng.integers(0, num, self.budget)
+            x, y = x[k], y[k]
+
+        b0 = float(np.median(y - b1 * x))
+
+        return num, b1, b0
+
+# robust fits by the name in the spec
+DEPS_ROBUST_FITS = {
+    'theilsen': (DepsTheilSenFit, (int,)),
+}
+
+###################################################################
+# Utility functions
+###################################################################
+
+##
+# This function is used to create a robust fit from a spec.
+#
+# @param spec the spec of the fit, e.g. "theilsen:2048"
+# @return the robust fit, None if the spec is "None"
+#
+def parse_robust_spec(spec: str):
+    spec = spec.strip()
+    if spec == 'None':
+        return None
+
+    items = spec.split(':')
+    if items[0] not in DEPS_ROBUST_FITS:
+        raise ValueError('Invalid robust fit: ' + spec)
+
+    fit_class, param_types = DEPS_ROBUST_FITS[items[0]]
+    if len(items) - 1 > len(param_types):
+        raise ValueError('Invalid robust fit: ' + spec)
+
+    return fit_class(*[param_type(item) for param_type, item in zip(param_types, items[1:])])
@@ -0,0 +1,385 @@
+#############################################################
+# deps_save_file.py
+#
+# Created: 2026. 10. 19
+#
+# Authors:
+#    Youngsun Han (youngsun@pknu.ac.kr)
+#
+# Quantum Computing Laboratory (quantum.pknu.ac.kr)
+#############################################################
+
+import os
+import gzip
+import lzma
+import time
+
+from datetime import datetime
+
+# the width of the header line, reserved so that it can be rewritten in place
+DEPS_SAVE_HEADER_WIDTH = 510
+
+# storage modes, every sample in a line or a line for a run of identical samples
+DEPS_SAVE_PLAIN = 'plain'
+DEPS_SAVE_RLE = 'rle'
+
+# the maximum number of samples in a run, not to keep a run pending too long
+DEPS_SAVE_MAX_RUN = 10000
+
+#######################################################################
+# DepsSaveFile class
+#######################################################################
+
+class DepsSaveFile:
+
+    ##
+    # Constructor of DepsSaveFile class. A save file starts with a fixed-width
+    # header line ("# key=value key=value ...") which is rewritten in place
+    # whenever the metadata changes, followed by the sensor data lines.
+    # The host timestamp of each sample is stored as the delta from the
+    # previous one (DT in usec), starting from the monotonic time in the header.
+    # In the rle mode, consecutive identical samples are written as a single
+    # line with the number of samples (RUN) and the duration of the run (SPAN).
+    #
+    # @param self this object
+    # @param path the path of the save file
+    # @param mode the storage mode, DEPS_SAVE_PLAIN or DEPS_SAVE_RLE
+    #
+    def __init__(self, path: str, mode: str = DEPS_SAVE_PLAIN):
+        if mode not in (DEPS_SAVE_PLAIN, DEPS_SAVE_RLE):
+            raise ValueError('Invalid storage mode: ' + mode)
+
+        self.name = path
+        self.mode = mode
+        self.__fp = open(path, 'w')
+        self.__num_samples = 0
+        self.__created = datetime.now().strftime("%Y%m%d_%H%M%S")
+
+        # time origin, wall-clock and monotonic time at the same moment (nsec)
+        self.__epoch_ns = time.time_ns()
+        self.__mono_ns = time.monotonic_ns()
+
+        # timestamp of the last sample, quantized to usec as it is written
+        self.__last_ns = self.__mono_ns
+
+        # the run being accumulated, [sig_str, count, first/last tim, first/last dev]
+        self.__run = None
+
+        self.write_header({})
+
+    ##
+    # This function returns the number of samples written into this file.
+    #
+    # @param self this object
+    # @return the number of samples
+    #
+    def num_samples(self):
+        return self.__num_samples
+
+    ##
+    # This function is used to (re)write the header line. The creation time,
+    # the number of samples and the time origin are always written first.
+    #
+    # @param self this object
+    # @param fields a dictionary of the metadata
+    #
+    def write_header(self, fields: dict):
+        items = ['created=' + self.__created, 'samples={}'.format(self.__num_samples),
+                 'epoch={}'.format(self.__epoch_ns), 'mono={}'.format(self.__mono_ns),
+                 'mode=' + self.mode]
+        items.extend('{}={}'.format(k, v) for k, v in fields.items())
+
+        header = '# ' + ' '.join(items)
+        header = header[:DEPS_SAVE_HEADER_WIDTH].ljust(DEPS_SAVE_HEADER_WIDTH) + '\n'
+
+        pos = self.__fp.tell()
+        self.__fp.seek(0)
+        self.__fp.write(header)
+
+        if pos > 0:
+            self.__fp.seek(pos)
+
+    ##
+    # This function is used to write a sensor data line.
+    #
+    # @param self this object
+    # @param spd speed data
+    # @param ang angle data
+    # @param trq torque data
+    # @param cur current data
+    # @param tim_ns host timestamp (time.monotonic_ns()), 0 for now
+    # @param dev_ts device timestamp in msec, negative if not given
+    #
+    def write_sample(self, spd: float, ang: float, trq: float, cur: float,
+                     tim_ns: int = 0, dev_ts: int = -1):
+        if tim_ns == 0:
+            tim_ns = time.monotonic_ns()
+
+        sig_str = 'SPD:{:5.1f},ANG:{:5.1f},TRQ:{:5.1f},CUR:{:5.1f}'.format(spd, ang, trq, cur)
+        self.__num_samples += 1
+
+        if self.mode == DEPS_SAVE_PLAIN:
+            self.__write_line(sig_str, tim_ns, dev_ts)
+            return
+
+        # extend the current run with an identical sample
+        run = self.__run
+        if run is not None and run[0] == sig_str and run[1] < DEPS_SAVE_MAX_RUN:
+            run[1] += 1
+            run[3] = tim_ns
+            run[5] = dev_ts
+            return
+
+        self.flush_run()
+        self.__run = [sig_str, 1, tim_ns, tim_ns, dev_ts, dev_ts]
+
+    ##
+    # This function is used to write the run being accumulated, if any.
+    #
+    # @param self this object
+    #
+    def flush_run(self):
+        run = self.__run
+        if run is None:
+            return
+
+        self.__run = None
+        sig_str, count, first_ns, last_ns, first_dev, last_dev = run
+
+        if count == 1:
+            self.__write_line(sig_str, first_ns, first_dev)
+            return
+
+        span_us = (last_ns - first_ns) // 1000
+        run_str = ',RUN:{},SPAN:{}'.format(count, span_us)
+        if first_dev >= 0:
+            run_str += ',TIMSPAN:{}'.format(last_dev - first_dev)
+
+        self.__write_line(sig_str, first_ns, first_dev, run_str)
+
+        # the next delta is from the last sample of the run
+        self.__last_ns += span_us * 1000
+
+    ##
+    # This function is used to write a line of a sample or a run.
+    #
+    # @param self this object
+    # @param sig_str the sensor data string
+    # @param tim_ns host timestamp (time.monotonic_ns())
+    # @param dev_ts device timestamp in msec, negative if not given
+    # @param run_str the run items, empty for a single sample
+    #
+    def __write_line(self, sig_str: str, tim_ns: int, dev_ts: int, run_str: str = ''):
+        delta_us = (tim_ns - self.__last_ns) // 1000
+        self.__last_ns += delta_us * 1000
+
+        line_str = sig_str + ',DT:{}'.format(delta_us)
+
+        if dev_ts >= 0:
+            line_str += ',TIM:{}'.format(dev_ts)
+
+        self.__fp.write(line_str + run_str + '\n')
+
+    ##
+    # This function returns the number of the samples not written yet, i.e.,
+    # the samples of the run being accumulated in the rle mode.
+    #
+    # @param self this object
+    # @return the number of samples
+    #
+    def backlog(self):
+        return self.__run[1] if self.__run is not None else 0
+
+    ##
+    # This function returns the size of this file written so far.
+    #
+    # @param self this object
+    # @return the size in bytes
+    #
+    def size(self):
+        return self.__fp.tell()
+
+    ##
+    # This function is used to delete this file after closed.
+    #
+    # @param self this object
+    #
+    def remove(self):
+        os.remove(self.name)
+
+    ##
+    # This function is used to close this file.
+    #
+    # @param self this object
+    # @param fields a dictionary of the final metadata, None to keep the header
+    #
+    def close(self, fields: dict = None):
+        if self.__fp.closed:
+            return
+
+        self.flush_run()
+
+        if fields is not None:
+            self.write_header(fields)
+
+        self.__fp.close()
+
+###################################################################
+# Utility functions
+###################################################################
+
+##
+# This function is used to open a save file for reading. The segments
+# compressed by the session archive (.gz, .xz) are read directly.
+#
+# @param path the path of the save file
+# @param binary if true, the file is read in bytes without being decoded
+# @return a text file object, or a binary file object
+#
+def open_save_file(path: str, binary: bool = False):
+    encoding = None if binary else 'ISO-8859-1'
+    mode = 'rb' if binary else 'rt'
+
+    if path.endswith('.gz'):
+        return gzip.open(path, mode, encoding=encoding)
+
+    if path.endswith('.xz'):
+        return lzma.open(path, mode, encoding=encoding)
+
+    return open(path, mode, encoding=encoding)
+
+##
+# This function is used to read the header of a save file.
+#
+# @param line_str the first line of the save file
+# @return a dictionary of the metadata, None if the line is not a header
+#
+def parse_save_header(line_str: str):
+    if not line_str.startswith('#'):
+        return None
+
+    fields = {}
+    for item in line_str[1:].split():
+        sidx = item.find('=')
+        if sidx != -1:
+            fields[item[:sidx]] = item[sidx + 1:]
+
+    return fields
+
+##
+# This is a function to interpolate the timestamps of the samples in a run.
+#
+# @param start the timestamp of the first sample
+# @param span the duration from the first sample to the last one
+# @param count the number of samples
+# @return a list of the timestamps
+#
+def interpolate_run(start: int, span: int, count: int):
+    if count == 1:
+        return [start]
+
+    return [start + span * i // (count - 1) for i in range(count)]
+
+##
+# This is a generator of the runs of a save file. A sample written in a line
+# is a run of one sample, so the files in both the modes can be read.
+#
+# @param path the path of the save file
+# @return (sensor data string with the device timestamp (TIM) of the first sample,
+#         host timestamp of the first sample in nsec, number of samples,
+#         duration of the run in nsec, duration of the run in device msec),
+#         the host timestamp is 0 for the lines written without it
+#
+def read_save_runs(path: str):
+    tim_ns = 0
+
+    with open_save_file(path) as fp:
+        for line_str in fp:
+            line_str = line_str.rstrip()
+            if not line_str:
+                continue
+
+            if line_str.startswith('#'):
+                fields = parse_save_header(line_str)
+                tim_ns = int(fields.get('mono', '0'))
+                continue
+
+            # an empty item was written before CUR in the older files
+            line_str = line_str.replace(', ,', ',')
+
+            sidx = line_str.find(',DT:')
+            if sidx == -1:
+                yield line_str, 0, 1, 0, 0
+                continue
+
+            # the items following the sensor data
+            items = {}
+            try:
+                for item in line_str[sidx + 1:].split(','):
+                    key, value = item.split(':')
+                    items[key] = int(value)
+            except ValueError:
+                yield line_str, 0, 1, 0, 0
+                continue
+
+            sig_str = line_str[:sidx]
+            if 'TIM' in items:
+                sig_str += ',TIM:{}'.format(items['TIM'])
+
+            tim_ns += items['DT'] * 1000
+            span_ns = items.get('SPAN', 0) * 1000
+
+            yield sig_str, tim_ns, items.get('RUN', 1), span_ns, items.get('TIMSPAN', 0)
+
+            # the next delta is from the last sample of the run
+            tim_ns += span_ns
+
+##
+# This is a generator of the sensor data lines of a save file with their
+# host timestamps restored from the time origin and the deltas (DT).
+# The runs of the rle mode are expanded into the samples.
+#
+# @param path the path of the save file
+# @return (line string, host timestamp in nsec), the timestamp is 0
+#         for the lines written without it
+#
+def read_save_file(path: str):
+    for sig_str, tim_ns, count, span_ns, dev_span in read_save_runs(path):
+        if count == 1:
+            yield sig_str, tim_ns
+            continue
+
+        tims = interpolate_run(tim_ns, span_ns, count)
+
+        sidx = sig_str.find(',TIM:')
+        if sidx == -1:
+            for tim in tims:
+                yield sig_str, tim
+            continue
+
+        devs = interpolate_run(int(sig_str[sidx + 5:]), dev_span, count)
+        for tim, dev in zip(tims, devs):
+            yield sig_str[:sidx] + ',TIM:{}'.format(dev), tim
+
+##
+# This is a generator of the sensor data lines of a save file in bytes. The lines
+# of a raw data file are given as they are read, without being decoded, while
+# the lines of a save file written by DepsSaveFile (with a header) are rebuilt
+# by read_save_file() and encoded.
+#
+# @param path the path of the save file
+# @return line bytes
+#
+def read_save_bytes(path: str):
+    with open_save_file(path, binary=True) as fp:
+        if fp.read(1) != b'#':
+            fp.seek(0)
+
+            for line in fp:
+                if not line.isspace():
+                    # an empty item was written before CUR in the older files
+                    yield line.replace(b', ,', b',')
+            return
+
+    for line_str, _ in read_save_file(path):
+        yield line_str.encode('ISO-8859-1')
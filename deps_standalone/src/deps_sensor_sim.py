@@ -0,0 +1,337 @@
+#############################################################
+# deps_sensor_sim.py
+#
+# Created: 2026. 10. 19
+#
+# Authors:
+#    Youngsun Han (youngsun@pknu.ac.kr)
+#
+# Quantum Computing Laboratory (quantum.pknu.ac.kr)
+#############################################################
+
+import os
+import sys
+import tty
+import math
+import time
+import errno
+import random
+import signal
+import termios
+import argparse
+
+#######################################################################
+# DepsSensorSim class
+#######################################################################
+
+##
+# A host-side stand-in for the Arduino board running deps_sensor2.ino.
+# It creates a pseudo-terminal pair and streams EPS sensor records
+# ("SPD:+00.0,ANG:-0099,TRQ:+2732,CUR:+07.0\n") into the master side,
+# so that DepsCommConn can open the slave side like a real UART.
+#
+# [Usage]
+# python deps_sensor_sim.py --file ../dat/dpeco_current/dpeco_data_current_measure_added_240305.txt
+#                           --rate 100 --link /tmp/ttyDEPS
+# (then set 'port = /tmp/ttyDEPS' in config.ini)
+#
+class DepsSensorSim:
+
+    ##
+    # Constructor of DepsSensorSim class
+    #
+    # @param self this object
+    # @param baud the (emulated) baudrate of the serial link
+    # @param rate the number of records per second, 0 for as fast as possible
+    # @param jitter the maximum random deviation of the record interval (sec)
+    # @param burst the number of records sent back-to-back for each burst, 0 to disable
+    # @param burst_period the period between two bursts (sec)
+    # @param corrupt the probability to corrupt a record
+    # @param enforce_baud if true, the output is throttled to the byte rate of the baudrate
+    # @param device_time if true, the device timestamp (TIM in msec) is appended to each record
+    #
+    def __init__(self, baud: int = 57600, rate: float = 5.0, jitter: float = 0.0,
+                 burst: int = 0, burst_period: float = 1.0, corrupt: float = 0.0,
+                 enforce_baud: bool = True, device_time: bool = False):
+        self.baud = baud
+        self.rate = rate
+        self.jitter = jitter
+        self.burst = burst
+        self.burst_period = burst_period
+        self.corrupt = corrupt
+        self.enforce_baud = enforce_baud
+        self.device_time = device_time
+
+        # device clock, started when the simulator is created
+        self.__start_time = time.monotonic()
+
+        # pty handles
+        self.__master_fd = None
+        self.__slave_fd = None
+        self.__link = None
+        self.slave_path = None
+
+        # statistics
+        self.num_sent = 0
+        self.num_corrupted = 0
+        self.num_overrun = 0
+
+    ###################################################################
+    # pty connections
+    ###################################################################
+
+    ##
+    # This is a function to create the pseudo-terminal pair.
+    #
+    # @param self this object
+    # @param link an optional symbolic link to be created for the slave device
+    # @return the path of the slave device
+    #
+    def open(self, link: str = None):
+        self.__master_fd, self.__slave_fd = os.openpty()
+        self.slave_path = os.ttyname(self.__slave_fd)
+
+        # raw mode, no echo and no line translation as a real uart
+        tty.setraw(self.__slave_fd)
+
+        attrs = termios.tcgetattr(self.__slave_fd)
+        speed = getattr(termios, 'B{}'.format(self.baud), None)
+        if speed is not None:
+            attrs[4] = speed
+            attrs[5] = speed
+        termios.tcsetattr(self.__slave_fd, termios.TCSANOW, attrs)
+
+        # the reader should never block the simulator, overruns are counted instead
+        os.set_blocking(self.__master_fd, False)
+
+        if link is not None:
+            if os.path.islink(link):
+                os.remove(link)
+            os.symlink(self.slave_path, link)
+            self.__link = link
+
+        return self.slave_path
+
+    ##
+    # This is a function to close the pseudo-terminal pair.
+    #
+    # @param self this object
+    #
+    def close(self):
+        if self.__link is not None and os.path.islink(self.__link):
+            os.remove(self.__link)
+            self.__link = None
+
+        for fd in (self.__master_fd, self.__slave_fd):
+            if fd is not None:
+                os.close(fd)
+
+        self.__master_fd = None
+        self.__slave_fd = None
+
+    ###################################################################
+    # EPS sensor data
+    ###################################################################
+
+    ##
+    # This is a function to write a single record into the master side.
+    #
+    # @param self this object
+    # @param record a record string without the line feed
+    # @return the number of bytes written
+    #
+    def write_record(self, record: str):
+        if self.device_time:
+            record += ',TIM:{}'.format(int((time.monotonic() - self.__start_time) * 1000))
+
+        if self.corrupt > 0 and random.random() < self.corrupt:
+            record = corrupt_record(record)
+            self.num_corrupted += 1
+
+        rec_bytes = record.encode('ISO-8859-1') + b'\x0A'
+
+        try:
+            num_bytes = os.write(self.__master_fd, rec_bytes)
+        except OSError as e:
+            if e.errno != errno.EAGAIN:
+                raise
+            num_bytes = 0
+
+        # the rest of the record is lost like a uart overrun
+        if num_bytes < len(rec_bytes):
+            self.num_overrun += 1
+
+        self.num_sent += 1
+        return len(rec_bytes)
+
+    ##
+    # This is a function to stream the given records with the configured timing.
+    #
+    # @param self this object
+    # @param records an iterable of record strings
+    # @param count the maximum number of records to be sent, 0 for no limit
+    #
+    def stream(self, records, count: int = 0):
+        interval = 1.0 / self.rate if self.rate > 0 else 0.0
+        byte_time = 10.0 / self.baud if self.enforce_baud else 0.0
+
+        next_time = time.monotonic()
+        next_burst = next_time + self.burst_period
+        burst_left = 0
+
+        for record in records:
+            if 0 < count <= self.num_sent:
+                break
+
+            num_bytes = self.write_record(record)
+
+            # the link cannot carry more than baud / 10 bytes per second
+            delay = max(interval, num_bytes * byte_time)
+
+            # bursts are sent back-to-back, limited only by the baudrate
+            now = time.monotonic()
+            if burst_left == 0 and self.burst > 0 and now >= next_burst:
+                burst_left = self.burst
+                next_burst += self.burst_period
+
+            if burst_left > 0:
+                burst_left -= 1
+                delay = num_bytes * byte_time
+
+            if self.jitter > 0:
+                delay = max(0.0, delay + random.uniform(-self.jitter, self.jitter))
+
+            # absolute deadlines so that the error does not accumulate
+            next_time += delay
+            sleep_time = next_time - time.monotonic()
+            if sleep_time > 0:
+                time.sleep(sleep_time)
+            elif sleep_time < -1.0:
+                # too late, restart the schedule instead of flooding the link
+                next_time = time.monotonic()
+
+
+###################################################################
+# Utility functions
+###################################################################
+
+##
+# This is a function to format a record as the firmware does.
+#
+# @param spd speed data
+# @param ang angle data
+# @param trq torque data
+# @param cur current data
+# @return the record string
+#
+def format_record(spd: float, ang: float, trq: float, cur: float):
+    return 'SPD:{:+05.1f},ANG:{:+05d},TRQ:{:+05d},CUR:{:+05.1f}'.format(
+        spd, int(ang), int(trq), cur)
+
+##
+# This is a generator of records read from a recorded data file.
+#
+# @param filename the recorded data file
+# @param loop if true, the file is replayed over and over
+# @return records
+#
+def recorded_records(filename: str, loop: bool = True):
+    while True:
+        with open(filename, 'r', encoding='ISO-8859-1') as fp:
+            for line_str in fp:
+                line_str = line_str.rstrip()
+                if line_str and not line_str.startswith('#'):
+                    yield line_str
+
+        if not loop:
+            return
+
+##
+# This is a generator of synthetic records. The steering angle sweeps
+# a sine wave, the torque and the current follow the angle, and the
+# speed steps through the three speed levels (0~10, 10~30, 30~60 Km/h).
+#
+# @param rate the number of records per second, used for the sweep period
+# @return records
+#
+def synthetic_records(rate: float = 5.0):
+    steps = max(1.0, rate) * 4.0
+    speeds = [5.0, 20.0, 45.0]
+    i = 0
+    while True:
+        phase = 2.0 * math.pi * (i % steps) / steps
+        spd = speeds[(i // int(steps * 5)) % len(speeds)]
+        ang = 300.0 * math.sin(phase)
+        trq = 2700.0 - 0.8 * ang + random.gauss(0.0, 5.0)
+        cur = min(79.0, abs(ang) / 20.0 + random.gauss(0.0, 0.3))
+        yield format_record(spd, ang, trq, max(0.0, cur))
+        i += 1
+
+##
+# This is a function to corrupt a record in the ways which are observed
+# on a noisy uart link: bit flips, truncation and garbage bytes.
+#
+# @param record a record string
+# @return the corrupted record string
+#
+def corrupt_record(record: str):
+    kind = random.randrange(3)
+    pos = random.randrange(max(1, len(record)))
+
+    if kind == 0:
+        # bit flip
+        return record[:pos] + chr(ord(record[pos]) ^ (1 << random.randrange(7))) + record[pos + 1:]
+    elif kind == 1:
+        # truncation
+        return record[:pos]
+
+    # garbage
+    return record[:pos] + chr(random.randrange(0x80, 0x100)) + record[pos:]
+
+
+###################################################################
+# Main function for the sensor simulator
+###################################################################
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='EPS sensor simulator on a pseudo-terminal')
+    parser.add_argument('--file', help='recorded data file to be replayed (synthetic data if omitted)')
+    parser.add_argument('--no-loop', action='store_true', help='stop at the end of the recorded file')
+    parser.add_argument('--baud', type=int, default=57600, help='emulated baudrate')
+    parser.add_argument('--no-baud-limit', action='store_true', help='do not throttle to the baudrate')
+    parser.add_argument('--rate', type=float, default=5.0, help='records per second, 0 for unlimited')
+    parser.add_argument('--jitter', type=float, default=0.0, help='max. interval jitter in msec')
+    parser.add_argument('--burst', type=int, default=0, help='records per burst')
+    parser.add_argument('--burst-period', type=float, default=1.0, help='burst period in sec')
+    parser.add_argument('--corrupt', type=float, default=0.0, help='probability to corrupt a record')
+    parser.add_argument('--count', type=int, default=0, help='number of records to send, 0 for no limit')
+    parser.add_argument('--device-time', action='store_true', help='append the device timestamp (TIM)')
+    parser.add_argument('--link', help='symbolic link to the slave device, e.g. /tmp/ttyDEPS')
+    args = parser.parse_args()
+
+    sim = DepsSensorSim(baud=args.baud, rate=args.rate, jitter=args.jitter / 1000.0,
+                        burst=args.burst, burst_period=args.burst_period,
+                        corrupt=args.corrupt, enforce_baud=not args.no_baud_limit,
+                        device_time=args.device_time)
+
+    # remove the symbolic link also when terminated
+    signal.signal(signal.SIGTERM, lambda signum, frame: sys.exit(0))
+
+    print('EPS sensor simulator: ' + sim.open(args.link))
+    sys.stdout.flush()
+
+    if args.file is not None:
+        records = recorded_records(args.file, not args.no_loop)
+    else:
+        records = synthetic_records(args.rate)
+
+    start_time = time.monotonic()
+    try:
+        sim.stream(records, args.count)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        elapsed = max(1e-9, time.monotonic() - start_time)
+        print('sent: {}, corrupted: {}, overrun: {}, rate: {:.1f} rec/s'.format(
+            sim.num_sent, sim.num_corrupted, sim.num_overrun, sim.num_sent / elapsed))
+        sim.close()
@@ -0,0 +1,342 @@
+#############################################################
+# deps_session_archive.py
+#
+# Created: 2026. 10. 19
+#
+# Authors:
+#    Youngsun Han (youngsun@pknu.ac.kr)
+#
+# Quantum Computing Laboratory (quantum.pknu.ac.kr)
+#############################################################
+
+import os
+import gzip
+import json
+import lzma
+import queue
+import shutil
+import threading
+import time
+
+from datetime import datetime
+
+from deps_save_file import DepsSaveFile, DEPS_SAVE_PLAIN, read_save_runs, read_save_file, read_save_bytes
+
+# codecs of the closed segments, (open function, file suffix)
+DEPS_ARCHIVE_CODECS = {
+    'none': (None, ''),
+    'gzip': (gzip.open, '.gz'),
+    'lzma': (lzma.open, '.xz'),
+}
+
+# the number of samples between two checks of the rotation
+DEPS_ARCHIVE_CHECK_INTERVAL = 256
+
+#######################################################################
+# DepsSessionArchive class
+#######################################################################
+
+class DepsSessionArchive:
+
+    ##
+    # Constructor of DepsSessionArchive class. A session is written into
+    # a series of save files (segments), which are rotated by the size or
+    # the time. The closed segments are compressed in a background thread,
+    # and the manifest (json) lists all the segments of the session in order.
+    # It can be used in place of DepsSaveFile, with the manifest as its name.
+    #
+    # @param self this object
+    # @param path the path of the manifest, e.g. save_20261019_120000.json
+    # @param mode the storage mode of the segments (DEPS_SAVE_PLAIN or DEPS_SAVE_RLE)
+    # @param codec the codec of the closed segments ('none', 'gzip' or 'lzma')
+    # @param max_bytes the maximum size of a segment in bytes, 0 for no limit
+    # @param max_seconds the maximum duration of a segment in seconds, 0 for no limit
+    # @param header_fields a function returning the header fields of a closed segment
+    # @param log a function to report the errors of the compression
+    #
+    def __init__(self, path: str, mode: str = DEPS_SAVE_PLAIN, codec: str = 'gzip',
+                 max_bytes: int = 0, max_seconds: float = 0, header_fields=None, log=print):
+        if codec not in DEPS_ARCHIVE_CODECS:
+            raise ValueError('Invalid codec: ' + codec)
+
+        self.name = path
+        self.mode = mode
+        self.codec = codec
+        self.max_bytes = max_bytes
+        self.max_seconds = max_seconds
+        self.header_fields = header_fields
+        self.log = log
+
+        self.__base = os.path.splitext(path)[0]
+        self.__created = datetime.now().strftime("%Y%m%d_%H%M%S")
+
+        # segments of the session, {name, samples, codec}, guarded by the lock
+        self.__segments = []
+        self.__lock = threading.Lock()
+
+        self.__num_samples = 0
+        self.__fields = {}
+
+        # compression jobs, the paths of the closed segments
+        self.__jobs = queue.Queue()
+        self.__thread = None
+        if codec != 'none':
+            self.__thread = threading.Thread(target=self.__compress_segments, daemon=True)
+            self.__thread.start()
+
+        self.__segment = None
+        self.__segment_start = 0.0
+        self.__open_segment()
+
+    ##
+    # This function returns the number of samples written into this session.
+    #
+    # @param self this object
+    # @return the number of samples
+    #
+    def num_samples(self):
+        return self.__num_samples
+
+    ##
+    # This function is used to (re)write the header line of the current segment.
+    #
+    # @param self this object
+    # @param fields a dictionary of the metadata
+    #
+    def write_header(self, fields: dict):
+        self.__fields = fields
+        self.__segment.write_header(fields)
+
+    ##
+    # This function is used to write a sensor data line into the current segment.
+    #
+    # @param self this object
+    # @param spd speed data
+    # @param ang angle data
+    # @param trq torque data
+    # @param cur current data
+    # @param tim_ns host timestamp (time.monotonic_ns()), 0 for now
+    # @param dev_ts device timestamp in msec, negative if not given
+    #
+    def write_sample(self, spd: float, ang: float, trq: float, cur: float,
+                     tim_ns: int = 0, dev_ts: int = -1):
+        self.__segment.write_sample(spd, ang, trq, cur, tim_ns, dev_ts)
+        self.__num_samples += 1
+
+        if self.__num_samples % DEPS_ARCHIVE_CHECK_INTERVAL == 0 and self.__need_rotation():
+            self.__close_segment()
+            self.__open_segment()
+
+    ##
+    # This function returns the number of the samples not written yet into
+    # the current segment.
+    #
+    # @param self this object
+    # @return the number of samples
+    #
+    def backlog(self):
+        return self.__segment.backlog() if self.__segment is not None else 0
+
+    ##
+    # This function returns the number of the closed segments waiting to be compressed.
+    #
+    # @param self this object
+    # @return the number of segments
+    #
+    def compress_backlog(self):
+        return self.__jobs.qsize()
+
+    ##
+    # This function is used to close this session. It waits for all the
+    # segments to be compressed.
+    #
+    # @param self this object
+    # @param fields a dictionary of the final metadata, None to keep the header
+    #
+    def close(self, fields: dict = None):
+        if self.__segment is None:
+            return
+
+        if fields is not None:
+            self.__fields = fields
+
+        self.__close_segment()
+        self.__segment = None
+
+        if self.__thread is not None:
+            self.__jobs.put(None)
+            self.__thread.join()
+            self.__thread = None
+
+        self.__write_manifest()
+
+    ##
+    # This function is used to delete all the segments and the manifest after closed.
+    #
+    # @param self this object
+    #
+    def remove(self):
+        for segment in self.__segments:
+            os.remove(os.path.join(os.path.dirname(self.name), segment['name']))
+
+        os.remove(self.name)
+
+    ##
+    # This function checks if the current segment has to be rotated.
+    #
+    # @param self this object
+    # @return if the segment is full
+    #
+    def __need_rotation(self):
+        if 0 < self.max_bytes <= self.__segment.size():
+            return True
+
+        if 0 < self.max_seconds <= time.monotonic() - self.__segment_start:
+            return True
+
+        return False
+
+    ##
+    # This function is used to open a new segment.
+    #
+    # @param self this object
+    #
+    def __open_segment(self):
+        path = '{}_{:03d}.txt'.format(self.__base, len(self.__segments))
+
+        self.__segment = DepsSaveFile(path, self.mode)
+        self.__segment.write_header(self.__fields)
+        self.__segment_start = time.monotonic()
+
+        with self.__lock:
+            self.__segments.append({
+                'name': os.path.basename(path),
+                'samples': 0,
+                'codec': 'none',
+            })
+
+        self.__write_manifest()
+
+    ##
+    # This function is used to close the current segment and to compress it.
+    #
+    # @param self this object
+    #
+    def __close_segment(self):
+        if self.header_fields is not None:
+            self.__fields = self.header_fields()
+
+        self.__segment.close(self.__fields)
+
+        with self.__lock:
+            self.__segments[-1]['samples'] = self.__segment.num_samples()
+
+        self.__write_manifest()
+
+        if self.__thread is not None:
+            self.__jobs.put(len(self.__segments) - 1)
+
+    ##
+    # This is a thread routine to compress the closed segments.
+    #
+    # @param self this object
+    #
+    def __compress_segments(self):
+        open_func, suffix = DEPS_ARCHIVE_CODECS[self.codec]
+        dirname = os.path.dirname(self.name)
+
+        while True:
+            index = self.__jobs.get()
+            if index is None:
+                return
+
+            with self.__lock:
+                name = self.__segments[index]['name']
+
+            src_path = os.path.join(dirname, name)
+            dst_path = src_path + suffix
+
+            try:
+                with open(src_path, 'rb') as src, open_func(dst_path + '.tmp', 'wb') as dst:
+                    shutil.copyfileobj(src, dst)
+                os.replace(dst_path + '.tmp', dst_path)
+            except OSError as e:
+                self.log('Segment is not compressed: ' + src_path + ' ' + str(e))
+                continue
+
+            # the manifest refers to the compressed one before the original is deleted
+            with self.__lock:
+                self.__segments[index]['name'] = name + suffix
+                self.__segments[index]['codec'] = self.codec
+
+            self.__write_manifest()
+            os.remove(src_path)
+
+    ##
+    # This function is used to write the manifest of the session.
+    #
+    # @param self this object
+    #
+    def __write_manifest(self):
+        with self.__lock:
+            manifest = {
+                'created': self.__created,
+                'mode': self.mode,
+                'samples': self.__num_samples,
+                'segments': [dict(segment) for segment in self.__segments],
+            }
+
+            tmp_path = self.name + '.tmp'
+            with open(tmp_path, 'w') as fp:
+                json.dump(manifest, fp, indent=1)
+            os.replace(tmp_path, self.name)
+
+###################################################################
+# Utility functions
+###################################################################
+
+##
+# This function returns the paths of the save files of a session.
+#
+# @param path the path of a manifest, or of a single save file
+# @return a list of the paths of the save files in order
+#
+def session_paths(path: str):
+    if not path.endswith('.json'):
+        return [path]
+
+    with open(path, 'r') as fp:
+        manifest = json.load(fp)
+
+    dirname = os.path.dirname(path)
+    return [os.path.join(dirname, segment['name']) for segment in manifest['segments']]
+
+##
+# This is a generator of the runs of all the save files of a session.
+#
+# @param path the path of a manifest, or of a single save file
+# @return the runs as read_save_runs()
+#
+def read_session_runs(path: str):
+    for seg_path in session_paths(path):
+        yield from read_save_runs(seg_path)
+
+##
+# This is a generator of the sensor data lines of all the save files of a session.
+#
+# @param path the path of a manifest, or of a single save file
+# @return the lines as read_save_file()
+#
+def read_session_file(path: str):
+    for seg_path in session_paths(path):
+        yield from read_save_file(seg_path)
+
+##
+# This is a generator of the sensor data lines of all the save files of a session in bytes.
+#
+# @param path the path of a manifest, or of a single save file
+# @return the lines as read_save_bytes()
+#
+def read_session_bytes(path: str):
+    for seg_path in session_paths(path):
+        yield from read_save_bytes(seg_path)
@@ -0,0 +1,356 @@
+#############################################################
+# deps_session_db.py
+#
+# Created: 2026. 10. 19
+#
+# Authors:
+#    Youngsun Han (youngsun@pknu.ac.kr)
+#
+# Quantum Computing Laboratory (quantum.pknu.ac.kr)
+#############################################################
+
+import sys
+import time
+import queue
+import sqlite3
+import argparse
+import threading
+
+from datetime import datetime
+
+# the maximum number of rows inserted at once, and the maximum delay (sec)
+DEPS_DB_BATCH_SIZE = 1000
+DEPS_DB_BATCH_DELAY = 0.5
+
+# the maximum number of rows waiting to be inserted, over which the rows are dropped
+DEPS_DB_QUEUE_SIZE = 100000
+
+# speed bands of the linearity, (min, max) Km/h
+DEPS_SPEED_BANDS = ((0, 10), (10, 30), (30, 60))
+
+DEPS_DB_SCHEMA = '''
+CREATE TABLE IF NOT EXISTS sessions (
+    id INTEGER PRIMARY KEY,
+    name TEXT,
+    started INTEGER,
+    ended INTEGER
+);
+CREATE TABLE IF NOT EXISTS samples (
+    session INTEGER, tim INTEGER, dev INTEGER, band INTEGER,
+    spd REAL, ang REAL, trq REAL, cur REAL
+);
+CREATE TABLE IF NOT EXISTS linearity (
+    session INTEGER, tim INTEGER, band INTEGER, interval INTEGER, value REAL
+);
+CREATE TABLE IF NOT EXISTS regressions (
+    session INTEGER, tim INTEGER, band INTEGER, num INTEGER,
+    slope REAL, intercept REAL, linearity REAL
+);
+CREATE TABLE IF NOT EXISTS currents (
+    session INTEGER, tim INTEGER, min REAL, max REAL, mean REAL
+);
+CREATE INDEX IF NOT EXISTS samples_session ON samples (session, tim);
+CREATE INDEX IF NOT EXISTS samples_band ON samples (band, tim);
+CREATE INDEX IF NOT EXISTS linearity_session ON linearity (session, tim);
+CREATE INDEX IF NOT EXISTS linearity_band ON linearity (band, tim);
+CREATE INDEX IF NOT EXISTS regressions_session ON regressions (session, band, tim);
+CREATE INDEX IF NOT EXISTS currents_session ON currents (session, tim);
+'''
+
+# insert statements of the tables, the session is the first column
+DEPS_DB_INSERTS = {
+    'samples': 'INSERT INTO samples VALUES (?, ?, ?, ?, ?, ?, ?, ?)',
+    'linearity': 'INSERT INTO linearity VALUES (?, ?, ?, ?, ?)',
+    'regressions': 'INSERT INTO regressions VALUES (?, ?, ?, ?, ?, ?, ?)',
+    'currents': 'INSERT INTO currents VALUES (?, ?, ?, ?, ?)',
+}
+
+#######################################################################
+# DepsSessionDb class
+#######################################################################
+
+class DepsSessionDb:
+
+    ##
+    # Constructor of DepsSessionDb class. The samples, the linearity points,
+    # the regression results and the current statistics of the sessions are
+    # stored into a SQLite database. The rows are queued by the caller and
+    # inserted in batches by a writer thread, so adding a row costs O(1).
+    # The timestamps are stored as the wall-clock time in nanoseconds.
+    #
+    # The queue is bounded, and the rows are dropped and counted if the
+    # writer falls behind, e.g. on a slow disk. A batch which fails to be
+    # inserted (disk full, i/o error, locked database) is logged and dropped,
+    # and the writer goes on with the next one.
+    #
+    # @param self this object
+    # @param path the path of the database file
+    # @param log the function to print a message
+    #
+    def __init__(self, path: str, log=print):
+        self.path = path
+        self.log = log
+
+        # offset from time.monotonic_ns() to the wall-clock time
+        self.__epoch_offset = time.time_ns() - time.monotonic_ns()
+
+        # rows to be inserted, (table, row) or (None, command)
+        self.__queue = queue.Queue(DEPS_DB_QUEUE_SIZE)
+
+        # the number of rows dropped by the full queue or by the errors
+        self.dropped = 0
+
+        # the schema is created before the writer starts, to report the errors here
+        conn = connect_db(path)
+        conn.executescript(DEPS_DB_SCHEMA)
+        conn.close()
+
+        self.__thread = threading.Thread(target=self.__write_rows, daemon=True)
+        self.__thread.start()
+
+    ##
+    # This function is used to start a new session. The following rows belong to it.
+    #
+    # @param self this object
+    # @param name the name of the session, e.g. the save file
+    #
+    def begin_session(self, name: str):
+        self.__queue.put((None, ('begin', name, time.time_ns())))
+
+    ##
+    # This function is used to add a sensor sample.
+    #
+    # @param self this object
+    # @param spd speed data
+    # @param ang angle data
+    # @param trq torque data
+    # @param cur current data
+    # @param tim_ns host timestamp (time.monotonic_ns())
+    # @param dev_ts device timestamp in msec, negative if not given
+    #
+    def add_sample(self, spd: float, ang: float, trq: float, cur: float,
+                   tim_ns: int, dev_ts: int = -1):
+        self.__put_row('samples', (tim_ns + self.__epoch_offset, dev_ts, speed_band(spd),
+                                   spd, ang, trq, cur))
+
+    ##
+    # This function is used to add the completed linearity points of a speed band.
+    #
+    # @param self this object
+    # @param band the index of the speed band
+    # @param points a list of the linearity points, (interval, value)
+    #
+    def add_linearity(self, band: int, points: list):
+        tim = time.time_ns()
+        for interval, value in points:
+            self.__put_row('linearity', (tim, band, int(interval), float(value)))
+
+    ##
+    # This function is used to add a regression result of a speed band.
+    #
+    # @param self this object
+    # @param band the index of the speed band
+    # @param num the number of the linearity points
+    # @param slope the slope of the regression
+    # @param intercept the intercept of the regression
+    # @param linearity the linearity shown to the user
+    #
+    def add_regression(self, band: int, num: int, slope: float, intercept: float,
+                       linearity: float):
+        self.__put_row('regressions', (time.time_ns(), band, num, float(slope),
+                                       float(intercept), float(linearity)))
+
+    ##
+    # This function is used to add the statistics of the current consumption.
+    #
+    # @param self this object
+    # @param cur_min the minimum current
+    # @param cur_max the maximum current
+    # @param cur_mean the mean current
+    #
+    def add_current(self, cur_min: float, cur_max: float, cur_mean: float):
+        self.__put_row('currents', (time.time_ns(), float(cur_min), float(cur_max),
+                                    float(cur_mean)))
+
+    ##
+    # This function returns the number of the rows waiting to be inserted.
+    #
+    # @param self this object
+    # @return the number of rows
+    #
+    def backlog(self):
+        return self.__queue.qsize()
+
+    ##
+    # This function is used to queue a row, which is dropped if the queue is full.
+    #
+    # @param self this object
+    # @param table the name of the table
+    # @param row the values of the row without the session
+    #
+    def __put_row(self, table: str, row: tuple):
+        try:
+            self.__queue.put_nowait((table, row))
+        except queue.Full:
+            self.dropped += 1
+
+    ##
+    # This function is used to close the database after all the rows are inserted.
+    #
+    # @param self this object
+    #
+    def close(self):
+        if self.__thread is None:
+            return
+
+        self.__queue.put((None, ('end', None, time.time_ns())))
+        self.__queue.put((None, ('close', None, 0)))
+        self.__thread.join()
+        self.__thread = None
+
+    ##
+    # This is a thread routine to insert the queued rows in batches.
+    #
+    # @param self this object
+    #
+    def __write_rows(self):
+        conn = connect_db(self.path)
+        session = None
+        rows = {table: [] for table in DEPS_DB_INSERTS}
+
+        # the last error, which is logged only once until the rows are inserted again
+        last_error = None
+
+        def report(e: sqlite3.Error):
+            nonlocal last_error
+            if str(e) != last_error:
+                last_error = str(e)
+                self.log('Session database error: ' + last_error)
+
+        # the pending rows are dropped if they fail to be inserted
+        def flush():
+            nonlocal last_error
+            try:
+                for table, table_rows in rows.items():
+                    if table_rows:
+                        conn.executemany(DEPS_DB_INSERTS[table], table_rows)
+                conn.commit()
+                last_error = None
+            except sqlite3.Error as e:
+                self.dropped += sum(len(table_rows) for table_rows in rows.values())
+                report(e)
+            finally:
+                for table_rows in rows.values():
+                    table_rows.clear()
+
+        while True:
+            batch = [self.__queue.get()]
+            deadline = time.monotonic() + DEPS_DB_BATCH_DELAY
+
+            while len(batch) < DEPS_DB_BATCH_SIZE:
+                try:
+                    batch.append(self.__queue.get(timeout=max(0.0, deadline - time.monotonic())))
+                except queue.Empty:
+                    break
+
+            for table, row in batch:
+                if table is not None:
+                    rows[table].append((session,) + row)
+                    continue
+
+                # the rows of the previous session are inserted first
+                command, name, tim = row
+                flush()
+
+                try:
+                    if command == 'begin':
+                        if session is not None:
+                            conn.execute('UPDATE sessions SET ended = ? WHERE id = ?', (tim, session))
+                        session = None
+                        cur = conn.execute('INSERT INTO sessions (name, started) VALUES (?, ?)',
+                                           (name, tim))
+                        session = cur.lastrowid
+                    elif command == 'end':
+                        if session is not None:
+                            conn.execute('UPDATE sessions SET ended = ? WHERE id = ?', (tim, session))
+                    elif command == 'close':
+                        conn.commit()
+                except sqlite3.Error as e:
+                    report(e)
+
+                if command == 'close':
+                    conn.close()
+                    return
+
+            flush()
+
+###################################################################
+# Utility functions
+###################################################################
+
+##
+# This function is used to open a connection to the database in the WAL mode,
+# so that the database can be queried while the samples are being inserted.
+#
+# @param path the path of the database file
+# @return a sqlite3 connection
+#
+def connect_db(path: str):
+    conn = sqlite3.connect(path)
+    conn.execute('PRAGMA journal_mode=WAL')
+    conn.execute('PRAGMA synchronous=NORMAL')
+    return conn
+
+##
+# This function returns the speed band of the given speed.
+#
+# @param spd speed data
+# @return the index of the speed band, -1 if out of all the bands
+#
+def speed_band(spd: float):
+    for i, (spd_min, spd_max) in enumerate(DEPS_SPEED_BANDS):
+        if spd_min <= spd < spd_max:
+            return i
+
+    return -1
+
+##
+# This function is used to query the linearity points of a speed band.
+#
+# @param path the path of the database file
+# @param band the index of the speed band
+# @param since the start of the period (datetime), None for no limit
+# @param until the end of the period (datetime), None for no limit
+# @return a list of (session name, time in nsec, interval, value)
+#
+def query_linearity(path: str, band: int, since: datetime = None, until: datetime = None):
+    since_ns = int(since.timestamp() * 1e9) if since is not None else 0
+    until_ns = int(until.timestamp() * 1e9) if until is not None else sys.maxsize
+
+    conn = connect_db(path)
+    try:
+        return conn.execute(
+            'SELECT sessions.name, linearity.tim, linearity.interval, linearity.value '
+            'FROM linearity JOIN sessions ON linearity.session = sessions.id '
+            'WHERE linearity.band = ? AND linearity.tim >= ? AND linearity.tim < ? '
+            'ORDER BY linearity.tim', (band, since_ns, until_ns)).fetchall()
+    finally:
+        conn.close()
+
+
+###################################################################
+# Main function for querying the session database
+###################################################################
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Query the linearity points of the EPS sessions')
+    parser.add_argument('database', help='session database file')
+    parser.add_argument('--band', type=int, default=1,
+                        help='speed band, 0: 0~10, 1: 10~30, 2: 30~60 Km/h')
+    parser.add_argument('--days', type=float, default=7.0, help='the last days to be queried')
+    args = parser.parse_args()
+
+    since = datetime.fromtimestamp(time.time() - args.days * 86400)
+    for name, tim, interval, value in query_linearity(args.database, args.band, since):
+        print('{} {} {:6d} {:10.4f}'.format(
+            datetime.fromtimestamp(tim / 1e9).strftime('%Y-%m-%d %H:%M:%S'), name, interval, value))
@@ -0,0 +1,70 @@
+#############################################################
+# deps_snapshot.py
+#
+# Created: 2026. 10. 19
+#
+# Authors:
+#    Youngsun Han (youngsun@pknu.ac.kr)
+#
+# Quantum Computing Laboratory (quantum.pknu.ac.kr)
+#############################################################
+
+import os
+import zipfile
+
+import numpy as np
+
+# the format version of the snapshot file
+DEPS_SNAPSHOT_VERSION = 1
+
+##
+# This function is used to write a snapshot of the processing state into
+# a binary file (numpy .npz). The file is replaced at once, so a crash
+# while writing never leaves a broken snapshot behind.
+#
+# @param path the path of the snapshot file
+# @param state a dictionary of numpy arrays or scalars
+#
+def save_snapshot(path: str, state: dict):
+    tmp_path = path + '.tmp'
+    with open(tmp_path, 'wb') as fp:
+        np.savez(fp, version=DEPS_SNAPSHOT_VERSION, **state)
+    os.replace(tmp_path, path)
+
+##
+# This function is used to read a snapshot file.
+#
+# @param path the path of the snapshot file
+# @param log the function to print a message, e.g. of a broken snapshot
+# @return a dictionary of numpy arrays, None if there is no valid snapshot
+#
+def load_snapshot(path: str, log=print):
+    try:
+        with np.load(path, allow_pickle=False) as npz:
+            state = {key: npz[key] for key in npz.files}
+    except FileNotFoundError:
+        # no snapshot has been written yet, e.g. at the first start
+        return None
+    except (OSError, ValueError, zipfile.BadZipFile) as e:
+        log('Snapshot is not read: ' + path + ' ' + str(e))
+        return None
+
+    if int(state.get('version', -1)) != DEPS_SNAPSHOT_VERSION:
+        return None
+
+    return state
+
+##
+# This function returns the identity of a source data file, which is
+# stored in a snapshot to check if the snapshot is still valid for it.
+#
+# @param path the path of the source data file
+# @return (path, size, mtime in nanoseconds), None if there is no file
+#
+def source_identity(path: str):
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+
+    return path, st.st_size, st.st_mtime_ns
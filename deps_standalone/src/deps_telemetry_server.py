@@ -0,0 +1,332 @@
+#############################################################
+# deps_telemetry_server.py
+#
+# Created: 2026. 10. 19
+#
+# Authors:
+#    Youngsun Han (youngsun@pknu.ac.kr)
+#
+# Quantum Computing Laboratory (quantum.pknu.ac.kr)
+#############################################################
+
+import json
+import base64
+import struct
+import asyncio
+import hashlib
+import threading
+
+# the maximum number of bytes waiting to be sent to a client, the frames
+# published while a slow client is over it are skipped for the client
+DEPS_TELEMETRY_MAX_BACKLOG = 1 << 20
+
+# the maximum number of points of a channel in the channels topic
+DEPS_TELEMETRY_POINTS = 500
+
+# GUID of the websocket handshake (RFC 6455)
+DEPS_WS_GUID = b'258EAFA5-E914-47DA-95CA-C5AB0DC85B11'
+
+# websocket opcodes
+DEPS_WS_TEXT = 0x1
+DEPS_WS_CLOSE = 0x8
+DEPS_WS_PING = 0x9
+DEPS_WS_PONG = 0xA
+
+# page of the live view, which shows the topics pushed over the websocket
+DEPS_TELEMETRY_PAGE = b'''<!DOCTYPE html>
+<html><head><meta charset="utf-8"><title>EPS Monitoring</title></head>
+<body style="font-family: monospace">
+<h3>EPS Monitoring</h3>
+<pre id="stats"></pre><pre id="linearity"></pre><pre id="channels"></pre>
+<script>
+var ws = new WebSocket('ws://' + location.host + '/ws');
+ws.onmessage = function (ev) {
+  var msg = JSON.parse(ev.data), text = JSON.stringify(msg.data, null, 1);
+  document.getElementById(msg.topic).textContent = msg.topic + ': ' + text.slice(0, 4000);
+};
+</script>
+</body></html>
+'''
+
+#######################################################################
+# DepsTelemetryServer class
+#######################################################################
+
+class DepsTelemetryServer:
+
+    ##
+    # Constructor of DepsTelemetryServer class. It is an HTTP and websocket
+    # server on an asyncio loop of its own thread. The latest payload of each
+    # topic is served at /[topic], and pushed to the websocket clients of /ws.
+    # A payload is encoded into a frame only once, and the same frame is
+    # written to all the clients.
+    #
+    # @param self this object
+    # @param host the interface to be bound, e.g. 127.0.0.1 for local access only
+    # @param port the port number
+    #
+    def __init__(self, host: str = '127.0.0.1', port: int = 8080):
+        self.host = host
+        self.port = port
+
+        # latest payloads in json by the topic, and the websocket clients (writers)
+        self.__payloads = {}
+        self.__clients = set()
+
+        # other pages by the path, functions returning (content type, body),
+        # which are called on the loop of the server, e.g. {'/metrics': ...}
+        self.routes = {}
+
+        self.__loop = None
+        self.__server = None
+        self.__thread = None
+
+    ##
+    # This function is used to start the server.
+    #
+    # @param self this object
+    # @return error message if the server cannot be started, otherwise None
+    #
+    def start(self):
+        ready = threading.Event()
+        error = []
+
+        def run():
+            self.__loop = asyncio.new_event_loop()
+            asyncio.set_event_loop(self.__loop)
+            try:
+                self.__server = self.__loop.run_until_complete(
+                    asyncio.start_server(self.__handle_client, self.host, self.port))
+            except OSError as e:
+                error.append(str(e))
+                self.__loop.close()
+                ready.set()
+                return
+
+            ready.set()
+            self.__loop.run_forever()
+
+            # close the remaining clients
+            tasks = asyncio.all_tasks(self.__loop)
+            for task in tasks:
+                task.cancel()
+            self.__loop.run_until_complete(asyncio.gather(*tasks, return_exceptions=True))
+
+            self.__server.close()
+            self.__loop.run_until_complete(self.__server.wait_closed())
+            self.__loop.close()
+
+        self.__thread = threading.Thread(target=run, daemon=True)
+        self.__thread.start()
+        ready.wait()
+
+        if error:
+            self.__thread = None
+            return error[0]
+
+        return None
+
+    ##
+    # This function is used to stop the server.
+    #
+    # @param self this object
+    #
+    def close(self):
+        if self.__thread is None:
+            return
+
+        self.__loop.call_soon_threadsafe(self.__loop.stop)
+        self.__thread.join()
+        self.__thread = None
+
+    ##
+    # This function returns the number of the websocket clients.
+    #
+    # @param self this object
+    # @return the number of clients
+    #
+    def num_clients(self):
+        return len(self.__clients)
+
+    ##
+    # This function is used to publish a payload of a topic. It can be called
+    # from any thread, and returns after encoding the payload once.
+    #
+    # @param self this object
+    # @param topic the name of the topic, e.g. stats
+    # @param data the payload to be encoded in json
+    #
+    def publish(self, topic: str, data):
+        payload = json.dumps(data, separators=(',', ':')).encode()
+        self.__payloads[topic] = payload
+
+        if self.__thread is not None and self.__clients:
+            message = b'{"topic":"' + topic.encode() + b'","data":' + payload + b'}'
+            self.__loop.call_soon_threadsafe(self.__fan_out, encode_ws_frame(DEPS_WS_TEXT, message))
+
+    ##
+    # This function is used to write a frame to all the websocket clients.
+    # It runs on the loop of the server.
+    #
+    # @param self this object
+    # @param frame the encoded frame
+    #
+    def __fan_out(self, frame: bytes):
+        for writer in self.__clients:
+            if writer.transport.get_write_buffer_size() < DEPS_TELEMETRY_MAX_BACKLOG:
+                writer.write(frame)
+
+    ##
+    # This is a coroutine to handle a connection: an HTTP request, or
+    # a websocket client until it is closed.
+    #
+    # @param self this object
+    # @param reader the stream reader of the connection
+    # @param writer the stream writer of the connection
+    #
+    async def __handle_client(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        try:
+            request = await reader.readuntil(b'\r\n\r\n')
+            lines = request.decode('ISO-8859-1').split('\r\n')
+
+            method, path, _ = (lines[0].split(' ') + ['', ''])[:3]
+            path = path.split('?')[0]
+            headers = {}
+            for line in lines[1:]:
+                key, sep, value = line.partition(':')
+                if sep:
+                    headers[key.strip().lower()] = value.strip()
+
+            if method != 'GET':
+                self.__write_response(writer, 405, 'Method Not Allowed', b'')
+            elif path == '/ws' and headers.get('upgrade', '').lower() == 'websocket':
+                await self.__handle_websocket(reader, writer, headers)
+            elif path in self.routes:
+                content_type, body = self.routes[path]()
+                self.__write_response(writer, 200, 'OK', body, content_type)
+            elif path in ('/', '/index.html'):
+                self.__write_response(writer, 200, 'OK', DEPS_TELEMETRY_PAGE, 'text/html')
+            elif path[1:] in self.__payloads:
+                self.__write_response(writer, 200, 'OK', self.__payloads[path[1:]],
+                                      'application/json')
+            else:
+                self.__write_response(writer, 404, 'Not Found', b'')
+
+            await writer.drain()
+        except (asyncio.IncompleteReadError, asyncio.LimitOverrunError, ConnectionError):
+            pass
+        finally:
+            writer.close()
+
+    ##
+    # This function is used to write an HTTP response.
+    #
+    # @param self this object
+    # @param writer the stream writer of the connection
+    # @param status the status code
+    # @param reason the reason phrase
+    # @param body the body of the response
+    # @param content_type the content type of the body
+    #
+    def __write_response(self, writer: asyncio.StreamWriter, status: int, reason: str,
+                         body: bytes, content_type: str = 'text/plain'):
+        writer.write('HTTP/1.1 {} {}\r\nContent-Type: {}\r\nContent-Length: {}\r\n'
+                     'Cache-Control: no-cache\r\nConnection: close\r\n\r\n'.format(
+                         status, reason, content_type, len(body)).encode() + body)
+
+    ##
+    # This is a coroutine to accept a websocket client and to serve it until
+    # it is closed. The frames from the client are only for the control.
+    #
+    # @param self this object
+    # @param reader the stream reader of the connection
+    # @param writer the stream writer of the connection
+    # @param headers the headers of the upgrade request
+    #
+    async def __handle_websocket(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter,
+                                 headers: dict):
+        key = headers.get('sec-websocket-key', '').encode()
+        accept = base64.b64encode(hashlib.sha1(key + DEPS_WS_GUID).digest())
+
+        writer.write(b'HTTP/1.1 101 Switching Protocols\r\nUpgrade: websocket\r\n'
+                     b'Connection: Upgrade\r\nSec-WebSocket-Accept: ' + accept + b'\r\n\r\n')
+
+        # the latest payloads first, and then the published ones
+        for topic, payload in list(self.__payloads.items()):
+            writer.write(encode_ws_frame(
+                DEPS_WS_TEXT, b'{"topic":"' + topic.encode() + b'","data":' + payload + b'}'))
+
+        self.__clients.add(writer)
+        try:
+            while True:
+                opcode, message = await read_ws_frame(reader)
+
+                if opcode == DEPS_WS_CLOSE:
+                    writer.write(encode_ws_frame(DEPS_WS_CLOSE, message[:2]))
+                    break
+                elif opcode == DEPS_WS_PING:
+                    writer.write(encode_ws_frame(DEPS_WS_PONG, message))
+        finally:
+            self.__clients.discard(writer)
+
+###################################################################
+# Utility functions
+###################################################################
+
+##
+# This function is used to encode a websocket frame from the server,
+# which is not masked.
+#
+# @param opcode the opcode of the frame
+# @param message the payload of the frame
+# @return the encoded frame
+#
+def encode_ws_frame(opcode: int, message: bytes):
+    length = len(message)
+
+    if length < 126:
+        header = struct.pack('!BB', 0x80 | opcode, length)
+    elif length < (1 << 16):
+        header = struct.pack('!BBH', 0x80 | opcode, 126, length)
+    else:
+        header = struct.pack('!BBQ', 0x80 | opcode, 127, length)
+
+    return header + message
+
+##
+# This is a coroutine to read a websocket frame from a client, which is masked.
+#
+# @param reader the stream reader of the connection
+# @return (opcode, unmasked payload)
+#
+async def read_ws_frame(reader: asyncio.StreamReader):
+    head, length = await reader.readexactly(2)
+
+    length &= 0x7F
+    if length == 126:
+        length, = struct.unpack('!H', await reader.readexactly(2))
+    elif length == 127:
+        length, = struct.unpack('!Q', await reader.readexactly(8))
+
+    mask = await reader.readexactly(4)
+    message = bytearray(await reader.readexactly(length))
+    for i in range(length):
+        message[i] ^= mask[i & 3]
+
+    return head & 0x0F, bytes(message)
+
+##
+# This function is used to decimate the channels to be published, so that
+# each channel has DEPS_TELEMETRY_POINTS points at most.
+#
+# @param channels a list of the channels (numpy arrays)
+# @param num_points the maximum number of points of a channel
+# @return a list of the decimated channels (lists)
+#
+def decimate_channels(channels: list, num_points: int = DEPS_TELEMETRY_POINTS):
+    decimated = []
+    for channel in channels:
+        step = max(1, -(-len(channel) // num_points))
+        decimated.append(channel[len(channel) - 1::-step][::-1].tolist())
+
+    return decimated
@@ -0,0 +1,267 @@
+#############################################################
+# deps_thermal_camera.py
+#
+# Created: 2026. 10. 19
+#
+# Authors:
+#    Youngsun Han (youngsun@pknu.ac.kr)
+#
+# Quantum Computing Laboratory (quantum.pknu.ac.kr)
+#############################################################
+
+import os
+import importlib.util
+import numpy as np
+
+# calibration of the raw frames of a radiometric lepton (TLinear), in 0.01 K
+DEPS_THERMAL_GAIN = 0.01
+DEPS_THERMAL_OFFSET = -273.15
+
+# extensions of the recorded raw frame files
+DEPS_THERMAL_EXTS = ('.npy', '.png', '.tif', '.tiff')
+
+#######################################################################
+# DepsLeptonCamera class
+#######################################################################
+
+class DepsLeptonCamera:
+
+    ##
+    # Constructor of DepsLeptonCamera class. It reads the raw 16-bit frames
+    # from a flir lepton through flirpy, which is loaded and opened at the
+    # first frame. The camera is kept open between the frames.
+    #
+    # @param self this object
+    #
+    def __init__(self):
+        self.__camera = None
+        self.error = None
+
+    ##
+    # This function is used to read a raw frame.
+    #
+    # @param self this object
+    # @return the raw frame, None if it is failed
+    #
+    def grab(self):
+        try:
+            if self.__camera is None:
+                from flirpy.camera.lepton import Lepton
+                self.__camera = Lepton()
+
+            return self.__camera.grab()
+        except Exception as e:
+            self.error = str(e)
+            self.close()
+            return None
+
+    ##
+    # This function is used to close the camera.
+    #
+    # @param self this object
+    #
+    def close(self):
+        if self.__camera is not None:
+            try:
+                self.__camera.close()
+            except Exception:
+                pass
+            self.__camera = None
+
+#######################################################################
+# DepsThermalFile class
+#######################################################################
+
+class DepsThermalFile:
+
+    ##
+    # Constructor of DepsThermalFile class. It replays the recorded raw frames
+    # as a stand-in of the camera, repeatedly from the first frame. The frames
+    # are a numpy file of the shape (h, w) or (n, h, w), or a directory of the
+    # numpy files or 16-bit png/tiff images in the order of their names.
+    #
+    # @param self this object
+    # @param path the path of the file or the directory
+    #
+    def __init__(self, path: str):
+        self.path = path
+        self.error = None
+
+        # a stack of the frames, or a list of the files of the frames
+        self.__frames = None
+        self.__files = []
+        self.__index = 0
+
+        if os.path.isdir(path):
+            self.__files = [os.path.join(path, name) for name in sorted(os.listdir(path))
+                            if os.path.splitext(name)[1].lower() in DEPS_THERMAL_EXTS]
+        else:
+            self.__frames = np.load(path, mmap_mode='r')
+            if self.__frames.ndim == 2:
+                self.__frames = self.__frames[np.newaxis]
+
+    ##
+    # This function is used to read the next raw frame.
+    #
+    # @param self this object
+    # @return the raw frame, None if there are no frames
+    #
+    def grab(self):
+        num = len(self.__frames) if self.__frames is not None else len(self.__files)
+        if num == 0:
+            self.error = 'No raw frames in ' + self.path
+            return None
+
+        index = self.__index % num
+        self.__index = index + 1
+
+        if self.__frames is not None:
+            return np.asarray(self.__frames[index])
+
+        return read_raw_frame(self.__files[index])
+
+    def close(self):
+        pass
+
+#######################################################################
+# DepsThermalCapture class
+#######################################################################
+
+class DepsThermalCapture:
+
+    ##
+    # Constructor of DepsThermalCapture class. It converts the raw frames of a
+    # source into the temperature (C) by the linear calibration, in place in a
+    # float32 frame kept for the statistics and the display. The display image
+    # is made by a lookup of the colormap, without any files in between.
+    #
+    # @param self this object
+    # @param source the source of the raw frames, DepsLeptonCamera or DepsThermalFile
+    # @param gain gain of the calibration, (C) per raw value
+    # @param offset offset of the calibration (C)
+    #
+    def __init__(self, source, gain: float = DEPS_THERMAL_GAIN, offset: float = DEPS_THERMAL_OFFSET):
+        self.source = source
+        self.gain = gain
+        self.offset = offset
+
+        # the latest raw frame and the temperature frame (C)
+        self.raw = None
+        self.temperature = None
+
+        # statistics of the temperature frame, (min, max, mean, center)
+        self.stats = None
+
+        # buffers of the display, and the colormap (256, 3) in rgb
+        self.__norm = None
+        self.__gray = None
+        self.__lut = None
+
+    ##
+    # This function is used to capture a frame, and to convert it into the
+    # temperature.
+    #
+    # @param self this object
+    # @return the temperature frame (float32), None if it is failed
+    #
+    def capture(self):
+        raw = self.source.grab()
+        if raw is None:
+            return None
+
+        if self.temperature is None or self.temperature.shape != raw.shape:
+            self.temperature = np.empty(raw.shape, dtype=np.float32)
+            self.__norm = np.empty(raw.shape, dtype=np.float32)
+            self.__gray = np.empty(raw.shape, dtype=np.uint8)
+
+        # temperature = raw * gain + offset
+        t = self.temperature
+        np.multiply(raw, self.gain, out=t, casting='unsafe')
+        t += self.offset
+
+        self.raw = raw
+        self.stats = (float(t.min()), float(t.max()), float(t.mean()),
+                      float(t[t.shape[0] // 2, t.shape[1] // 2]))
+        return t
+
+    ##
+    # This function is used to make the display image of the temperature
+    # frame, scaled between its min and max, with the center temperature.
+    #
+    # @param self this object
+    # @return the image of the shape (h, w, 3) in rgb
+    #
+    def render(self):
+        # opencv is loaded at the first use of the camera
+        import cv2
+
+        if self.__lut is None:
+            lut = cv2.applyColorMap(np.arange(256, dtype=np.uint8).reshape(-1, 1), cv2.COLORMAP_JET)
+            self.__lut = np.ascontiguousarray(lut.reshape(-1, 3)[:, ::-1])
+
+        t_min, t_max, _, t_center = self.stats
+        scale = 255.0 / (t_max - t_min) if t_max > t_min else 0.0
+
+        # gray = (temperature - min) * scale
+        np.subtract(self.temperature, t_min, out=self.__norm)
+        self.__norm *= scale
+        np.copyto(self.__gray, self.__norm, casting='unsafe')
+
+        image = self.__lut[self.__gray]
+
+        height, width = self.__gray.shape
+        cv2.putText(image, '{0:.1f} C'.format(t_center), (width // 2 + 5, height // 2 + 5),
+                    cv2.FONT_HERSHEY_PLAIN, 0.5, (0, 0, 0), 1)
+        return image
+
+    ##
+    # This function is used to close the source.
+    #
+    # @param self this object
+    #
+    def close(self):
+        self.source.close()
+
+    def __str__(self):
+        if self.stats is None:
+            return 'thermal {}'.format(self.source.error or 'no frame')
+
+        return 'thermal min:{:.1f} max:{:.1f} mean:{:.1f} center:{:.1f} C'.format(*self.stats)
+
+###################################################################
+# Utility functions
+###################################################################
+
+##
+# This function is used to create the thermal capture from the config.
+#
+# @param source "lepton" for the camera, or the path of the recorded raw frames
+# @param calib the calibration, "gain:offset"
+# @return the thermal capture
+#
+def open_thermal_capture(source: str, calib: str):
+    gain, _, offset = calib.partition(':')
+
+    if source == 'lepton':
+        # flirpy is only looked up here, and loaded at the first frame
+        if importlib.util.find_spec('flirpy') is None:
+            raise ImportError('flirpy is not installed')
+
+        source = DepsLeptonCamera()
+    else:
+        source = DepsThermalFile(source)
+
+    return DepsThermalCapture(source, float(gain), float(offset or '0'))
+
+##
+# This function is used to read a recorded raw frame file.
+#
+# @param path the path of the numpy file or the 16-bit png/tiff image
+# @return the raw frame
+#
+def read_raw_frame(path: str):
+    if path.lower().endswith('.npy'):
+        return np.load(path)
+
+    import cv2
+    return cv2.imread(path, cv2.IMREAD_UNCHANGED)
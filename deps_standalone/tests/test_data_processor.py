@@ -0,0 +1,59 @@
+#############################################################
+# test_data_processor.py
+#
+# Created: 2026. 10. 19
+#
+# Authors:
+#    Youngsun Han (youngsun@pknu.ac.kr)
+#
+# Quantum Computing Laboratory (quantum.pknu.ac.kr)
+#############################################################
+
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from deps_data_processor import DepsDataProcessor
+
+##
+# This function is used to enqueue the signals of a few linearity segments,
+# i.e., the angle below the threshold for 5 signals and above it for 5 signals.
+#
+# @param proc the data processor
+# @param arrival_ns arrival time of the signals
+# @param num the number of the segments
+#
+def enqueue_segments(proc: DepsDataProcessor, arrival_ns: int, num: int = 2):
+    for _ in range(num):
+        for ang in [-100] * 5 + [0] * 5:
+            proc.enqueue_sensor_signal_v2('SPD:+05.0,ANG:{:+05d},TRQ:+2443,CUR:+1.00'.format(ang),
+                                          arrival_ns)
+
+##
+# The time eviction of all the signals has to empty the buffers, and to return
+# each completed segment only once.
+#
+def test_evict_whole_buffer_by_time():
+    proc = DepsDataProcessor()
+    proc.set_retention(0, 0.05)
+
+    # all the signals are older than the retention time
+    enqueue_segments(proc, time.monotonic_ns() - int(1e9))
+    num_sig = len(proc.spd_data_buf)
+
+    lps_list = proc.evict_sensor_signal()
+    assert len(lps_list[0]) == 2
+    assert len(proc.spd_data_buf) == 0
+    assert len(proc.flt_data_buf[0]) == 0
+    assert proc.base_index == num_sig
+
+    # nothing is left to be evicted again
+    assert proc.evict_sensor_signal() is None
+
+    enqueue_segments(proc, time.monotonic_ns() - int(1e9), 1)
+    lps_list = proc.evict_sensor_signal()
+    assert len(lps_list[0]) == 1
+    assert len(proc.spd_data_buf) == 0
+    assert proc.base_index == num_sig + 10